@@ -0,0 +1,120 @@
+"""
+JWT authentication backed by a short-lived user cache.
+
+simplejwt's ``JWTAuthentication`` loads the user from the database on every
+request. :class:`CachedJWTAuthentication` keeps the loaded user, with its
+``store`` preloaded, in the cache for ``AUTH_USER_CACHE_TIMEOUT`` seconds, so
+authenticating and the role/store permission checks that follow cost no
+queries on a hit.
+
+Each user has a cache version (see :mod:`utils.cache`). The cache key embeds
+it, so :func:`invalidate_user` drops a cached user by bumping the version.
+``accounts.signals`` calls it whenever a user is saved or deleted, or the
+store they belong to changes. Bulk ``QuerySet.update()`` calls bypass signals
+and are only picked up once the entry expires.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from utils.cache import bump_namespace, namespace_version
+
+DEFAULT_TIMEOUT = 60
+
+
+def _namespace(user_id) -> str:
+    return f"auth_user:{user_id}"
+
+
+def user_cache_key(user_id) -> str:
+    """
+    Return the cache key of ``user_id`` for its current version.
+
+    Args:
+        user_id: Primary key of the user, as found in the token.
+
+    Returns:
+        str: Key under which the authenticated user is cached.
+    """
+    return f"auth:user:{user_id}:{namespace_version(_namespace(user_id))}"
+
+
+def invalidate_user(user_id) -> None:
+    """
+    Drop the cached copy of ``user_id`` now and again when the transaction commits.
+
+    Args:
+        user_id: Primary key of the user whose cached entry is stale.
+    """
+    bump_namespace(_namespace(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that resolves the token's user through the cache.
+
+    Performs the same checks as simplejwt (inactive users and, when enabled,
+    tokens issued before a password change are rejected) against the cached
+    user, so cache hits are never more permissive than a database lookup.
+
+    Example:
+        REST_FRAMEWORK = {
+            "DEFAULT_AUTHENTICATION_CLASSES": (
+                "accounts.authentication.CachedJWTAuthentication",
+            ),
+        }
+    """
+
+    def get_user(self, validated_token):
+        """
+        Return the user identified by ``validated_token``.
+
+        Args:
+            validated_token (Token): A token that passed signature validation.
+
+        Returns:
+            CustomUser: The user, with ``store`` already loaded.
+
+        Raises:
+            InvalidToken: If the token carries no user id.
+            AuthenticationFailed: If the user is missing, inactive or changed
+                their password after the token was issued.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related("store").get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(
+                    _("User not found"), code="user_not_found"
+                ) from e
+            timeout = getattr(settings, "AUTH_USER_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+            cache.set(key, user, timeout)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
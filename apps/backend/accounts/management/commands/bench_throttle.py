@@ -0,0 +1,106 @@
+import pickle
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import SimpleRateThrottle
+
+from accounts.throttles import STORES, SlidingWindowRateThrottle
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _IdentMixin:
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
+
+
+class Command(BaseCommand):
+    """Measure the per-request cost of throttling.
+
+    Sends ``--requests`` checks spread over ``--clients`` client IPs through
+    DRF's ``SimpleRateThrottle`` (timestamp lists in the default cache) and
+    through :class:`~accounts.throttles.SlidingWindowRateThrottle` with each
+    store. It reports the time and queries per check, and the bytes stored
+    for one client after all its requests. Database counters are rolled back
+    afterwards::
+
+        python manage.py bench_throttle --requests=5000 --clients=100
+    """
+
+    help = "Benchmark throttle overhead per request (DRF vs sliding window stores)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=5000)
+        parser.add_argument("--clients", type=int, default=100)
+        parser.add_argument(
+            "--rate",
+            default="100000/hour",
+            help="Throttle rate; high by default so every request is counted",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["clients"] < 1:
+            raise CommandError("--requests and --clients must be positive")
+
+        backend = settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]
+        self.stdout.write(f"backend={connection.vendor} cache={backend}")
+        factory = APIRequestFactory()
+        requests = [
+            factory.get("/", REMOTE_ADDR=f"10.0.{i // 250}.{i % 250}")
+            for i in range(options["clients"])
+        ]
+        scope = f"bench{time.time_ns()}"
+        candidates = [("drf", SimpleRateThrottle, None)] + [
+            (f"sliding/{name}", SlidingWindowRateThrottle, name) for name in STORES
+        ]
+        try:
+            with transaction.atomic():
+                for label, base, store in candidates:
+                    throttle_class = type(
+                        "BenchThrottle",
+                        (_IdentMixin, base),
+                        {"scope": f"{scope}{label}", "rate": options["rate"]},
+                    )
+                    if store:
+                        throttle_class.store = store
+                    self._run(label, throttle_class, requests, options["requests"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, label, throttle_class, requests, total):
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for i in range(total):
+                request = requests[i % len(requests)]
+                throttle = throttle_class()
+                started = time.perf_counter()
+                throttle.allow_request(request, None)
+                timings.append(time.perf_counter() - started)
+        us = sorted(t * 1e6 for t in timings)
+        stored = self._stored_bytes(throttle_class, requests[0])
+        self.stdout.write(
+            f"{label:<18} n={total:<6} queries/req={len(queries) / total:<4.1f} "
+            f"p50={statistics.median(us):.0f}us "
+            f"p95={us[int(len(us) * 0.95)]:.0f}us "
+            f"mean={statistics.fmean(us):.0f}us bytes/client={stored}"
+        )
+
+    @staticmethod
+    def _stored_bytes(throttle_class, request):
+        throttle = throttle_class()
+        key = throttle.get_cache_key(request, None)
+        if issubclass(throttle_class, SlidingWindowRateThrottle):
+            return "2 counters"
+        return len(pickle.dumps(cache.get(key, [])))
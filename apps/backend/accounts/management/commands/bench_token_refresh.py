@@ -0,0 +1,160 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from accounts.models import CustomUser
+from accounts.revocation import (
+    CachedTokenRefreshSerializer,
+    RevocableRefreshToken,
+    purge_expired,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """Measure refresh latency against a large token history.
+
+    Seeds ``--tokens`` rotated (outstanding and blacklisted) refresh tokens
+    issued evenly over the last ``--days`` days, then times chains of
+    refreshes with simplejwt's serializer and with
+    :class:`~accounts.revocation.CachedTokenRefreshSerializer`, the purge of
+    expired tokens, refreshes against the purged tables, and replayed
+    (revoked) tokens checked cold and from the cache. Everything runs in a
+    transaction that is rolled back::
+
+        python manage.py bench_token_refresh --tokens=1000000 --refreshes=200
+    """
+
+    help = "Benchmark JWT refresh latency with a large outstanding/blacklist history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tokens",
+            type=int,
+            default=1_000_000,
+            help="Historical tokens to seed (default 1000000)",
+        )
+        parser.add_argument(
+            "--refreshes",
+            type=int,
+            default=200,
+            help="Refreshes timed per phase (default 200)",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Days the seeded tokens are spread over (default 365)",
+        )
+
+    def handle(self, *args, **options):
+        if options["tokens"] < 0 or options["refreshes"] < 1:
+            raise CommandError("--tokens must be >= 0 and --refreshes >= 1")
+
+        backend = settings.CACHES["default"]["BACKEND"].rsplit(".", 1)[-1]
+        self.stdout.write(f"backend={connection.vendor} cache={backend}")
+        try:
+            with transaction.atomic():
+                user = CustomUser.objects.create_user(
+                    username=f"bench-{time.time_ns()}", password="x"
+                )
+                started = time.perf_counter()
+                self._seed(user, options["tokens"], options["days"])
+                self.stdout.write(
+                    f"seeded tokens={options['tokens']} "
+                    f"seconds={time.perf_counter() - started:.1f}"
+                )
+                count = options["refreshes"]
+                self._refresh("simplejwt", TokenRefreshSerializer, user, count)
+                self._refresh("cached", CachedTokenRefreshSerializer, user, count)
+
+                started = time.perf_counter()
+                deleted = purge_expired()
+                self.stdout.write(
+                    f"purge deleted={deleted} "
+                    f"remaining={OutstandingToken.objects.count()} "
+                    f"seconds={time.perf_counter() - started:.1f}"
+                )
+                rotated = self._refresh(
+                    "cached+purged", CachedTokenRefreshSerializer, user, count
+                )
+                self._replay(rotated)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _seed(user, total, days, batch_size=10000):
+        now = aware_utcnow()
+        lifetime = api_settings.REFRESH_TOKEN_LIFETIME
+        step = timedelta(days=days) / max(total, 1)
+        first = now - timedelta(days=days)
+        prefix = f"bench-{time.time_ns()}"
+        for start in range(0, total, batch_size):
+            tokens = OutstandingToken.objects.bulk_create(
+                OutstandingToken(
+                    user=user,
+                    jti=f"{prefix}-{i}",
+                    token="-",
+                    created_at=first + step * i,
+                    expires_at=first + step * i + lifetime,
+                )
+                for i in range(start, min(start + batch_size, total))
+            )
+            BlacklistedToken.objects.bulk_create(
+                BlacklistedToken(token=token) for token in tokens
+            )
+
+    def _refresh(self, label, serializer_class, user, count):
+        raw = str(RefreshToken.for_user(user))
+        rotated, timings = [], []
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(count):
+                serializer = serializer_class(data={"refresh": raw})
+                started = time.perf_counter()
+                serializer.is_valid(raise_exception=True)
+                timings.append(time.perf_counter() - started)
+                rotated.append(raw)
+                raw = serializer.validated_data["refresh"]
+        self._report(f"refresh {label}", timings, len(queries) / count)
+        return rotated
+
+    def _replay(self, rotated):
+        for label in ("cold", "cached"):
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for raw in rotated:
+                    started = time.perf_counter()
+                    try:
+                        RevocableRefreshToken(raw)
+                    except TokenError:
+                        timings.append(time.perf_counter() - started)
+                    else:
+                        raise CommandError("a rotated token was not revoked")
+            self._report(f"replay {label}", timings, len(queries) / len(rotated))
+
+    def _report(self, label, timings, queries):
+        ms = sorted(t * 1000 for t in timings)
+        p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+        self.stdout.write(
+            f"{label:<24} n={len(ms):<5} queries/op={queries:<5.1f} "
+            f"p50={statistics.median(ms):.2f}ms p95={p95:.2f}ms "
+            f"mean={statistics.fmean(ms):.2f}ms"
+        )
@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.provisioning import FORMATS, guess_format, read_rows
+from accounts.serializers import UserImportSerializer
+
+
+class Command(BaseCommand):
+    """Create users in bulk from a CSV or JSON lines file.
+
+    Columns/keys are those of :class:`~accounts.serializers.UserImportSerializer`.
+    The whole file is validated first and created in one transaction, so a
+    single bad row leaves the database untouched::
+
+        python manage.py import_users advisors.csv --workers=8
+        python manage.py import_users advisors.jsonl --dry-run
+    """
+
+    help = (
+        "Bulk create users (with advisor payroll profiles and schedules) from CSV/JSONL"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON lines file to import")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            default=None,
+            help="File format (default: taken from the file extension)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Password hashing processes (default: USER_IMPORT_HASH_WORKERS or CPUs)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without creating anyone",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or guess_format(path)
+        if fmt is None:
+            raise CommandError(
+                "Cannot tell the format from the extension; pass --format"
+            )
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as handle:
+                rows = read_rows(handle.read(), fmt)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            raise CommandError(f"{path}: {e}")
+
+        started = time.perf_counter()
+        serializer = UserImportSerializer(
+            data=rows,
+            many=True,
+            allow_empty=False,
+            context={"hash_workers": options["workers"]},
+        )
+        if not serializer.is_valid():
+            self._report(serializer.errors)
+            raise CommandError("No users were imported")
+        if options["dry_run"]:
+            self.stdout.write(f"import_users: {len(rows)} rows valid (dry run)")
+            return
+        users = serializer.save()
+        advisors = sum(user.role == "advisor" for user in users)
+        self.stdout.write(
+            f"import_users: created={len(users)} advisors={advisors} "
+            f"seconds={time.perf_counter() - started:.1f}"
+        )
+
+    def _report(self, errors):
+        if isinstance(errors, dict):
+            errors = [errors]
+        for number, row_errors in enumerate(errors, start=1):
+            for field, messages in (row_errors or {}).items():
+                for message in messages:
+                    self.stderr.write(f"row {number}: {field}: {message}")
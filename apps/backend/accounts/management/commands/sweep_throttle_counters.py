@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.throttles import sweep_expired
+
+
+class Command(BaseCommand):
+    """Delete throttle counters of clients that have gone quiet.
+
+    Only needed with ``THROTTLE_STORE = "database"``; the table holds one row
+    per client seen within the last two windows of its rate. Schedule it::
+
+        # Every 10 minutes
+        */10 * * * * /path/to/venv/bin/python manage.py sweep_throttle_counters
+        # Long-running worker
+        python manage.py sweep_throttle_counters --loop --interval=600
+    """
+
+    help = "Delete expired database throttle counters in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=5000,
+            help="Rows deleted per statement",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep sweeping every --interval seconds instead of exiting",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=600.0,
+            help="Seconds to sleep between sweeps when --loop is set",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = sweep_expired(options["batch_size"])
+            self.stdout.write(f"sweep_throttle_counters: deleted={deleted}")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
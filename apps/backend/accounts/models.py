@@ -49,6 +49,7 @@ class CustomUser(AbstractUser):
         ...     store=store_instance
         ... )
     """
+
     ROLE_CHOICES = (
         ("system_admin", "System Admin"),
         ("branch_head", "Branch Head"),
@@ -103,3 +104,30 @@ class CustomUser(AbstractUser):
                 raise ValidationError(
                     {"store": "Store already has a different branch head"}
                 )
+
+
+class ThrottleCounter(models.Model):
+    """
+    Sliding-window request counters of one throttled client.
+
+    Written by :class:`accounts.throttles.DatabaseCounterStore` with one
+    upsert per request and removed by ``sweep_throttle_counters`` once
+    ``expires_at`` has passed.
+
+    Attributes:
+        key (CharField): Throttle cache key (scope and client ident).
+        period (BigIntegerField): Index of the current window
+            (``unix time // window length``).
+        hits (PositiveIntegerField): Requests counted in the current window.
+        previous_hits (PositiveIntegerField): Requests in the window before.
+        expires_at (DateTimeField): When both windows are over.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    period = models.BigIntegerField()
+    hits = models.PositiveIntegerField(default=0)
+    previous_hits = models.PositiveIntegerField(default=0)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.key}: {self.previous_hits}/{self.hits}"
@@ -0,0 +1,197 @@
+"""
+Bulk user provisioning from CSV or JSON lines.
+
+Creating users one by one through ``AdminUserViewSet.create`` hashes each
+password serially and saves each user separately. Onboarding a whole branch
+network instead goes through :func:`create_users`:
+
+- Passwords are hashed across a process pool by :func:`hash_passwords`.
+  PBKDF2 is CPU bound, so the work scales with cores rather than being
+  serialised by the GIL. Only the ``import_users`` command uses the pool;
+  ``POST /api/users/import`` takes small batches and hashes them inline, as
+  a web worker must not fork.
+- Users are inserted with ``bulk_create``. Advisors get their
+  ``AdvisorPayrollProfile`` and, when a shift is given, their
+  ``AdvisorSchedule`` in the same transaction, also in bulk.
+
+Rows are validated beforehand by
+:class:`~accounts.serializers.UserImportSerializer`, which resolves stores and
+shifts and checks usernames and emails with one query each for the whole
+batch. ``bulk_create`` sends no ``post_save`` signals. That is fine for new
+users: nothing is cached for them yet, and the branch head clean-up only
+reacts to inactive or deleted users.
+"""
+
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from typing import List, Optional
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from attendance.models import AdvisorPayrollProfile, AdvisorSchedule
+
+FORMATS = ("csv", "jsonl")
+BATCH_SIZE = 500
+# Below this many passwords, starting worker processes costs more than it saves.
+PARALLEL_THRESHOLD = 16
+
+PROFILE_FIELDS = ("hourly_rate",)
+SCHEDULE_FIELDS = ("shift", "week_even_shift", "week_odd_shift", "anchor_monday")
+
+
+def guess_format(name: str) -> Optional[str]:
+    """Return the import format implied by a file name, if any."""
+
+    extension = os.path.splitext(name)[1].lower().lstrip(".")
+    if extension == "ndjson":
+        return "jsonl"
+    return extension if extension in FORMATS else None
+
+
+def read_rows(text: str, fmt: str) -> List[dict]:
+    """
+    Parse an import file into a list of row dicts.
+
+    CSV rows become dicts keyed by the header; empty cells are dropped so that
+    optional columns may be left blank.
+
+    Args:
+        text: File contents.
+        fmt: ``"csv"`` or ``"jsonl"`` (one JSON object per line).
+
+    Returns:
+        List[dict]: One dict per user.
+
+    Raises:
+        ValueError: For an unknown format or a malformed JSON line.
+    """
+    if fmt == "csv":
+        return [
+            {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value and value.strip()
+            }
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+    if fmt == "jsonl":
+        rows = []
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {number}: {e.msg}") from e
+            if not isinstance(row, dict):
+                raise ValueError(f"line {number}: expected a JSON object")
+            rows.append(row)
+        return rows
+    raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _init_worker() -> None:
+    # Spawned (not forked) workers start without configured settings.
+    django.setup()
+
+
+def hash_passwords(passwords: List[Optional[str]], workers: int = None) -> List[str]:
+    """
+    Hash ``passwords`` with the configured hasher, in parallel when worthwhile.
+
+    Args:
+        passwords: Raw passwords; empty values get an unusable password.
+        workers: Worker processes; defaults to ``USER_IMPORT_HASH_WORKERS`` or
+            the number of CPUs.
+
+    Returns:
+        List[str]: Encoded passwords in input order.
+    """
+    workers = (
+        workers or getattr(settings, "USER_IMPORT_HASH_WORKERS", 0) or os.cpu_count()
+    )
+    hashed = [None if password else make_password(None) for password in passwords]
+    usable = [index for index, password in enumerate(passwords) if password]
+    raw = [passwords[index] for index in usable]
+    if workers <= 1 or len(raw) < PARALLEL_THRESHOLD:
+        results = map(make_password, raw)
+    else:
+        workers = min(workers, len(raw))
+        with ProcessPoolExecutor(workers, initializer=_init_worker) as pool:
+            results = list(
+                pool.map(make_password, raw, chunksize=max(1, len(raw) // workers))
+            )
+    for index, encoded in zip(usable, results):
+        hashed[index] = encoded
+    return hashed
+
+
+def _monday(day):
+    return day - timedelta(days=day.weekday())
+
+
+def create_users(rows: List[dict], workers: int = None) -> List[CustomUser]:
+    """
+    Create users from validated import rows in one transaction.
+
+    Args:
+        rows: Validated data of :class:`~accounts.serializers.UserImportSerializer`,
+            with ``store`` and shift fields already resolved to instances.
+        workers: Password hashing processes (see :func:`hash_passwords`).
+
+    Returns:
+        List[CustomUser]: The created users, in row order.
+    """
+    rows = [dict(row) for row in rows]
+    extras = [
+        {
+            field: row.pop(field)
+            for field in PROFILE_FIELDS + SCHEDULE_FIELDS
+            if field in row
+        }
+        for row in rows
+    ]
+    hashed = hash_passwords([row.pop("password", None) for row in rows], workers)
+    anchor = _monday(timezone.localdate())
+
+    with transaction.atomic():
+        users = CustomUser.objects.bulk_create(
+            [
+                CustomUser(password=password, **row)
+                for row, password in zip(rows, hashed)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        profiles, schedules = [], []
+        for user, extra in zip(users, extras):
+            if user.role != "advisor":
+                continue
+            profile = AdvisorPayrollProfile(user=user)
+            if "hourly_rate" in extra:
+                profile.hourly_rate = extra["hourly_rate"]
+            profiles.append(profile)
+            schedule = AdvisorSchedule(
+                user=user, anchor_monday=extra.get("anchor_monday", anchor)
+            )
+            if extra.get("shift"):
+                schedule.rule_type = "fixed"
+                schedule.default_shift = extra["shift"]
+            elif extra.get("week_even_shift"):
+                schedule.rule_type = "alternate_weekly"
+                schedule.week_even_shift = extra["week_even_shift"]
+                schedule.week_odd_shift = extra["week_odd_shift"]
+            else:
+                continue
+            schedules.append(schedule)
+        AdvisorPayrollProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+        AdvisorSchedule.objects.bulk_create(schedules, batch_size=BATCH_SIZE)
+    return users
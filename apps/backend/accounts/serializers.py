@@ -7,9 +7,13 @@ and user profile management with validation and custom field handling.
 
 from rest_framework import serializers
 from accounts.models import CustomUser
+from accounts.provisioning import create_users
+from attendance.models import Shift
 from store.models import Store
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.db import models
+from django.db.models import Q
 
 
 class RegisterUserSerializer(serializers.ModelSerializer):
@@ -236,3 +240,200 @@ class CustomUserSerializer(serializers.ModelSerializer):
             "username": {"required": False},
             "email": {"required": False},
         }
+
+
+SHIFT_FIELDS = ("shift", "week_even_shift", "week_odd_shift")
+
+
+class UserImportListSerializer(serializers.ListSerializer):
+    """
+    Validates a batch of import rows together and creates them in bulk.
+
+    Cross-row checks run once per batch instead of once per row: usernames
+    and emails are checked for duplicates in the batch and in the database
+    with one query each, stores are resolved by id or code with one query,
+    and shifts by name with one more. Errors are reported per row, in the
+    same list shape DRF uses for field errors.
+
+    Example:
+        >>> serializer = UserImportSerializer(data=rows, many=True)
+        >>> serializer.is_valid(raise_exception=True)
+        >>> users = serializer.save()
+    """
+
+    def to_internal_value(self, data):
+        rows = super().to_internal_value(data)
+        errors = [{} for _ in rows]
+
+        def reject(index, field, message):
+            errors[index].setdefault(field, []).append(message)
+
+        for field in ("username", "email"):
+            first_seen = {}
+            for index, row in enumerate(rows):
+                if row[field] in first_seen:
+                    reject(
+                        index,
+                        field,
+                        f"Duplicate of row {first_seen[row[field]] + 1}.",
+                    )
+                first_seen.setdefault(row[field], index)
+            taken = set(
+                CustomUser.objects.filter(
+                    **{f"{field}__in": list(first_seen)}
+                ).values_list(field, flat=True)
+            )
+            for index, row in enumerate(rows):
+                if row[field] in taken:
+                    reject(index, field, f"A user with this {field} already exists.")
+
+        store_ids = {row["store"] for row in rows if row.get("store")}
+        store_codes = {row["store_code"] for row in rows if row.get("store_code")}
+        stores_by_id, stores_by_code = {}, {}
+        if store_ids or store_codes:
+            for store in Store.objects.filter(
+                Q(id__in=store_ids) | Q(code__in=store_codes)
+            ):
+                stores_by_id[store.id] = stores_by_code[store.code] = store
+
+        shift_names = {
+            row[field] for row in rows for field in SHIFT_FIELDS if row.get(field)
+        }
+        shifts = (
+            {shift.name: shift for shift in Shift.objects.filter(name__in=shift_names)}
+            if shift_names
+            else {}
+        )
+
+        for index, row in enumerate(rows):
+            store_id, code = row.pop("store", None), row.pop("store_code", None)
+            store = None
+            if store_id:
+                store = stores_by_id.get(store_id)
+                if store is None:
+                    reject(index, "store", f"Store {store_id} does not exist.")
+            if code:
+                by_code = stores_by_code.get(code)
+                if by_code is None:
+                    reject(index, "store_code", f"Store {code} does not exist.")
+                elif store_id and by_code != store:
+                    reject(index, "store_code", "Does not match store.")
+                store = by_code
+            if (
+                store is not None
+                and row["role"] == "branch_head"
+                and store.authority_id
+            ):
+                reject(index, "store", "Store already has a different branch head")
+            row["store"] = store
+
+            for field in SHIFT_FIELDS:
+                if row.get(field):
+                    shift = shifts.get(row[field])
+                    if shift is None:
+                        reject(index, field, f"Unknown shift {row[field]}.")
+                    row[field] = shift
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return rows
+
+    def create(self, validated_data):
+        """
+        Create every row with :func:`accounts.provisioning.create_users`.
+
+        The ``hash_workers`` context value sets the number of hashing processes.
+        """
+        return create_users(validated_data, workers=self.context.get("hash_workers"))
+
+
+class UserImportSerializer(serializers.Serializer):
+    """
+    One row of a bulk user import (CSV column or JSON key per field).
+
+    Accepts the fields of :class:`RegisterUserSerializer` plus advisor setup:
+    ``hourly_rate`` for the payroll profile and either ``shift`` (a fixed
+    schedule) or ``week_even_shift`` and ``week_odd_shift`` (alternating
+    weeks), given as shift names. ``store`` takes a store id and
+    ``store_code`` a store code. Rows without a password get an unusable
+    one. Use it with ``many=True``; see :class:`UserImportListSerializer`.
+
+    Example:
+        >>> rows = [
+        ...     {
+        ...         "username": "advisor7",
+        ...         "email": "advisor7@example.com",
+        ...         "password": "securepass123",
+        ...         "store_code": "MB001",
+        ...         "hourly_rate": "120.00",
+        ...         "shift": "Shift A",
+        ...     }
+        ... ]
+        >>> serializer = UserImportSerializer(data=rows, many=True)
+    """
+
+    username = serializers.CharField(
+        max_length=150, validators=[UnicodeUsernameValidator()]
+    )
+    email = serializers.EmailField()
+    password = serializers.CharField(
+        write_only=True, required=False, allow_blank=True, trim_whitespace=False
+    )
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    role = serializers.ChoiceField(choices=CustomUser.ROLE_CHOICES, default="advisor")
+    phone = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    store = serializers.IntegerField(required=False, allow_null=True)
+    store_code = serializers.CharField(max_length=10, required=False, allow_blank=True)
+    hourly_rate = serializers.DecimalField(
+        max_digits=7, decimal_places=2, min_value=0, required=False
+    )
+    shift = serializers.CharField(required=False, allow_blank=True)
+    week_even_shift = serializers.CharField(required=False, allow_blank=True)
+    week_odd_shift = serializers.CharField(required=False, allow_blank=True)
+    anchor_monday = serializers.DateField(required=False)
+
+    class Meta:
+        list_serializer_class = UserImportListSerializer
+
+    def validate_email(self, value):
+        return value.lower().strip()
+
+    def validate_phone(self, value):
+        if value and (not value.isdigit() or len(value) != 10):
+            raise serializers.ValidationError("Phone number must be 10 digits")
+        return value
+
+    def validate_anchor_monday(self, value):
+        if value.weekday() != 0:
+            raise serializers.ValidationError("Anchor date must be a Monday.")
+        return value
+
+    def validate(self, attrs):
+        """
+        Check that advisor-only fields describe one consistent schedule.
+
+        Raises:
+            ValidationError: If advisor fields are set for another role, both
+                a fixed and an alternating schedule are given, or only one
+                alternating week is.
+        """
+        advisor_fields = [
+            field
+            for field in ("hourly_rate", "anchor_monday") + SHIFT_FIELDS
+            if attrs.get(field) not in (None, "")
+        ]
+        if advisor_fields and attrs["role"] != "advisor":
+            raise serializers.ValidationError(
+                dict.fromkeys(advisor_fields, "Only advisors have these settings.")
+            )
+        weeks = [attrs.get("week_even_shift"), attrs.get("week_odd_shift")]
+        if any(weeks) and not all(weeks):
+            raise serializers.ValidationError(
+                "Alternating schedules need week_even_shift and week_odd_shift."
+            )
+        if attrs.get("shift") and any(weeks):
+            raise serializers.ValidationError(
+                "Give either shift or week_even_shift/week_odd_shift, not both."
+            )
+        return attrs
@@ -1,7 +1,14 @@
 # accounts/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from accounts.authentication import invalidate_user
 from accounts.models import CustomUser
+from accounts.revocation import mark_revoked
+from store.models import Store
+
+# Saving only these fields leaves the cached authenticated user usable.
+_UNCACHED_FIELDS = frozenset({"last_login"})
 @receiver(post_save, sender=CustomUser)
 def auto_unassign_authority_on_user_change(sender, instance: CustomUser, **kwargs):
     """If a branch head becomes inactive or deleted, detach them from stores."""
@@ -14,3 +21,33 @@ def auto_unassign_authority_on_user_change(sender, instance: CustomUser, **kwarg
         if instance.store_id:
             instance.store = None
             instance.save(update_fields=["store"])
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_cached_user(sender, instance: CustomUser, update_fields=None, **kwargs):
+    """Drop the cached authenticated user after any change that may matter."""
+    if update_fields and set(update_fields) <= _UNCACHED_FIELDS:
+        return
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=CustomUser)
+def invalidate_deleted_user(sender, instance: CustomUser, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Store)
+@receiver(pre_delete, sender=Store)
+def invalidate_store_users(sender, instance: Store, **kwargs):
+    """Cached users carry their store; refresh the store's members."""
+    for user_id in CustomUser.objects.filter(store=instance).values_list(
+        "id", flat=True
+    ):
+        invalidate_user(user_id)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def cache_revoked_token(sender, instance: BlacklistedToken, created, **kwargs):
+    """Publish new blacklist entries, from any code path, to the revocation cache."""
+    if created:
+        mark_revoked(instance.token.jti, instance.token.expires_at)
@@ -1,8 +1,239 @@
-from rest_framework.throttling import SimpleRateThrottle
+"""
+Sliding-window throttles backed by a store shared by every worker.
 
+DRF's ``SimpleRateThrottle`` keeps a list with one timestamp per request in
+the default cache. Each worker process with its own cache enforces the limit
+on its own, so N workers allow N times the rate. The lists also grow with
+the rate, and a read-modify-write of a list can lose concurrent updates.
 
-class LoginRateThrottle(SimpleRateThrottle):
+:class:`SlidingWindowRateThrottle` instead keeps two counters per client:
+requests in the current fixed window and requests in the previous one. The
+rate is estimated as ``previous * (1 - elapsed) + current``, where
+``elapsed`` is the fraction of the current window that has passed, and the
+request is refused once the estimate exceeds the limit. Memory per client is
+constant whatever the rate. Refused requests count too, so a client that
+keeps hammering stays throttled.
+
+Counters live in the store named by ``THROTTLE_STORE``:
+
+- ``"database"``: one :class:`~accounts.models.ThrottleCounter` row per
+  client, updated by a single ``INSERT ... ON CONFLICT DO UPDATE ...
+  RETURNING`` statement, so concurrent workers never lose hits.
+  ``sweep_throttle_counters`` deletes rows of clients that have gone quiet.
+- ``"cache"``: two cache keys per client, bumped with ``cache.incr``. This is
+  atomic with Redis (``REDIS_URL``). It is not atomic with the file cache,
+  which is why ``"database"`` is the default without Redis.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from typing import Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router, transaction
+from django.utils import timezone
+from rest_framework.throttling import ScopedRateThrottle, SimpleRateThrottle
+
+from accounts.models import ThrottleCounter
+
+_UPSERT_SQL = """
+    INSERT INTO {table} ({key}, {period}, {hits}, {previous}, {expires})
+    VALUES (%s, %s, 1, 0, %s)
+    ON CONFLICT ({key}) DO UPDATE SET
+        {previous} = CASE
+            WHEN {table}.{period} = EXCLUDED.{period} THEN {table}.{previous}
+            WHEN {table}.{period} = EXCLUDED.{period} - 1 THEN {table}.{hits}
+            ELSE 0
+        END,
+        {hits} = CASE
+            WHEN {table}.{period} = EXCLUDED.{period} THEN {table}.{hits} + 1
+            ELSE 1
+        END,
+        {period} = EXCLUDED.{period},
+        {expires} = EXCLUDED.{expires}
+    RETURNING {previous}, {hits}
+"""
+
+
+def _expiry(period: int, duration: int) -> datetime:
+    # Once two more windows have started, the counters no longer matter.
+    return datetime.fromtimestamp((period + 2) * duration, tz=dt_timezone.utc)
+
+
+class DatabaseCounterStore:
+    """Keeps window counters in :class:`~accounts.models.ThrottleCounter`."""
+
+    def hit(self, key: str, period: int, duration: int) -> Tuple[int, int]:
+        """
+        Count one request for ``key`` in window ``period``.
+
+        Returns:
+            Tuple[int, int]: Requests in the previous and current window,
+            the current one including this request.
+        """
+        using = router.db_for_write(ThrottleCounter)
+        connection = connections[using]
+        expires = _expiry(period, duration)
+        if connection.vendor not in ("postgresql", "sqlite"):
+            return self._hit_locked(key, period, expires, using)
+        qn = connection.ops.quote_name
+        meta = ThrottleCounter._meta
+        sql = _UPSERT_SQL.format(
+            table=qn(meta.db_table),
+            **{
+                name: qn(meta.get_field(field).column)
+                for name, field in (
+                    ("key", "key"),
+                    ("period", "period"),
+                    ("hits", "hits"),
+                    ("previous", "previous_hits"),
+                    ("expires", "expires_at"),
+                )
+            },
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql,
+                [key, period, connection.ops.adapt_datetimefield_value(expires)],
+            )
+            previous, current = cursor.fetchone()
+        return previous, current
+
+    def _hit_locked(self, key, period, expires, using) -> Tuple[int, int]:
+        with transaction.atomic(using=using):
+            counter, created = (
+                ThrottleCounter.objects.using(using)
+                .select_for_update()
+                .get_or_create(
+                    key=key,
+                    defaults={"period": period, "hits": 1, "expires_at": expires},
+                )
+            )
+            if created:
+                return 0, 1
+            if counter.period == period:
+                counter.hits += 1
+            else:
+                counter.previous_hits = (
+                    counter.hits if counter.period == period - 1 else 0
+                )
+                counter.hits = 1
+            counter.period = period
+            counter.expires_at = expires
+            counter.save()
+            return counter.previous_hits, counter.hits
+
+
+class CacheCounterStore:
+    """Keeps window counters in the default cache (atomic with Redis)."""
+
+    def hit(self, key: str, period: int, duration: int) -> Tuple[int, int]:
+        current_key = f"{key}:{period}"
+        cache.add(current_key, 0, duration * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Expired between ``add`` and ``incr``.
+            cache.set(current_key, 1, duration * 2)
+            current = 1
+        return cache.get(f"{key}:{period - 1}", 0), current
+
+
+STORES = {"database": DatabaseCounterStore, "cache": CacheCounterStore}
+
+
+def get_store(name: str = None):
+    """Return the counter store named ``name`` (default ``THROTTLE_STORE``)."""
+
+    name = name or getattr(settings, "THROTTLE_STORE", "database")
+    try:
+        return STORES[name]()
+    except KeyError:
+        raise ImproperlyConfigured(
+            f"THROTTLE_STORE must be one of {', '.join(STORES)}, not {name!r}"
+        )
+
+
+def sweep_expired(batch_size: int = 5000) -> int:
+    """
+    Delete counters of clients with no requests in the last two windows.
+
+    Returns:
+        int: Number of rows deleted.
+    """
+    expired = ThrottleCounter.objects.filter(expires_at__lt=timezone.now())
+    deleted = 0
+    while True:
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += ThrottleCounter.objects.filter(id__in=ids).delete()[0]
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    ``SimpleRateThrottle`` with a fixed-memory sliding-window counter.
+
+    Subclasses still define ``scope``/``rate`` and ``get_cache_key`` as for
+    DRF; only the counting changes. ``store`` overrides ``THROTTLE_STORE``.
+
+    Example:
+        class LoginRateThrottle(SlidingWindowRateThrottle):
+            scope = "login"
+
+            def get_cache_key(self, request, view):
+                return f"login:{self.get_ident(request)}"
+    """
+
+    store = None
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        period = int(self.now // self.duration)
+        self.elapsed = self.now / self.duration - period
+        self.previous, self.current = get_store(self.store).hit(
+            self.key, period, self.duration
+        )
+        estimate = self.previous * (1 - self.elapsed) + self.current
+        if estimate > self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    def wait(self):
+        """
+        Seconds until the estimate leaves room for one more request.
+        """
+        room = self.num_requests - self.current - 1
+        if room >= 0:
+            # The previous window's weight must fade enough within this one.
+            fraction = 1 - room / self.previous - self.elapsed if self.previous else 0
+        else:
+            # Only once this window's hits are the fading previous window.
+            fraction = (1 - self.elapsed) + max(
+                0, 1 - (self.num_requests - 1) / self.current
+            )
+        return max(0.0, fraction * self.duration)
+
+
+class SlidingWindowScopedRateThrottle(ScopedRateThrottle, SlidingWindowRateThrottle):
+    """
+    ``ScopedRateThrottle`` (rates per ``view.throttle_scope``) with
+    sliding-window counting.
+    """
+
+
+class LoginRateThrottle(SlidingWindowRateThrottle):
     scope = "login"
 
-    def get_cache_key(self, request, view):  # pragma: no cover - simple ident
-        return self.get_ident(request)
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
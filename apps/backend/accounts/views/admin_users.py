@@ -6,12 +6,19 @@ and soft deletion capabilities. Only system administrators can access these endp
 """
 
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db.models import Q
 
 from accounts.models import CustomUser
-from accounts.serializers import CustomUserSerializer, RegisterUserSerializer
+from accounts.provisioning import guess_format, read_rows
+from accounts.serializers import (
+    CustomUserSerializer,
+    RegisterUserSerializer,
+    UserImportSerializer,
+)
 from accounts.permissions import IsSystemAdminUser
 
 
@@ -56,6 +63,9 @@ class AdminUserViewSet(viewsets.ModelViewSet):
 
     queryset = CustomUser.objects.filter(deleted=False).select_related("store")
     permission_classes = [IsAuthenticated, IsSystemAdminUser]
+    # Imports over HTTP hash passwords inline in the request, so they stay
+    # small; larger ones go through the import_users command.
+    bulk_max_users = 100
 
     def get_serializer_class(self):
         """
@@ -98,6 +108,61 @@ class AdminUserViewSet(viewsets.ModelViewSet):
         user = serializer.save()
         return Response(CustomUserSerializer(user).data, status=status.HTTP_201_CREATED)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[JSONParser, MultiPartParser, FormParser],
+    )
+    def import_users(self, request):
+        """
+        Create many users at once from a JSON list or an uploaded file.
+
+        Accepts either a JSON array of rows or a multipart upload with a
+        ``file`` in CSV or JSON lines format (taken from the extension or an
+        explicit ``format`` field). Rows are validated together and created
+        in one transaction; any invalid row rejects the whole batch.
+
+        At most ``bulk_max_users`` rows are accepted. Passwords are hashed in
+        this worker, never in a forked pool; bigger imports belong in
+        ``python manage.py import_users``.
+
+        Args:
+            request (Request): HTTP request with rows or an import file.
+
+        Returns:
+            Response: Created users with HTTP 201, or per-row errors with 400.
+
+        Example:
+            POST /api/users/import
+            Content-Type: multipart/form-data
+            file=advisors.csv
+
+            username,email,password,role,store_code,hourly_rate,shift
+            advisor7,advisor7@example.com,securepass123,advisor,MB001,120,Shift A
+        """
+        upload = request.FILES.get("file")
+        rows = request.data
+        if upload is not None:
+            fmt = request.data.get("format") or guess_format(upload.name)
+            try:
+                rows = read_rows(upload.read().decode("utf-8-sig"), fmt)
+            except (UnicodeDecodeError, ValueError) as e:
+                return Response({"file": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = UserImportSerializer(
+            data=rows,
+            many=True,
+            allow_empty=False,
+            max_length=self.bulk_max_users,
+            context={"hash_workers": 1},
+        )
+        serializer.is_valid(raise_exception=True)
+        users = serializer.save()
+        return Response(
+            CustomUserSerializer(users, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
     def destroy(self, request, *args, **kwargs):
         """
         Soft delete a user account.
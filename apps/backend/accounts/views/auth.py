@@ -17,9 +17,9 @@ from accounts.serializers import (
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.permissions import IsAuthenticated, BasePermission
 from accounts.permissions import IsSystemAdminUser
+from accounts.revocation import RevocableRefreshToken
 from accounts.throttles import LoginRateThrottle
 
 
@@ -163,7 +163,7 @@ class LogoutView(APIView):
             )
 
         try:
-            token = RefreshToken(refresh_token)
+            token = RevocableRefreshToken(refresh_token)
             token.blacklist()
             return Response(
                 {"detail": "Logout successful"}, status=status.HTTP_205_RESET_CONTENT
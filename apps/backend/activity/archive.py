@@ -0,0 +1,188 @@
+"""Retention and archival of :class:`~activity.models.EventLog` rows.
+
+Rows older than ``EVENTLOG_RETENTION_DAYS`` are moved out of the database,
+one calendar month (UTC) at a time, into gzip-compressed JSON lines files
+under ``EVENTLOG_ARCHIVE_DIR``::
+
+    <archive dir>/2025-01/<nanosecond timestamp>.jsonl.gz
+
+Archival only ever covers whole months, so the retention window is rounded
+down to a month boundary and an archived month lines up with an EventLog
+partition (see :mod:`activity.partitions`) that can be dropped outright.
+Rows are written newest first, the same order the log endpoints use, and
+carry the actor's username so exports do not depend on the user still
+existing. A month archived again later (for example after events were
+drained from a spool late) gets an additional file next to the first.
+
+:func:`archived_rows` reads the files back for ``/api/logs/export/``.
+"""
+
+import gzip
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterator, Optional
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import EventLog
+from .partitions import drop_partition, month_start, next_month
+
+ARCHIVE_SUFFIX = ".jsonl.gz"
+ARCHIVE_FIELDS = [
+    "id",
+    "actor_id",
+    "actor__username",
+    "entity_type",
+    "entity_id",
+    "action",
+    "reason",
+    "metadata",
+    "timestamp",
+]
+
+
+def archive_dir() -> str:
+    return getattr(
+        settings,
+        "EVENTLOG_ARCHIVE_DIR",
+        os.path.join(settings.BASE_DIR, ".archive", "eventlog"),
+    )
+
+
+def retention_cutoff(days: Optional[int] = None, now: Optional[datetime] = None):
+    """Start of the oldest month that is kept in the database."""
+
+    if days is None:
+        days = getattr(settings, "EVENTLOG_RETENTION_DAYS", 365)
+    return month_start((now or timezone.now()) - timedelta(days=days))
+
+
+def _write_month(path: str, rows) -> int:
+    tmp_path = path + ".tmp"
+    written = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+        for row in rows:
+            data = dict(zip(ARCHIVE_FIELDS, row))
+            data["actor"] = data.pop("actor__username")
+            data["timestamp"] = data["timestamp"].isoformat()
+            fh.write(json.dumps(data) + "\n")
+            written += 1
+    if not written:
+        os.remove(tmp_path)
+        return 0
+    os.replace(tmp_path, path)
+    return written
+
+
+def _delete_month(rows, start: datetime, high: int, batch_size: int) -> None:
+    if not rows.filter(id__gt=high).exists() and drop_partition(start):
+        return
+    # EventLog.delete() refuses to run; queryset deletes go through the
+    # collector instead and are batched to keep each transaction short.
+    while True:
+        ids = list(rows.filter(id__lte=high).values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return
+        EventLog.objects.filter(id__in=ids).delete()
+
+
+def archive_month(start: datetime, batch_size: int = 5000) -> int:
+    """Archive and delete the EventLog rows of the month starting at ``start``.
+
+    Only rows that existed when archival started (``id`` up to the current
+    maximum) are touched; anything inserted meanwhile stays for the next run.
+    The archive file is complete on disk before a single row is deleted.
+
+    Returns:
+        int: Number of rows archived.
+    """
+
+    rows = EventLog.objects.filter(
+        timestamp__gte=start, timestamp__lt=next_month(start)
+    )
+    high = rows.aggregate(high=Max("id"))["high"]
+    if high is None:
+        return 0
+    directory = os.path.join(archive_dir(), f"{start:%Y-%m}")
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{time.time_ns():020d}{ARCHIVE_SUFFIX}")
+    snapshot = (
+        rows.filter(id__lte=high)
+        .order_by("-timestamp", "-id")
+        .values_list(*ARCHIVE_FIELDS)
+        .iterator(chunk_size=batch_size)
+    )
+    written = _write_month(path, snapshot)
+    _delete_month(rows, start, high, batch_size)
+    return written
+
+
+def archive_before(cutoff: datetime, batch_size: int = 5000) -> Dict[str, int]:
+    """Archive every month that ends on or before ``cutoff``.
+
+    Returns:
+        Dict[str, int]: Rows archived per ``YYYY-MM`` month.
+    """
+
+    cutoff = month_start(cutoff)
+    months = EventLog.objects.filter(timestamp__lt=cutoff).datetimes(
+        "timestamp", "month", tzinfo=dt_timezone.utc
+    )
+    archived = {}
+    for start in months:
+        archived[f"{start:%Y-%m}"] = archive_month(start, batch_size)
+    return archived
+
+
+def _in_range(data, start, end, entity_type, actor) -> bool:
+    if entity_type and data["entity_type"] != entity_type:
+        return False
+    if actor and str(data["actor_id"]) != str(actor):
+        return False
+    timestamp = parse_datetime(data["timestamp"])
+    if start and timestamp < start:
+        return False
+    if end and timestamp > end:
+        return False
+    return True
+
+
+def archived_rows(
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    entity_type: Optional[str] = None,
+    actor: Optional[str] = None,
+) -> Iterator[dict]:
+    """Yield archived events matching the log list filters, newest month first.
+
+    Months outside ``start``/``end`` are skipped without being opened, and
+    files are decompressed line by line, so memory use stays flat.
+    """
+
+    directory = archive_dir()
+    if not os.path.isdir(directory):
+        return
+    first = month_start(start) if start else None
+    for month in sorted(os.listdir(directory), reverse=True):
+        try:
+            month_begin = datetime.strptime(month, "%Y-%m").replace(
+                tzinfo=dt_timezone.utc
+            )
+        except ValueError:
+            continue
+        if end and month_begin > end or first and month_begin < first:
+            continue
+        month_dir = os.path.join(directory, month)
+        for name in sorted(os.listdir(month_dir), reverse=True):
+            if not name.endswith(ARCHIVE_SUFFIX):
+                continue
+            with gzip.open(os.path.join(month_dir, name), "rt", encoding="utf-8") as fh:
+                for line in fh:
+                    data = json.loads(line)
+                    if _in_range(data, start, end, entity_type, actor):
+                        yield data
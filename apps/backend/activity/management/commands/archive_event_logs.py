@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from activity.archive import archive_before, archive_dir, retention_cutoff
+from activity.partitions import ensure_partitions
+
+
+class Command(BaseCommand):
+    """Apply the EventLog retention window.
+
+    Creates upcoming monthly partitions (PostgreSQL only), then moves every
+    month older than the retention window into compressed JSON lines files
+    that ``/api/logs/export/?archived=true`` still streams from. Run it daily
+    or at least monthly::
+
+        python manage.py archive_event_logs --days=365
+    """
+
+    help = "Archive EventLog months past the retention window and create partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Retention window in days (default: EVENTLOG_RETENTION_DAYS)",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=2,
+            help="Monthly partitions to keep created ahead of the current month",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows read and deleted per round trip",
+        )
+
+    def handle(self, *args, **options):
+        created = ensure_partitions(options["months_ahead"])
+        for name in created:
+            self.stdout.write(f"created partition {name}")
+        cutoff = retention_cutoff(options["days"])
+        archived = archive_before(cutoff, options["batch_size"])
+        for month, count in archived.items():
+            self.stdout.write(f"archived {month}: {count} rows")
+        self.stdout.write(
+            f"archive_event_logs: cutoff={cutoff:%Y-%m-%d} "
+            f"archived={sum(archived.values())} to {archive_dir()}"
+        )
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from activity.audit import drain_spool, spool_dir
+
+
+class Command(BaseCommand):
+    """Load spooled audit events into EventLog.
+
+    Bulk imports run with ``buffered(spool=True)`` (or ``AUDIT_LOG_SPOOL``)
+    write their audit trail to JSON lines files instead of the database. Run
+    this once after the import or keep it running as a worker::
+
+        python manage.py drain_audit_log --loop --interval=10
+    """
+
+    help = "Insert spooled audit events into the EventLog table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the spool directory instead of exiting",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10.0,
+            help="Seconds to sleep between polls when --loop is set",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            total += drain_spool()
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(f"drain_audit_log: inserted={total} from {spool_dir()}")
@@ -0,0 +1,12 @@
+from .audit import buffered
+
+
+class AuditBufferMiddleware:
+    """Write the audit events of a request in one batch when it finishes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with buffered():
+            return self.get_response(request)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:59
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="eventlog",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
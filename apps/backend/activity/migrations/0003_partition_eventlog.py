@@ -0,0 +1,52 @@
+"""Partition the EventLog table by month on PostgreSQL.
+
+The table is rebuilt as ``PARTITION BY RANGE ("timestamp")`` with a ``DEFAULT``
+partition holding the existing rows; ``archive_event_logs`` creates the
+monthly partitions and moves rows out of the default partition into them.
+A partitioned table's primary key must include the partition column, so the
+key becomes ``(id, timestamp)``; ``id`` stays unique through its identity
+sequence. Other backends are left untouched.
+"""
+
+from django.conf import settings
+from django.db import migrations
+
+
+def partition_eventlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    qn = connection.ops.quote_name
+    table = apps.get_model("activity", "EventLog")._meta.db_table
+    users = apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table
+    old = f"{table}_unpartitioned"
+    for statement in [
+        f"ALTER TABLE {qn(table)} RENAME TO {qn(old)}",
+        f"CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS "
+        f'INCLUDING IDENTITY INCLUDING CONSTRAINTS) PARTITION BY RANGE ("timestamp")',
+        f'ALTER TABLE {qn(table)} ADD PRIMARY KEY ("id", "timestamp")',
+        f"CREATE TABLE {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT",
+        f"INSERT INTO {qn(table)} OVERRIDING SYSTEM VALUE SELECT * FROM {qn(old)}",
+        f"DROP TABLE {qn(old)}",
+        f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_actor_id_fk')} "
+        f'FOREIGN KEY ("actor_id") REFERENCES {qn(users)} ("id") '
+        "DEFERRABLE INITIALLY DEFERRED",
+        f"CREATE INDEX {qn(table + '_actor_id_idx')} ON {qn(table)} (\"actor_id\")",
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f'COALESCE((SELECT MAX("id") FROM {qn(table)}), 0) + 1, false)',
+    ]:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity", "0002_alter_eventlog_timestamp"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # A partitioned table works as a plain one for Django, so there is
+        # nothing to undo when migrating backwards.
+        migrations.RunPython(partition_eventlog, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity", "0003_partition_eventlog"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="eventlog",
+            index=models.Index(fields=["-timestamp", "-id"], name="eventlog_ts_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="eventlog",
+            index=models.Index(
+                fields=["entity_type", "-timestamp"], name="eventlog_type_ts_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventlog",
+            index=models.Index(
+                fields=["actor", "-timestamp"], name="eventlog_actor_ts_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class EventLog(models.Model):
@@ -11,10 +12,20 @@ class EventLog(models.Model):
     action = models.CharField(max_length=20)
     reason = models.TextField(null=True, blank=True)
     metadata = models.JSONField(null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens; rows may be written later in a batch.
+    timestamp = models.DateTimeField(default=timezone.now)
 
     class Meta:
         ordering = ["-timestamp"]
+        # Match the log list filters; each ends in the timestamp so range
+        # filters and the (-timestamp, -id) cursor ordering use the index.
+        indexes = [
+            models.Index(fields=["-timestamp", "-id"], name="eventlog_ts_id_idx"),
+            models.Index(
+                fields=["entity_type", "-timestamp"], name="eventlog_type_ts_idx"
+            ),
+            models.Index(fields=["actor", "-timestamp"], name="eventlog_actor_ts_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if self.pk:
@@ -0,0 +1,145 @@
+"""Monthly range partitions of the :class:`~activity.models.EventLog` table.
+
+On PostgreSQL, migration ``0003`` turns the table into one partitioned by
+``RANGE (timestamp)``, with one partition per calendar month (UTC) and a
+``DEFAULT`` partition that catches rows no monthly partition covers.
+:func:`ensure_partitions` creates the current and upcoming months ahead of
+time. :func:`drop_partition` lets archival discard a whole month in O(1)
+instead of deleting row by row.
+
+Other backends keep a single table, and every helper here is a no-op on them.
+Retention there falls back to batched deletes (see :mod:`activity.archive`).
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from typing import List, Optional
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import EventLog
+
+TABLE = EventLog._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def _connection():
+    return connections[router.db_for_write(EventLog)]
+
+
+def month_start(value: datetime) -> datetime:
+    """Return the first instant (UTC) of the month ``value`` falls in."""
+
+    value = value.astimezone(dt_timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start: datetime) -> datetime:
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(start: datetime) -> str:
+    return f"{TABLE}_p{start:%Y%m}"
+
+
+def is_partitioned(connection=None) -> bool:
+    """Return whether the EventLog table is partitioned on this database."""
+
+    connection = connection or _connection()
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def partition_exists(start: datetime, connection=None) -> bool:
+    connection = connection or _connection()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass AND c.relname = %s",
+            [TABLE, partition_name(start)],
+        )
+        return cursor.fetchone() is not None
+
+
+def create_partition(start: datetime, connection=None) -> bool:
+    """Create the partition for the month starting at ``start``.
+
+    Rows already sitting in the default partition for that month are moved
+    into the new partition first; PostgreSQL refuses to attach a range the
+    default partition still holds rows for.
+
+    Returns:
+        bool: ``False`` when the partition already existed.
+    """
+
+    connection = connection or _connection()
+    if partition_exists(start, connection):
+        return False
+    name = connection.ops.quote_name(partition_name(start))
+    parent = connection.ops.quote_name(TABLE)
+    default = connection.ops.quote_name(DEFAULT_PARTITION)
+    bounds = [start, next_month(start)]
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {name} "
+            f"(LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {default} "
+            f'WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *) '
+            f"INSERT INTO {name} SELECT * FROM moved",
+            bounds,
+        )
+        cursor.execute(
+            f"ALTER TABLE {parent} ATTACH PARTITION {name} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+    return True
+
+
+def ensure_partitions(
+    months_ahead: int = 2, now: Optional[datetime] = None
+) -> List[str]:
+    """Make sure partitions exist from this month to ``months_ahead`` ahead.
+
+    Returns:
+        List[str]: Names of the partitions created.
+    """
+
+    connection = _connection()
+    if not is_partitioned(connection):
+        return []
+    start = month_start(now or timezone.now())
+    created = []
+    for _ in range(months_ahead + 1):
+        if create_partition(start, connection):
+            created.append(partition_name(start))
+        start = next_month(start)
+    return created
+
+
+def drop_partition(start: datetime, connection=None) -> bool:
+    """Detach and drop the partition for the month starting at ``start``.
+
+    Returns:
+        bool: ``False`` when there was no such partition.
+    """
+
+    connection = connection or _connection()
+    if not is_partitioned(connection) or not partition_exists(start, connection):
+        return False
+    name = connection.ops.quote_name(partition_name(start))
+    parent = connection.ops.quote_name(TABLE)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {parent} DETACH PARTITION {name}")
+        cursor.execute(f"DROP TABLE {name}")
+    return True
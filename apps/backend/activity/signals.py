@@ -1,6 +1,7 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from bookings.models import Booking
+from catalog.cache import invalidate_taxonomy_cache
 from catalog.models import (
     Product,
     Variant,
@@ -10,19 +11,14 @@ from catalog.models import (
     Unit,
     Quality,
 )
+from marketing.models import Brand
 from spares.models import Spare
 from store.models import Store
-from .models import EventLog
+from .audit import record
 
 
 def _create_log(instance, action):
-    EventLog.objects.create(
-        actor=getattr(instance, "user", None),
-        entity_type=instance._meta.model_name,
-        entity_id=str(instance.pk),
-        action=action,
-        reason=getattr(instance, "reason", None),
-    )
+    record(instance, action)
 
 
 @receiver(post_save, sender=Booking)
@@ -75,11 +71,25 @@ def log_store_delete(sender, instance, **kwargs):
     _create_log(instance, "deleted")
 
 
-for model in [Department, Category, SubCategory, Unit, Quality]:
-    @receiver(post_save, sender=model)
-    def _save(sender, instance, created, **kwargs):
-        _create_log(instance, "created" if created else "updated")
+TAXONOMY_MODELS = [Department, Category, SubCategory, Unit, Quality, Brand]
+
+
+# Connected explicitly: receivers defined inside a loop are weakly referenced
+# and all but the last pair would be garbage collected.
+def log_taxonomy_save(sender, instance, created, **kwargs):
+    _create_log(instance, "created" if created else "updated")
+    invalidate_taxonomy_cache()
+
+
+def log_taxonomy_delete(sender, instance, **kwargs):
+    _create_log(instance, "deleted")
+    invalidate_taxonomy_cache()
+
 
-    @receiver(post_delete, sender=model)
-    def _delete(sender, instance, **kwargs):
-        _create_log(instance, "deleted")
+for model in TAXONOMY_MODELS:
+    post_save.connect(
+        log_taxonomy_save, sender=model, dispatch_uid=f"log_{model.__name__}_save"
+    )
+    post_delete.connect(
+        log_taxonomy_delete, sender=model, dispatch_uid=f"log_{model.__name__}_delete"
+    )
@@ -1,18 +1,33 @@
+from datetime import datetime, time
+from itertools import chain
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import permissions, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import HttpResponse
-import csv
 
 from accounts.permissions import IsSystemAdminUser
+from utils.export import queryset_rows, stream_csv
+from .archive import archived_rows
 from .models import EventLog
 from .serializers import EventLogSerializer
 
+EXPORT_FIELDS = [
+    "id",
+    "actor__username",
+    "entity_type",
+    "action",
+    "reason",
+    "timestamp",
+]
+
 
 class EventLogViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = EventLog.objects.all()
+    queryset = EventLog.objects.select_related("actor")
     serializer_class = EventLogSerializer
     permission_classes = [permissions.IsAuthenticated, IsSystemAdminUser]
+    cursor_ordering = ("-timestamp", "-id")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -31,6 +46,25 @@ class EventLogViewSet(viewsets.ReadOnlyModelViewSet):
             qs = qs.filter(timestamp__lte=end)
         return qs
 
+    def _archived_rows(self):
+        params = self.request.query_params
+        return (
+            (
+                data["id"],
+                data["actor"] or "",
+                data["entity_type"],
+                data["action"],
+                data["reason"] or "",
+                data["timestamp"],
+            )
+            for data in archived_rows(
+                start=_parse_bound(params.get("start")),
+                end=_parse_bound(params.get("end")),
+                entity_type=params.get("entity_type"),
+                actor=params.get("actor"),
+            )
+        )
+
     @action(detail=False, methods=["get"])
     def export(self, request):
         fmt = request.query_params.get("format", "csv")
@@ -38,19 +72,33 @@ class EventLogViewSet(viewsets.ReadOnlyModelViewSet):
         if fmt == "json":
             serializer = self.get_serializer(logs, many=True)
             return Response(serializer.data)
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=event_logs.csv"
-        writer = csv.writer(response)
-        writer.writerow(["id", "actor", "entity_type", "action", "reason", "timestamp"])
-        for log in logs:
-            writer.writerow(
-                [
-                    log.id,
-                    getattr(log.actor, "username", ""),
-                    log.entity_type,
-                    log.action,
-                    log.reason or "",
-                    log.timestamp.isoformat(),
-                ]
+        rows = (
+            (pk, actor or "", entity_type, act, reason or "", ts.isoformat())
+            for pk, actor, entity_type, act, reason, ts in queryset_rows(
+                logs, EXPORT_FIELDS
             )
-        return response
+        )
+        if request.query_params.get("archived") in ("1", "true"):
+            # Archived months are all older than the rows still in the table.
+            rows = chain(rows, self._archived_rows())
+        return stream_csv(
+            "event_logs.csv",
+            ["id", "actor", "entity_type", "action", "reason", "timestamp"],
+            rows,
+        )
+
+
+def _parse_bound(value):
+    """Parse a ``start``/``end`` filter the way the queryset filter reads it."""
+
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            return None
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
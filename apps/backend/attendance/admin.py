@@ -18,6 +18,7 @@ from .models import (
     AdvisorPayrollProfile,
     AdvisorSchedule,
     Attendance,
+    AttendanceMonthlyRollup,
     AttendanceRequest,
     ScheduleException,
     Shift,
@@ -433,3 +434,33 @@ def admin_image_thumb(filefield, width=80):
         if url
         else "-"
     )
+
+
+# ---------------------------------------------------------------------------
+# Monthly rollups
+# ---------------------------------------------------------------------------
+@admin.register(AttendanceMonthlyRollup)
+class AttendanceMonthlyRollupAdmin(admin.ModelAdmin):
+    """Read-only admin for :class:`AttendanceMonthlyRollup` rows."""
+
+    list_display = (
+        "month",
+        "user",
+        "store",
+        "total_shifts",
+        "present_days",
+        "half_days",
+        "absents",
+        "worked_minutes",
+        "approved_ot_minutes",
+        "updated_at",
+    )
+    list_filter = ("store", "month")
+    search_fields = ("user__username", "user__first_name", "user__last_name")
+    date_hierarchy = "month"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
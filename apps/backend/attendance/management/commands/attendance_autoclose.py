@@ -1,9 +1,9 @@
 from datetime import date, timedelta
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
-from attendance.tasks import autoclose_for_date
+from attendance.tasks import autoclose_for_range
 
 
 class Command(BaseCommand):
@@ -15,25 +15,53 @@ class Command(BaseCommand):
         59 23 * * * /path/to/venv/bin/python manage.py attendance_autoclose --date=$(TZ=Asia/Kolkata date -I)
         # Or run each morning for yesterday (default)
         10 00 * * * /path/to/venv/bin/python manage.py attendance_autoclose
+
+    Backfill a range of days in one pass::
+
+        python manage.py attendance_autoclose --dates=2025-08-01:2025-08-31
     """
 
-    help = "Finalize open attendances and mark absents for a given date"
+    help = "Finalize open attendances and mark absents for a given date or range"
 
     def add_arguments(self, parser):
-        parser.add_argument(
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument(
             "--date",
             dest="date",
             help="Target date in YYYY-MM-DD format (defaults to yesterday in local tz)",
         )
+        group.add_argument(
+            "--dates",
+            dest="dates",
+            help="Inclusive date range in START:END format (YYYY-MM-DD:YYYY-MM-DD)",
+        )
 
     def handle(self, *args, **options):
         date_str = options.get("date")
-        if date_str:
-            target_date = date.fromisoformat(date_str)
+        range_str = options.get("dates")
+        if range_str:
+            start_date, end_date = self._parse_range(range_str)
+        elif date_str:
+            start_date = end_date = date.fromisoformat(date_str)
         else:
-            target_date = timezone.localdate() - timedelta(days=1)
+            start_date = end_date = timezone.localdate() - timedelta(days=1)
 
-        result = autoclose_for_date(target_date)
+        result = autoclose_for_range(start_date, end_date)
+        label = (
+            str(start_date) if start_date == end_date else f"{start_date}:{end_date}"
+        )
         self.stdout.write(
-            f"attendance_autoclose {target_date}: finalized={result['finalized']} absents={result['absents_created']}"
+            f"attendance_autoclose {label}: finalized={result['finalized']} absents={result['absents_created']}"
         )
+
+    @staticmethod
+    def _parse_range(value: str):
+        try:
+            start_s, end_s = value.split(":")
+            start_date = date.fromisoformat(start_s)
+            end_date = date.fromisoformat(end_s)
+        except ValueError:
+            raise CommandError("--dates must be in START:END format (YYYY-MM-DD)")
+        if end_date < start_date:
+            raise CommandError("--dates end must not be before start")
+        return start_date, end_date
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from attendance.rollups import rebuild_monthly_rollups
+
+
+class Command(BaseCommand):
+    """Rebuild precomputed monthly attendance rollups from attendance rows.
+
+    Examples::
+
+        # Current month
+        python manage.py rebuild_attendance_rollups
+        # A single month or an inclusive range of months
+        python manage.py rebuild_attendance_rollups --months=2025-08
+        python manage.py rebuild_attendance_rollups --months=2025-01:2025-06 --store=3
+    """
+
+    help = "Rebuild AttendanceMonthlyRollup rows for a month or range of months"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            dest="months",
+            help="Month (YYYY-MM) or inclusive range START:END (defaults to current month)",
+        )
+        parser.add_argument(
+            "--store",
+            dest="store",
+            type=int,
+            help="Only rebuild rollups for this store id",
+        )
+
+    def handle(self, *args, **options):
+        months = options.get("months")
+        if months:
+            first_month, last_month = self._parse_months(months)
+        else:
+            first_month = last_month = timezone.localdate().replace(day=1)
+
+        written = rebuild_monthly_rollups(
+            first_month, last_month, store_id=options.get("store")
+        )
+        self.stdout.write(
+            f"rebuild_attendance_rollups {first_month:%Y-%m}:{last_month:%Y-%m}: rows={written}"
+        )
+
+    @staticmethod
+    def _parse_months(value: str):
+        parts = value.split(":")
+        if len(parts) not in (1, 2):
+            raise CommandError("--months must be YYYY-MM or YYYY-MM:YYYY-MM")
+        try:
+            bounds = [datetime.strptime(p, "%Y-%m").date() for p in parts]
+        except ValueError:
+            raise CommandError("--months must be YYYY-MM or YYYY-MM:YYYY-MM")
+        first_month, last_month = bounds[0], bounds[-1]
+        if last_month < first_month:
+            raise CommandError("--months end must not be before start")
+        return first_month, last_month
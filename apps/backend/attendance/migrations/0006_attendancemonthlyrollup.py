@@ -0,0 +1,107 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Attendance = apps.get_model("attendance", "Attendance")
+    AttendanceMonthlyRollup = apps.get_model("attendance", "AttendanceMonthlyRollup")
+    rows = (
+        Attendance.objects.annotate(rollup_month=TruncMonth("date"))
+        .values("store_id", "user_id", "rollup_month")
+        .annotate(
+            total_shifts=Count("id"),
+            present_days=Count("id", filter=Q(status="PRESENT")),
+            half_days=Count("id", filter=Q(status="HALF_DAY")),
+            absents=Count("id", filter=Q(status="ABSENT")),
+            worked=Sum("worked_minutes"),
+            ot=Sum("ot_minutes"),
+        )
+        .order_by()
+    )
+    AttendanceMonthlyRollup.objects.bulk_create(
+        [
+            AttendanceMonthlyRollup(
+                store_id=row["store_id"],
+                user_id=row["user_id"],
+                month=row["rollup_month"],
+                total_shifts=row["total_shifts"],
+                present_days=row["present_days"],
+                half_days=row["half_days"],
+                absents=row["absents"],
+                worked_minutes=row["worked"] or 0,
+                approved_ot_minutes=row["ot"] or 0,
+            )
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("attendance", "0005_genericidempotency"),
+        ("store", "0007_store_refactor"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AttendanceMonthlyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField(help_text="First day of the month.")),
+                ("total_shifts", models.PositiveIntegerField(default=0)),
+                ("present_days", models.PositiveIntegerField(default=0)),
+                ("half_days", models.PositiveIntegerField(default=0)),
+                ("absents", models.PositiveIntegerField(default=0)),
+                ("worked_minutes", models.PositiveIntegerField(default=0)),
+                ("approved_ot_minutes", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_rollups",
+                        to="store.store",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attendance_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-month"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "month"], name="attendance__user_id_563e3e_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("store", "user", "month"),
+                        name="unique_rollup_store_user_month",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -13,6 +13,8 @@ includes models for:
   a branch head or admin.
 - **Payroll (`AdvisorPayrollProfile`)**: Stores payroll-related information
   for advisors.
+- **Reporting (`AttendanceMonthlyRollup`)**: Precomputed per-advisor monthly
+  totals read by the monthly report endpoints.
 - **Idempotency (`GenericIdempotency`)**: Prevents duplicate operations for
   critical endpoints like check-in and check-out.
 
@@ -30,13 +32,14 @@ Note:
 """
 
 from datetime import date, datetime, timedelta
-from typing import Optional
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -841,6 +844,9 @@ class AttendanceRequest(models.Model):
         - **OUTSIDE_GEOFENCE, LATE**: No direct field changes on approval; the
           approval itself is the desired outcome.
 
+        Saving the attendance fires `finalize_attendance`, which also refreshes
+        the advisor's `AttendanceMonthlyRollup` for the month.
+
         Args:
             actor: The user instance (e.g., branch head, admin) approving
                 the request.
@@ -941,6 +947,63 @@ class AttendanceRequest(models.Model):
         super().clean()
 
 
+class AttendanceMonthlyRollup(models.Model):
+    """Precomputed monthly attendance totals for one advisor in one store.
+
+    Monthly reports read one row per advisor from this table instead of
+    re-aggregating every `Attendance` row on each request. Rows are refreshed
+    incrementally whenever an attendance changes (see `finalize_attendance`
+    and `attendance.rollups.refresh_monthly_rollups`) and can be rebuilt for
+    any month range with the `rebuild_attendance_rollups` management command.
+
+    Attributes:
+        store (ForeignKey): The store the attendance rows belong to.
+        user (ForeignKey): The advisor the totals are for.
+        month (DateField): The first calendar day of the month.
+        total_shifts (PositiveIntegerField): Number of attendance rows.
+        present_days (PositiveIntegerField): Rows with status 'PRESENT'.
+        half_days (PositiveIntegerField): Rows with status 'HALF_DAY'.
+        absents (PositiveIntegerField): Rows with status 'ABSENT'.
+        worked_minutes (PositiveIntegerField): Sum of worked minutes.
+        approved_ot_minutes (PositiveIntegerField): Sum of approved OT minutes.
+        updated_at (DateTimeField): Timestamp of the last refresh.
+
+    Constraints:
+        - `unique_rollup_store_user_month`: One row per store, advisor and
+          month.
+    """
+
+    store = models.ForeignKey(
+        "store.Store", on_delete=models.CASCADE, related_name="attendance_rollups"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="attendance_rollups",
+    )
+    month = models.DateField(help_text="First day of the month.")
+    total_shifts = models.PositiveIntegerField(default=0)
+    present_days = models.PositiveIntegerField(default=0)
+    half_days = models.PositiveIntegerField(default=0)
+    absents = models.PositiveIntegerField(default=0)
+    worked_minutes = models.PositiveIntegerField(default=0)
+    approved_ot_minutes = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["store", "user", "month"],
+                name="unique_rollup_store_user_month",
+            )
+        ]
+        indexes = [models.Index(fields=["user", "month"])]
+        ordering = ["-month"]
+
+    def __str__(self) -> str:  # pragma: no cover - simple representation
+        return f"{self.user} {self.month:%Y-%m} @ {self.store_id}"
+
+
 def resolve_planned_shift(user, target_date: date) -> Optional["Shift"]:
     """Determines the planned `Shift` for a user on a specific date.
 
@@ -1010,11 +1073,119 @@ def resolve_planned_shift(user, target_date: date) -> Optional["Shift"]:
     return schedule.resolve_shift_for(target_date)
 
 
+def resolve_planned_shifts(
+    users, start_date: date, end_date: Optional[date] = None
+) -> Dict[Tuple[int, date], Optional["Shift"]]:
+    """Resolves planned shifts for many users over a date range in bulk.
+
+    This is the set-based counterpart of `resolve_planned_shift`. Instead of
+    issuing up to three queries per user per day, it prefetches all relevant
+    `WeekOff`, `ScheduleException` and `AdvisorSchedule` rows (together with
+    their shifts) in exactly three queries and applies the same precedence
+    rules in memory.
+
+    Args:
+        users: An iterable of user instances or user primary keys.
+        start_date (date): The first day of the range (inclusive).
+        end_date (Optional[date]): The last day of the range (inclusive).
+            Defaults to `start_date` for a single-day lookup.
+
+    Returns:
+        Dict[Tuple[int, date], Optional["Shift"]]: A mapping of
+        `(user_id, date)` to the planned `Shift`, or `None` for a day off.
+        Every requested user/day pair is present in the result.
+
+    Example:
+        >>> from datetime import date
+        >>> plan = resolve_planned_shifts(advisors, date(2024, 1, 1), date(2024, 1, 31))
+        >>> plan[(advisor.id, date(2024, 1, 2))]
+        <Shift: Day (09:00:00–18:00:00)>
+    """
+
+    end_date = end_date or start_date
+    user_ids = {getattr(u, "pk", u) for u in users}
+    if not user_ids or end_date < start_date:
+        return {}
+
+    weekoffs = set(
+        WeekOff.objects.filter(user_id__in=user_ids, is_active=True).values_list(
+            "user_id", "weekday"
+        )
+    )
+    exceptions = {
+        (exc.user_id, exc.date): exc
+        for exc in ScheduleException.objects.filter(
+            user_id__in=user_ids, date__gte=start_date, date__lte=end_date
+        ).select_related("override_shift")
+    }
+    schedules = {
+        schedule.user_id: schedule
+        for schedule in AdvisorSchedule.objects.filter(
+            user_id__in=user_ids, is_active=True
+        ).select_related("default_shift", "week_even_shift", "week_odd_shift")
+    }
+
+    days = [
+        start_date + timedelta(days=offset)
+        for offset in range((end_date - start_date).days + 1)
+    ]
+    plan: Dict[Tuple[int, date], Optional[Shift]] = {}
+    for user_id in user_ids:
+        schedule = schedules.get(user_id)
+        for day in days:
+            key = (user_id, day)
+            if (user_id, day.weekday()) in weekoffs:
+                plan[key] = None
+                continue
+            exc = exceptions.get(key)
+            if exc and exc.mark_off:
+                plan[key] = None
+                continue
+            if exc and exc.override_shift:
+                plan[key] = exc.override_shift
+                continue
+            plan[key] = schedule.resolve_shift_for(day) if schedule else None
+    return plan
+
+
 # ---------------------------------------------------------------------------
 # Signals
 # ---------------------------------------------------------------------------
 
 
+#: Fields that decide which monthly rollup an attendance row counts towards.
+ROLLUP_KEY_FIELDS = {"store", "store_id", "user", "user_id", "date"}
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_rollup_key(sender, instance: Attendance, raw, update_fields, **kwargs):
+    """Signal handler recording the rollup key a record is about to leave.
+
+    When an existing record moves to another store, advisor or month, the
+    rollup it used to count towards must be refreshed too. The stored
+    `store_id`, `user_id` and `date` are read before the save and kept on the
+    instance for `finalize_attendance`.
+
+    Args:
+        sender: The model class that sent the signal (`Attendance`).
+        instance (Attendance): The instance about to be saved.
+        raw (bool): True when loading fixtures.
+        update_fields (set): A set of fields being updated, if specified in save().
+        **kwargs: Wildcard keyword arguments.
+    """
+
+    instance._previous_rollup_key = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not ROLLUP_KEY_FIELDS & set(update_fields):
+        return
+    instance._previous_rollup_key = (
+        Attendance.objects.filter(pk=instance.pk)
+        .values("store_id", "user_id", "date")
+        .first()
+    )
+
+
 @receiver(post_save, sender=Attendance)
 def finalize_attendance(sender, instance: Attendance, created, update_fields, **kwargs):
     """Signal handler to finalize attendance metrics upon check-out.
@@ -1028,6 +1199,11 @@ def finalize_attendance(sender, instance: Attendance, created, update_fields, **
     checks the `update_fields` argument. If the save operation that triggered
     the signal only contained fields that this signal itself computes, it exits early.
 
+    Finally the record's `AttendanceMonthlyRollup` row is refreshed so monthly
+    reports stay current without re-aggregating on read, together with the
+    row it counted towards before the save if its store, advisor or month
+    changed (see `remember_rollup_key`).
+
     Args:
         sender: The model class that sent the signal (`Attendance`).
         instance (Attendance): The actual instance being saved.
@@ -1039,6 +1215,30 @@ def finalize_attendance(sender, instance: Attendance, created, update_fields, **
     computed_fields = {"worked_minutes", "late_minutes", "early_out_minutes", "status"}
     if update_fields and set(update_fields).issubset(computed_fields):
         return
+    # Read before the save below runs `remember_rollup_key` again.
+    previous = getattr(instance, "_previous_rollup_key", None)
     if instance.check_out:
         instance.apply_grace_and_status()
-        instance.save(update_fields=list(computed_fields))
\ No newline at end of file
+        instance.save(update_fields=list(computed_fields))
+
+    from .rollups import refresh_monthly_rollups
+
+    touched = [instance]
+    if previous:
+        touched.append(SimpleNamespace(**previous))
+    refresh_monthly_rollups(touched)
+
+
+@receiver(post_delete, sender=Attendance)
+def drop_attendance_from_rollup(sender, instance: Attendance, **kwargs):
+    """Signal handler keeping monthly rollups in sync when a record is deleted.
+
+    Args:
+        sender: The model class that sent the signal (`Attendance`).
+        instance (Attendance): The instance that was deleted.
+        **kwargs: Wildcard keyword arguments.
+    """
+
+    from .rollups import refresh_monthly_rollups
+
+    refresh_monthly_rollups([instance])
@@ -0,0 +1,164 @@
+"""Maintenance helpers for :class:`~attendance.models.AttendanceMonthlyRollup`.
+
+Monthly reports read precomputed per-advisor totals instead of aggregating
+every attendance row on each request. The helpers in this module keep those
+totals current:
+
+- :func:`refresh_monthly_rollups` recomputes only the ``(store, user, month)``
+  keys touched by a set of attendance rows. It is called from the
+  ``finalize_attendance`` signal and from the set-based autoclose pipeline,
+  whose ``bulk_update``/``bulk_create`` writes bypass model signals.
+- :func:`rebuild_monthly_rollups` recomputes every rollup in a month range and
+  backs the ``rebuild_attendance_rollups`` management command.
+"""
+
+from __future__ import annotations
+
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Attendance, AttendanceMonthlyRollup
+
+#: Counter fields stored on :class:`AttendanceMonthlyRollup`.
+ROLLUP_FIELDS = [
+    "total_shifts",
+    "present_days",
+    "half_days",
+    "absents",
+    "worked_minutes",
+    "approved_ot_minutes",
+]
+
+
+def rollup_aggregates() -> Dict[str, object]:
+    """Return the aggregate expressions used to compute rollup counters."""
+
+    return {
+        "total_shifts": Count("id"),
+        "present_days": Count("id", filter=Q(status="PRESENT")),
+        "half_days": Count("id", filter=Q(status="HALF_DAY")),
+        "absents": Count("id", filter=Q(status="ABSENT")),
+        "worked_minutes": Sum("worked_minutes"),
+        "approved_ot_minutes": Sum("ot_minutes"),
+    }
+
+
+def month_start(day: date) -> date:
+    """Return the first day of ``day``'s month."""
+
+    return day.replace(day=1)
+
+
+def month_end(day: date) -> date:
+    """Return the last day of ``day``'s month."""
+
+    return day.replace(day=monthrange(day.year, day.month)[1])
+
+
+def _rollup_from_row(row: dict, month: date) -> AttendanceMonthlyRollup:
+    return AttendanceMonthlyRollup(
+        store_id=row["store_id"],
+        user_id=row["user_id"],
+        month=month,
+        **{field: row.get(field) or 0 for field in ROLLUP_FIELDS},
+    )
+
+
+def _upsert(rollups: list[AttendanceMonthlyRollup]) -> None:
+    AttendanceMonthlyRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=["store", "user", "month"],
+        update_fields=ROLLUP_FIELDS + ["updated_at"],
+    )
+
+
+def refresh_monthly_rollups(attendances: Iterable) -> int:
+    """Recompute the rollups touched by ``attendances``.
+
+    Each item only needs ``store_id``, ``user_id`` and ``date`` attributes, so
+    unsaved or deleted :class:`Attendance` instances work as well. Keys are
+    grouped by month and every month costs one aggregate query plus one upsert,
+    independent of how many advisors are involved. Keys whose attendance rows
+    have all been removed are deleted.
+
+    Args:
+        attendances: Attendance rows (or row-like objects) that changed.
+
+    Returns:
+        int: Number of rollup rows written.
+    """
+
+    keys: Dict[date, Set[Tuple[int, int]]] = defaultdict(set)
+    for att in attendances:
+        if att.store_id and att.user_id and att.date:
+            keys[month_start(att.date)].add((att.store_id, att.user_id))
+
+    written = 0
+    for month, pairs in keys.items():
+        user_ids = {user_id for _, user_id in pairs}
+        rows = (
+            Attendance.objects.filter(
+                user_id__in=user_ids, date__gte=month, date__lte=month_end(month)
+            )
+            .values("store_id", "user_id")
+            .annotate(**rollup_aggregates())
+            .order_by()
+        )
+        rollups = [
+            _rollup_from_row(row, month)
+            for row in rows
+            if (row["store_id"], row["user_id"]) in pairs
+        ]
+        with transaction.atomic():
+            _upsert(rollups)
+            missing = pairs - {(r.store_id, r.user_id) for r in rollups}
+            if missing:
+                stale = Q()
+                for store_id, user_id in missing:
+                    stale |= Q(store_id=store_id, user_id=user_id)
+                AttendanceMonthlyRollup.objects.filter(stale, month=month).delete()
+        written += len(rollups)
+    return written
+
+
+def rebuild_monthly_rollups(
+    first_month: date, last_month: date, store_id: Optional[int] = None
+) -> int:
+    """Rebuild every rollup between two months from the attendance table.
+
+    Existing rollups in the range are replaced inside a single transaction.
+
+    Args:
+        first_month (date): Any day in the first month to rebuild.
+        last_month (date): Any day in the last month to rebuild (inclusive).
+        store_id (Optional[int]): Restrict the rebuild to a single store.
+
+    Returns:
+        int: Number of rollup rows written.
+    """
+
+    start, end = month_start(first_month), month_end(last_month)
+    attendances = Attendance.objects.filter(date__gte=start, date__lte=end)
+    existing = AttendanceMonthlyRollup.objects.filter(month__gte=start, month__lte=end)
+    if store_id is not None:
+        attendances = attendances.filter(store_id=store_id)
+        existing = existing.filter(store_id=store_id)
+
+    rows = (
+        attendances.annotate(rollup_month=TruncMonth("date"))
+        .values("store_id", "user_id", "rollup_month")
+        .annotate(**rollup_aggregates())
+        .order_by()
+    )
+    rollups = [_rollup_from_row(row, row["rollup_month"]) for row in rows]
+    with transaction.atomic():
+        existing.delete()
+        AttendanceMonthlyRollup.objects.bulk_create(rollups, batch_size=500)
+    return len(rollups)
@@ -4,17 +4,36 @@ This module implements helpers used by the management command introduced in
 this phase.  The functions are written so they can also be triggered from a
 Celery beat task in production but are synchronous and side-effect free enough
 to be called directly from tests or other code.
+
+All helpers are set-based: a whole day (or a backfill range of days) is read
+in a constant number of queries, computed in memory and written back with
+``bulk_update``/``bulk_create`` so the nightly run does not hold row locks for
+longer than the final write.
 """
 
 from __future__ import annotations
 
-from datetime import date, datetime, time
-from typing import Dict, Tuple
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
 
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
-from .models import Attendance, resolve_planned_shift
+from .models import Attendance, resolve_planned_shifts
+from .rollups import refresh_monthly_rollups
+
+#: Rows written per ``bulk_update``/``bulk_create`` statement.
+BATCH_SIZE = 500
+
+#: Fields recomputed when an open attendance is finalized.
+FINALIZE_FIELDS = [
+    "check_out",
+    "worked_minutes",
+    "late_minutes",
+    "early_out_minutes",
+    "status",
+    "updated_at",
+]
 
 
 # ---------------------------------------------------------------------------
@@ -39,27 +58,42 @@ def _shift_bounds(att: Attendance) -> Tuple[datetime, datetime]:
     return att._shift_bounds_for_date()
 
 
+def _end_of_day(day: date) -> datetime:
+    """Return ``23:59:59`` local time on ``day`` as an aware datetime."""
+
+    return timezone.make_aware(datetime.combine(day, time(23, 59, 59)), _local_tz())
+
+
+def _days(start: date, end: date):
+    """Yield every calendar day from ``start`` to ``end`` inclusive."""
+
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
 # ---------------------------------------------------------------------------
 # Core functions
 # ---------------------------------------------------------------------------
 
 
-def mark_absent_for_date(target_date: date) -> int:
-    """Create :class:`Attendance` rows marked ABSENT for a given day.
+def mark_absent_for_range(start_date: date, end_date: date) -> int:
+    """Create :class:`Attendance` rows marked ABSENT for a range of days.
 
-    For each advisor who has a planned shift on ``target_date`` (as determined
-    by :func:`resolve_planned_shift`) and **no** existing attendance record for
-    that ``(user, date, shift)`` combination, create a new record with
-    ``status='ABSENT'``.  Advisors without an assigned store are skipped as the
-    :class:`Attendance` model requires ``store``.
+    Planned shifts for every active advisor are resolved in bulk with
+    :func:`resolve_planned_shifts`, existing ``(user, date, shift)`` rows are
+    loaded in a single query and the missing ones are inserted with one
+    ``bulk_create(ignore_conflicts=True)``.  Advisors without an assigned store
+    are skipped as the :class:`Attendance` model requires ``store``.  Monthly
+    rollups for the new rows are refreshed afterwards since bulk inserts do not
+    fire model signals.
 
-    The function is idempotent: running it multiple times for the same date will
-    not create duplicate rows thanks to the model's unique constraint.
+    The function is idempotent: running it multiple times for the same range
+    will not create duplicate rows thanks to the model's unique constraint.
 
     Parameters
     ----------
-    target_date:
-        The calendar day for which absences should be created.
+    start_date, end_date:
+        Inclusive range of calendar days for which absences should be created.
 
     Returns
     -------
@@ -68,50 +102,94 @@ def mark_absent_for_date(target_date: date) -> int:
     """
 
     User = get_user_model()
-    created = 0
-    advisors = User.objects.filter(role="advisor", is_active=True, deleted=False)
+    advisors = list(
+        User.objects.filter(
+            role="advisor", is_active=True, deleted=False, store__isnull=False
+        ).only("id", "store_id")
+    )
+    if not advisors:
+        return 0
+
+    plan = resolve_planned_shifts(advisors, start_date, end_date)
+    in_range = Attendance.objects.filter(
+        user__in=advisors, date__gte=start_date, date__lte=end_date
+    )
+    existing = set(in_range.values_list("user_id", "date", "shift_id"))
+
+    absents = []
+    for user in advisors:
+        for day in _days(start_date, end_date):
+            shift = plan.get((user.pk, day))
+            if not shift:
+                # Off-day – nothing to create
+                continue
+            if (user.pk, day, shift.pk) in existing:
+                continue
+            absents.append(
+                Attendance(
+                    user_id=user.pk,
+                    store_id=user.store_id,
+                    date=day,
+                    shift=shift,
+                    status="ABSENT",
+                )
+            )
+
+    if not absents:
+        return 0
+    # Rows inserted concurrently since ``existing`` was read are skipped as
+    # conflicts, so report how much the range grew rather than what was sent.
+    before = in_range.count()
+    Attendance.objects.bulk_create(
+        absents, batch_size=BATCH_SIZE, ignore_conflicts=True
+    )
+    refresh_monthly_rollups(absents)
+    return in_range.count() - before
+
+
+def mark_absent_for_date(target_date: date) -> int:
+    """Create :class:`Attendance` rows marked ABSENT for a given day.
 
-    for user in advisors.iterator():
-        shift = resolve_planned_shift(user, target_date)
-        if not shift:
-            # Off-day – nothing to create
-            continue
+    Thin wrapper around :func:`mark_absent_for_range` for a single day.
 
-        if not user.store:
-            # Attendance requires a store; policy is to skip such users
-            # (could log here if logging is configured).
-            continue
+    Parameters
+    ----------
+    target_date:
+        The calendar day for which absences should be created.
 
-        _, was_created = Attendance.objects.get_or_create(
-            user=user,
-            date=target_date,
-            shift=shift,
-            defaults={"store": user.store, "status": "ABSENT"},
-        )
-        if was_created:
-            created += 1
+    Returns
+    -------
+    int
+        Number of ``Attendance`` rows created.
+    """
 
-    return created
+    return mark_absent_for_range(target_date, target_date)
 
 
-def finalize_open_for_date(target_date: date) -> int:
-    """Finalize all open attendances for ``target_date``.
+def finalize_open_for_range(start_date: date, end_date: date) -> int:
+    """Finalize all open attendances dated within a range of days.
 
     Any ``Attendance`` rows with ``status`` of ``OPEN`` or ``PENDING_APPROVAL``
     that have a ``check_in`` but missing ``check_out`` will be closed.  The
     synthetic ``check_out`` is set to the earlier of the shift's scheduled end
-    or ``23:59:59`` local time on ``target_date``.  Derived minutes and
-    ``status`` are recomputed using :meth:`Attendance.apply_grace_and_status`
-    with the default rules (15 minute grace, 6 hour half-day threshold and
-    5‑minute rounding).
+    or ``23:59:59`` local time on the attendance date.  Derived minutes and
+    ``status`` are recomputed in memory using
+    :meth:`Attendance.apply_grace_and_status` with the default rules (15 minute
+    grace, 6 hour half-day threshold and 5‑minute rounding) and written back
+    with a single batched ``bulk_update``.
+
+    The update is guarded by ``check_out IS NULL`` so a real check-out that
+    lands while the day is being computed is never overwritten.  Monthly
+    rollups for the affected advisors are refreshed afterwards.
 
     Records that started with ``PENDING_APPROVAL`` status retain that status
     after computation; approvals are handled manually in a later phase.
 
     Parameters
     ----------
-    target_date:
-        The calendar day whose open attendances should be finalized.
+    start_date, end_date:
+        Inclusive range of calendar days whose open attendances should be
+        finalized.
 
     Returns
     -------
@@ -119,50 +197,89 @@ def finalize_open_for_date(target_date: date) -> int:
         Number of records updated.
     """
 
-    tz = _local_tz()
-    end_of_day = timezone.make_aware(
-        datetime.combine(target_date, time(23, 59, 59)), tz
-    )
-
     qs = Attendance.objects.select_related("shift").filter(
-        date=target_date,
+        date__gte=start_date,
+        date__lte=end_date,
         status__in={"OPEN", "PENDING_APPROVAL"},
         check_out__isnull=True,
+        check_in__isnull=False,
     )
 
-    updated = 0
-    for att in qs.iterator():
-        if not att.check_in:
-            # No punches at all – leave for mark_absent_for_date()
-            continue
-
+    now = timezone.now()
+    end_of_day: Dict[date, datetime] = {}
+    finalized = []
+    for att in qs.iterator(chunk_size=BATCH_SIZE):
+        if att.date not in end_of_day:
+            end_of_day[att.date] = _end_of_day(att.date)
         _, shift_end = _shift_bounds(att)
-        synthetic_out = min(shift_end, end_of_day)
 
         original_status = att.status
-        att.check_out = synthetic_out
+        att.check_out = min(shift_end, end_of_day[att.date])
         att.apply_grace_and_status(grace_minutes=15, halfday_threshold=360)
         if original_status == "PENDING_APPROVAL":
             att.status = "PENDING_APPROVAL"
+        att.updated_at = now
+        finalized.append(att)
 
-        Attendance.objects.filter(pk=att.pk).update(
-            check_out=att.check_out,
-            worked_minutes=att.worked_minutes,
-            late_minutes=att.late_minutes,
-            early_out_minutes=att.early_out_minutes,
-            status=att.status,
-        )
-        updated += 1
-
+    if not finalized:
+        return 0
+    updated = Attendance.objects.filter(check_out__isnull=True).bulk_update(
+        finalized, FINALIZE_FIELDS, batch_size=BATCH_SIZE
+    )
+    refresh_monthly_rollups(finalized)
     return updated
 
 
-def autoclose_for_date(target_date: date) -> Dict[str, int]:
-    """Finalize open attendances and mark absences for ``target_date``.
+def finalize_open_for_date(target_date: date) -> int:
+    """Finalize all open attendances for ``target_date``.
+
+    Thin wrapper around :func:`finalize_open_for_range` for a single day.
+
+    Parameters
+    ----------
+    target_date:
+        The calendar day whose open attendances should be finalized.
+
+    Returns
+    -------
+    int
+        Number of records updated.
+    """
+
+    return finalize_open_for_range(target_date, target_date)
 
-    The functions are executed in a safe order – first finalizing existing open
+
+def autoclose_for_range(
+    start_date: date, end_date: Optional[date] = None
+) -> Dict[str, int]:
+    """Finalize open attendances and mark absences for a range of days.
+
+    The steps are executed in a safe order – first finalizing existing open
     records and then creating explicit ``ABSENT`` records for advisors who had a
-    planned shift but never checked in.
+    planned shift but never checked in.  A backfill of several weeks runs as a
+    single pass with the same number of queries as one day.
+
+    Parameters
+    ----------
+    start_date:
+        First day to process.
+    end_date:
+        Last day to process (inclusive). Defaults to ``start_date``.
+
+    Returns
+    -------
+    dict
+        ``{"finalized": X, "absents_created": Y}``
+    """
+
+    end_date = end_date or start_date
+    finalized = finalize_open_for_range(start_date, end_date)
+    absents = mark_absent_for_range(start_date, end_date)
+    return {"finalized": finalized, "absents_created": absents}
+
+
+def autoclose_for_date(target_date: date) -> Dict[str, int]:
+    """Finalize open attendances and mark absences for ``target_date``.
 
     Parameters
     ----------
@@ -175,6 +292,4 @@ def autoclose_for_date(target_date: date) -> Dict[str, int]:
         ``{"finalized": X, "absents_created": Y}``
     """
 
-    finalized = finalize_open_for_date(target_date)
-    absents = mark_absent_for_date(target_date)
-    return {"finalized": finalized, "absents_created": absents}
+    return autoclose_for_range(target_date, target_date)
@@ -36,11 +36,16 @@ from rest_framework.settings import api_settings
 
 from django.shortcuts import get_object_or_404
 from django.core.paginator import Paginator
-from django.http import HttpResponse
 from django.db.models import Sum, Count, Case, When, IntegerField, F, Value, Q
 from calendar import monthrange
 
-from .models import Attendance, AttendanceRequest, Shift, resolve_planned_shift
+from .models import (
+    Attendance,
+    AttendanceMonthlyRollup,
+    AttendanceRequest,
+    Shift,
+    resolve_planned_shift,
+)
 from .permissions import (
     IsAdvisor,
     IsAuthenticatedRole,
@@ -56,6 +61,7 @@ from .serializers import (
 from .filters import filter_approval_qs
 from .utils import within_radius_m
 from store.models import StoreGeofence
+from utils.export import queryset_rows, stream_csv
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -219,34 +225,6 @@ def parse_month_param(request):
     return first_day, last_day
 
 
-def csv_response(filename: str, rows: list[list[str]]):
-    """Constructs an `HttpResponse` object for a CSV file download.
-
-    This helper takes a list of lists (representing rows) and generates a
-    CSV file in memory. It then creates an `HttpResponse` with the correct
-    `Content-Type` and `Content-Disposition` headers to trigger a file
-    download in the browser.
-
-    Args:
-        filename (str): The desired filename for the downloaded CSV file.
-        rows (list[list[str]]): A list where each inner list represents a row
-            in the CSV. The first inner list is typically the header row.
-
-    Returns:
-        HttpResponse: A response object containing the CSV data.
-    """
-    from io import StringIO
-    import csv
-
-    buffer = StringIO()
-    writer = csv.writer(buffer)
-    for row in rows:
-        writer.writerow(row)
-    resp = HttpResponse(buffer.getvalue(), content_type="text/csv")
-    resp["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return resp
-
-
 def store_scope_or_403(request_user, store_id: int):
     """Enforces store-level access control for managers.
 
@@ -630,6 +608,7 @@ def manager_scoped_queryset(user):
         "attendance",
         "attendance__user",
         "attendance__store",
+        "attendance__shift",
         "requested_by",
         "decided_by",
     )
@@ -660,8 +639,12 @@ class ApprovalsListView(APIView):
         - Must be an authenticated user.
         - Access is implicitly handled by `manager_scoped_queryset`, which
           returns an empty list for unauthorized roles.
+
+    Pass `cursor` (empty for the first page) for keyset pagination on
+    `(-created_at, -id)`; see `utils.pagination.SpringStylePagination`.
     """
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
 
     def get(self, request, *args, **kwargs):  # noqa: D401
         """Handles the GET request to list and filter approval requests.
@@ -686,7 +669,7 @@ class ApprovalsListView(APIView):
             ser = AttendanceRequestListSerializer(page, many=True)
             return Response(
                 {
-                    "count": paginator.page.paginator.count,
+                    "count": paginator.count,
                     "next": paginator.get_next_link(),
                     "previous": paginator.get_previous_link(),
                     "results": ser.data,
@@ -798,10 +781,11 @@ class ApprovalsRejectView(APIView):
 class StoreMonthlyReportView(APIView):
     """Generates a monthly attendance and payroll report for a single store.
 
-    This view aggregates attendance data for all advisors within a specified
-    store for a given month. It calculates totals for shifts, present/absent
-    days, worked minutes, and overtime. It also computes an estimated gross
-    pay for each advisor based on their hourly rate.
+    This view reports attendance data for all advisors within a specified
+    store for a given month. Totals for shifts, present/absent days, worked
+    minutes, and overtime are read from the precomputed
+    `AttendanceMonthlyRollup` table (one row per advisor). It also computes an
+    estimated gross pay for each advisor based on their hourly rate.
 
     The report can be retrieved as a JSON object or downloaded as a CSV file
     by appending `?format=csv` to the URL.
@@ -829,7 +813,7 @@ class StoreMonthlyReportView(APIView):
 
         Returns:
             Response: A DRF Response object (200 OK) with the report data in
-            JSON format, or an HttpResponse with CSV data if requested.
+            JSON format, or a streaming CSV download if requested.
             Returns a 403 Forbidden if the user is not allowed to access the
             store, or a 400 Bad Request for an invalid month format.
         """
@@ -839,23 +823,21 @@ class StoreMonthlyReportView(APIView):
         except ValueError as exc:  # pragma: no cover - defensive
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        qs = Attendance.objects.filter(
-            store_id=store_id, date__gte=month_start, date__lte=month_end
-        ).select_related("user", "user__payroll_profile", "shift")
-
         qs = (
-            qs.values(
-                "user_id", "user__first_name", "user__last_name", "user__username"
-            )
-            .annotate(
-                total_shifts=Count("id"),
-                present_days=Count("id", filter=Q(status="PRESENT")),
-                half_days=Count("id", filter=Q(status="HALF_DAY")),
-                absents=Count("id", filter=Q(status="ABSENT")),
-                worked_minutes=Sum("worked_minutes"),
-                approved_ot_minutes=Sum("ot_minutes"),
-                hourly_rate=F("user__payroll_profile__hourly_rate"),
+            AttendanceMonthlyRollup.objects.filter(store_id=store_id, month=month_start)
+            .values(
+                "user_id",
+                "user__first_name",
+                "user__last_name",
+                "user__username",
+                "total_shifts",
+                "present_days",
+                "half_days",
+                "absents",
+                "worked_minutes",
+                "approved_ot_minutes",
             )
+            .annotate(hourly_rate=F("user__payroll_profile__hourly_rate"))
             .order_by("user__first_name", "user__last_name", "user__username")
         )
 
@@ -908,41 +890,39 @@ class StoreMonthlyReportView(APIView):
         }
 
         if request.query_params.get("format") == "csv":
-            rows = [
+            header = [
+                "User ID",
+                "Name",
+                "Username",
+                "Total Shifts",
+                "Present",
+                "Half-Day",
+                "Absent",
+                "Worked Minutes",
+                "OT Minutes",
+                "Payable Hours",
+                "Hourly Rate",
+                "Gross Pay",
+            ]
+            rows = (
                 [
-                    "User ID",
-                    "Name",
-                    "Username",
-                    "Total Shifts",
-                    "Present",
-                    "Half-Day",
-                    "Absent",
-                    "Worked Minutes",
-                    "OT Minutes",
-                    "Payable Hours",
-                    "Hourly Rate",
-                    "Gross Pay",
+                    a["user_id"],
+                    a["name"],
+                    a["username"],
+                    a["total_shifts"],
+                    a["present_days"],
+                    a["half_days"],
+                    a["absents"],
+                    a["worked_minutes"],
+                    a["approved_ot_minutes"],
+                    a["payable_hours"],
+                    a["hourly_rate"],
+                    a["gross_pay"],
                 ]
-            ]
-            for a in advisors:
-                rows.append(
-                    [
-                        a["user_id"],
-                        a["name"],
-                        a["username"],
-                        a["total_shifts"],
-                        a["present_days"],
-                        a["half_days"],
-                        a["absents"],
-                        a["worked_minutes"],
-                        a["approved_ot_minutes"],
-                        a["payable_hours"],
-                        a["hourly_rate"],
-                        a["gross_pay"],
-                    ]
-                )
+                for a in advisors
+            )
             filename = f"store_{store_id}_{month_start.strftime('%Y%m')}.csv"
-            return csv_response(filename, rows)
+            return stream_csv(filename, header, rows)
 
         return Response(data)
 
@@ -952,7 +932,8 @@ class MeMonthlyReportView(APIView):
 
     This view provides a detailed monthly summary for the authenticated advisor.
     It includes an overall summary of shifts, attendance statuses, worked hours,
-    and estimated pay, as well as a day-by-day breakdown of their attendance.
+    and estimated pay (read from `AttendanceMonthlyRollup`), as well as a
+    day-by-day breakdown of their attendance.
 
     The report can be retrieved as a JSON object or downloaded as a CSV file
     by appending `?format=csv` to the URL.
@@ -978,7 +959,7 @@ class MeMonthlyReportView(APIView):
 
         Returns:
             Response: A DRF Response object (200 OK) with the report data in
-            JSON format, or an HttpResponse with CSV data if requested.
+            JSON format, or a streaming CSV download if requested.
             Returns a 400 Bad Request for an invalid month format.
         """
         user = request.user
@@ -987,21 +968,17 @@ class MeMonthlyReportView(APIView):
         except ValueError as exc:  # pragma: no cover - defensive
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        qs = (
-            Attendance.objects.filter(
-                user=user, date__gte=month_start, date__lte=month_end
-            )
-            .select_related("shift")
-            .order_by("date")
-        )
-
-        agg = qs.aggregate(
-            total_shifts=Count("id"),
-            present_days=Count("id", filter=Q(status="PRESENT")),
-            half_days=Count("id", filter=Q(status="HALF_DAY")),
-            absents=Count("id", filter=Q(status="ABSENT")),
+        # An advisor normally has a single rollup row per month; summing keeps
+        # the totals correct for a month in which they moved between stores.
+        agg = AttendanceMonthlyRollup.objects.filter(
+            user=user, month=month_start
+        ).aggregate(
+            total_shifts=Sum("total_shifts"),
+            present_days=Sum("present_days"),
+            half_days=Sum("half_days"),
+            absents=Sum("absents"),
             worked_minutes=Sum("worked_minutes"),
-            approved_ot_minutes=Sum("ot_minutes"),
+            approved_ot_minutes=Sum("approved_ot_minutes"),
         )
 
         worked = agg.get("worked_minutes") or 0
@@ -1022,18 +999,35 @@ class MeMonthlyReportView(APIView):
             "gross_pay": gross_pay,
         }
 
-        by_day = []
-        for att in qs:
-            by_day.append(
-                {
-                    "date": att.date.isoformat(),
-                    "shift": getattr(att.shift, "name", None),
-                    "status": att.status,
-                    "worked_minutes": att.worked_minutes,
-                    "ot_minutes": att.ot_minutes,
-                }
+        days = Attendance.objects.filter(
+            user=user, date__gte=month_start, date__lte=month_end
+        ).order_by("date")
+        day_fields = ["date", "shift__name", "status", "worked_minutes", "ot_minutes"]
+
+        if request.query_params.get("format") == "csv":
+            filename = f"me_{month_start.strftime('%Y%m')}.csv"
+            return stream_csv(
+                filename,
+                ["Date", "Shift", "Status", "Worked Minutes", "OT Minutes"],
+                (
+                    [day.isoformat(), *rest]
+                    for day, *rest in queryset_rows(days, day_fields)
+                ),
             )
 
+        by_day = [
+            {
+                "date": day.isoformat(),
+                "shift": shift_name,
+                "status": att_status,
+                "worked_minutes": worked_minutes,
+                "ot_minutes": ot_minutes,
+            }
+            for day, shift_name, att_status, worked_minutes, ot_minutes in queryset_rows(
+                days, day_fields
+            )
+        ]
+
         month_str = month_start.strftime("%Y-%m")
         data = {
             "user_id": user.id,
@@ -1044,21 +1038,6 @@ class MeMonthlyReportView(APIView):
             "by_day": by_day,
         }
 
-        if request.query_params.get("format") == "csv":
-            rows = [["Date", "Shift", "Status", "Worked Minutes", "OT Minutes"]]
-            for d in by_day:
-                rows.append(
-                    [
-                        d["date"],
-                        d["shift"],
-                        d["status"],
-                        d["worked_minutes"],
-                        d["ot_minutes"],
-                    ]
-                )
-            filename = f"me_{month_start.strftime('%Y%m')}.csv"
-            return csv_response(filename, rows)
-
         return Response(data)
 
 
@@ -1071,4 +1050,4 @@ __all__ = [
     "ApprovalsRejectView",
     "StoreMonthlyReportView",
     "MeMonthlyReportView",
-]
\ No newline at end of file
+]
@@ -13,6 +13,7 @@ from .models import (
     WeekOff,
     ScheduleException,
     AdvisorPayrollProfile,
+    resolve_planned_shifts,
 )
 from store.models import StoreGeofence
 from .serializers import (
@@ -150,10 +151,11 @@ class AdvisorSchedulePreviewView(AdminBaseView):
             return Response({"detail": "start and end required"}, status=400)
         start = date.fromisoformat(start_s)
         end = date.fromisoformat(end_s)
+        plan = resolve_planned_shifts([schedule.user_id], start, end)
         result = {}
         day = start
         while day <= end:
-            shift = schedule.resolve_shift_for(day)
+            shift = plan.get((schedule.user_id, day))
             result[day.isoformat()] = (
                 ShiftAdminSerializer(shift).data if shift else None
             )
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Booking
+from .models import Booking, NotificationOutbox
 
 
 @admin.register(Booking)
@@ -7,3 +7,18 @@ class BookingAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "date", "time", "status")
     search_fields = ("name", "email")
     list_filter = ("status",)
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "booking",
+        "channel",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "created_at",
+    )
+    list_filter = ("channel", "status")
+    readonly_fields = ("created_at", "sent_at")
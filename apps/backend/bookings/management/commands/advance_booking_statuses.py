@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.transitions import advance_due_bookings
+
+
+class Command(BaseCommand):
+    """Persist due booking status transitions.
+
+    Approved bookings whose slot has started become ``in_progress`` and
+    in-progress bookings from earlier days become ``completed``. API reads
+    already show the derived status, so this only needs to run often enough
+    for reports and filters on the stored column::
+
+        # Every 5 minutes
+        */5 * * * * /path/to/venv/bin/python manage.py advance_booking_statuses
+    """
+
+    help = "Move approved/in-progress bookings to their time-based next status"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running instead of exiting after one pass",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300.0,
+            help="Seconds to sleep between passes when --loop is set",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            counts = advance_due_bookings()
+            self.stdout.write(
+                "advance_booking_statuses: "
+                + " ".join(f"{status}={count}" for status, count in counts.items())
+            )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from bookings.notifications import dispatch_pending_notifications
+
+
+class Command(BaseCommand):
+    """Deliver queued booking notifications from the outbox.
+
+    Run once from cron or keep a worker draining the outbox::
+
+        # Every minute
+        * * * * * /path/to/venv/bin/python manage.py send_booking_notifications
+        # Long-running worker polling every 5 seconds
+        python manage.py send_booking_notifications --loop --interval=5
+    """
+
+    help = "Send pending booking notifications (email and SMS) from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=100,
+            help="Maximum outbox rows sent per batch",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep between polls when --loop is set",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        sent = failed = 0
+        while True:
+            counts = dispatch_pending_notifications(limit=batch_size)
+            sent += counts["sent"]
+            failed += counts["failed"]
+            if counts["sent"] and sum(counts.values()) == batch_size:
+                # A full batch that got through: more rows are probably
+                # waiting. Failed rows back off, so a failing batch waits.
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+        self.stdout.write(f"send_booking_notifications: sent={sent} failed={failed}")
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_notificationoutbox"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="notificationoutbox",
+            name="bookings_no_status_387e69_idx",
+        ),
+        migrations.AddField(
+            model_name="notificationoutbox",
+            name="next_attempt_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterField(
+            model_name="notificationoutbox",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=7,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationoutbox",
+            index=models.Index(
+                fields=["status", "next_attempt_at"],
+                name="bookings_no_status_5581d2_idx",
+            ),
+        ),
+    ]
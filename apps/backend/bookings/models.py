@@ -60,15 +60,20 @@ class Booking(models.Model):
             "rejected": [],
         }.get(self.status, [])
 
-    def update_status_if_needed(self):
-        now = timezone.localtime()
+    def effective_status(self, now=None):
+        """Return the status with any due time-based transition applied.
+
+        Approved bookings start once their slot begins and in-progress ones
+        complete the next day. Nothing is saved: the
+        ``advance_booking_statuses`` command persists due transitions in bulk.
+        """
+        now = timezone.localtime(now)
         booking_dt = datetime.combine(self.date, self.time, tzinfo=now.tzinfo)
         if self.status == "approved" and now >= booking_dt:
-            self.status = "in_progress"
-            self.save(update_fields=["status"])
-        elif self.status == "in_progress" and now.date() > self.date:
-            self.status = "completed"
-            self.save(update_fields=["status"])
+            return "in_progress"
+        if self.status == "in_progress" and now.date() > self.date:
+            return "completed"
+        return self.status
 
 
 class Issue(models.Model):
@@ -121,3 +126,45 @@ class CustomerResponse(models.Model):
 
     def __str__(self):
         return self.question
+
+
+class NotificationOutbox(models.Model):
+    """A rendered booking notification waiting to be delivered.
+
+    Booking requests only enqueue rows here; the ``send_booking_notifications``
+    management command drains the outbox. Each row holds one rendered message
+    and every recipient for a single channel.
+
+    ``next_attempt_at`` is when the row may next be picked up: the backoff
+    after a failed attempt, or the end of the lease while a worker holds it
+    in ``sending``.
+    """
+
+    CHANNEL_CHOICES = [("email", "Email"), ("sms", "SMS")]
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    booking = models.ForeignKey(
+        Booking, on_delete=models.CASCADE, related_name="notifications"
+    )
+    channel = models.CharField(max_length=5, choices=CHANNEL_CHOICES)
+    subject = models.CharField(max_length=255, blank=True)
+    body = models.TextField()
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=7, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+
+    def __str__(self):
+        return f"{self.channel} for booking {self.booking_id} ({self.status})"
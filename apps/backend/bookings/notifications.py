@@ -1,17 +1,37 @@
+from datetime import timedelta
+
 from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
 from accounts.models import CustomUser
 from utils.notification_service import NotificationService
 
+from .models import NotificationOutbox
 
-def send_booking_notifications(booking):
-    channels = getattr(settings, "BOOKING_NOTIFICATION_CHANNELS", [])
-    context = {"booking": booking}
+SUBJECT = "Booking Update"
+EMAIL_TEMPLATE = "emails/booking_notification.html"
+SMS_TEMPLATE = "sms/booking_notification.txt"
+MAX_ATTEMPTS = 5
+# Seconds before the first retry of a failed row; doubles with each attempt.
+RETRY_BACKOFF = 60
+MAX_RETRY_BACKOFF = 3600
+# Seconds a worker holds claimed rows before another worker may take them.
+CLAIM_LEASE = 900
 
+
+def _recipients(booking):
     staff_qs = CustomUser.objects.filter(
         role__in=["advisor", "branch_head", "system_admin"]
     )
-    emails = list(staff_qs.values_list("email", flat=True))
-    phones = list(staff_qs.exclude(phone="").values_list("phone", flat=True))
+    emails = list(staff_qs.exclude(email="").values_list("email", flat=True))
+    phones = list(
+        staff_qs.exclude(phone__isnull=True)
+        .exclude(phone="")
+        .values_list("phone", flat=True)
+    )
 
     user = booking.user
     if user:
@@ -19,20 +39,136 @@ def send_booking_notifications(booking):
             emails.append(user.email)
         if user.phone:
             phones.append(user.phone)
+    # Preserve order while dropping duplicates.
+    return list(dict.fromkeys(emails)), list(dict.fromkeys(phones))
+
 
-    subject = "Booking Update"
-    if "email" in channels:
-        for email in emails:
-            NotificationService.send_email(
-                email,
-                subject,
-                "emails/booking_notification.html",
-                context,
+def queue_booking_notifications(booking):
+    """Render the booking notification once per channel and enqueue it.
+
+    Delivery happens out of band in the ``send_booking_notifications``
+    management command, so the calling request returns immediately.
+    """
+
+    channels = getattr(settings, "BOOKING_NOTIFICATION_CHANNELS", [])
+    context = {"booking": booking}
+    emails, phones = _recipients(booking)
+
+    rows = []
+    if "email" in channels and emails:
+        rows.append(
+            NotificationOutbox(
+                booking=booking,
+                channel="email",
+                subject=SUBJECT,
+                body=render_to_string(EMAIL_TEMPLATE, context),
+                recipients=emails,
             )
-    if "sms" in channels:
-        for phone in phones:
-            NotificationService.send_sms(
-                phone,
-                "sms/booking_notification.txt",
-                context,
+        )
+    if "sms" in channels and phones and getattr(settings, "SMS_GATEWAY_URL", None):
+        rows.append(
+            NotificationOutbox(
+                booking=booking,
+                channel="sms",
+                body=render_to_string(SMS_TEMPLATE, context).strip(),
+                recipients=phones,
             )
+        )
+    return NotificationOutbox.objects.bulk_create(rows)
+
+
+def _record_failure(row, error, now):
+    row.last_error = error
+    if row.attempts >= MAX_ATTEMPTS:
+        row.status = "failed"
+        return
+    row.status = "pending"
+    delay = min(RETRY_BACKOFF * 2 ** (row.attempts - 1), MAX_RETRY_BACKOFF)
+    row.next_attempt_at = now + timedelta(seconds=delay)
+
+
+def _claim(limit):
+    """Lease up to ``limit`` due rows to this worker in a short transaction.
+
+    Rows are locked with ``SELECT ... FOR UPDATE SKIP LOCKED`` where the
+    database supports it, so several workers can drain the outbox at once,
+    and moved to ``sending`` until ``CLAIM_LEASE`` runs out. A row whose
+    worker died mid-send becomes due again once its lease expires.
+    """
+
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            NotificationOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status__in=("pending", "sending"), next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:limit]
+        )
+        for row in rows:
+            row.status = "sending"
+            row.attempts += 1
+            row.next_attempt_at = now + timedelta(seconds=CLAIM_LEASE)
+        NotificationOutbox.objects.bulk_update(
+            rows, ["status", "attempts", "next_attempt_at"]
+        )
+    return rows
+
+
+def dispatch_pending_notifications(limit=100):
+    """Deliver up to ``limit`` due outbox rows.
+
+    Rows are claimed in one short transaction, delivered with no transaction
+    or row lock held, and their outcome is saved afterwards. Emails for the
+    whole batch share one SMTP connection and SMS go through the pooled
+    gateway session. A failed row is retried after an exponential backoff
+    (``RETRY_BACKOFF`` doubling per attempt) until ``MAX_ATTEMPTS`` is
+    reached. Only the recipients that failed are retried, so nobody gets the
+    same notification twice.
+
+    Returns a ``{"sent": X, "failed": Y, "retry": Z}`` count of processed
+    rows, where ``retry`` rows stay pending for a later run.
+    """
+
+    counts = {"sent": 0, "failed": 0, "retry": 0}
+    rows = _claim(limit)
+    if not rows:
+        return counts
+
+    connection = None
+    try:
+        for row in rows:
+            if row.channel == "email":
+                try:
+                    if connection is None:
+                        connection = get_connection()
+                        connection.open()
+                except Exception as exc:  # SMTP errors vary by backend
+                    _record_failure(row, str(exc), timezone.now())
+                    continue
+                failed = NotificationService.send_mass_email(
+                    row.subject, row.body, row.recipients, connection=connection
+                )
+            else:
+                failed = NotificationService.send_mass_sms(row.body, row.recipients)
+            if failed:
+                row.recipients = failed
+                _record_failure(
+                    row,
+                    f"{len(failed)} {row.channel} recipient(s) failed",
+                    timezone.now(),
+                )
+                continue
+            row.status = "sent"
+            row.sent_at = timezone.now()
+    finally:
+        if connection is not None:
+            connection.close()
+        # Save what was delivered even if a send raised unexpectedly; the
+        # rest keep their lease and are retried once it expires.
+        NotificationOutbox.objects.bulk_update(
+            rows,
+            ["status", "last_error", "recipients", "next_attempt_at", "sent_at"],
+        )
+
+    for row in rows:
+        counts["retry" if row.status == "pending" else row.status] += 1
+    return counts
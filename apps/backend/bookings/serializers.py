@@ -1,6 +1,5 @@
 from rest_framework import serializers
-from django.conf import settings
-import requests
+from utils.captcha import verify_captcha
 from .models import (
     Booking,
     BookingDetails,
@@ -89,18 +88,14 @@ class BookingSerializer(serializers.ModelSerializer):
         ]
 
     def validate_captcha_token(self, value):
-        response = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data={"secret": settings.RECAPTCHA_SECRET_KEY, "response": value},
-            timeout=5,
-        )
-        if not response.json().get("success"):
+        if not verify_captcha(value):
             raise serializers.ValidationError("Invalid captcha")
         return value
 
     def to_representation(self, instance):
-        instance.update_status_if_needed()
-        return super().to_representation(instance)
+        data = super().to_representation(instance)
+        data["status"] = instance.effective_status()
+        return data
 
     def _save_details(self, booking, details_data):
         if not details_data:
@@ -137,6 +132,8 @@ class BookingSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         details_data = validated_data.pop("details", None)
         responses_data = validated_data.pop("customerresponse_set", [])
+        # Validate against the status the client was shown
+        instance.status = instance.effective_status()
         new_status = validated_data.get("status", instance.status)
         if new_status != instance.status and new_status not in instance.allowed_transitions():
             raise serializers.ValidationError({"status": "Invalid transition"})
@@ -1,7 +1,7 @@
-from rest_framework.throttling import ScopedRateThrottle
+from accounts.throttles import SlidingWindowScopedRateThrottle
 
 
-class BookingRateThrottle(ScopedRateThrottle):
+class BookingRateThrottle(SlidingWindowScopedRateThrottle):
     scope = "booking"
 
     def allow_request(self, request, view):
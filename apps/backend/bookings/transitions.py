@@ -0,0 +1,58 @@
+"""Persist time-based booking status transitions in bulk.
+
+:meth:`Booking.effective_status` derives the current status on every read;
+:func:`advance_due_bookings` writes it back with one ``UPDATE`` per transition
+and a single batched :class:`~activity.models.EventLog` insert, instead of a
+save (and audit insert) per booking.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from activity.models import EventLog
+from .models import Booking
+
+# Completed runs first so a booking advances at most one step per run, matching
+# Booking.effective_status.
+TRANSITIONS = [("in_progress", "completed"), ("approved", "in_progress")]
+
+
+def _due(from_status, now):
+    today = now.date()
+    if from_status == "approved":
+        return Q(date__lt=today) | Q(date=today, time__lte=now.time())
+    return Q(date__lt=today)
+
+
+def advance_due_bookings(now=None):
+    """Apply every due transition.
+
+    Returns:
+        dict: Number of bookings moved into each target status.
+    """
+
+    now = timezone.localtime(now)
+    counts = {}
+    for from_status, to_status in TRANSITIONS:
+        with transaction.atomic():
+            ids = list(
+                Booking.objects.select_for_update()
+                .filter(_due(from_status, now), status=from_status)
+                .values_list("pk", flat=True)
+            )
+            if ids:
+                Booking.objects.filter(pk__in=ids).update(
+                    status=to_status, date_modified=timezone.now()
+                )
+                EventLog.objects.bulk_create(
+                    EventLog(
+                        entity_type="booking",
+                        entity_id=str(pk),
+                        action="updated",
+                        metadata={"status": {"from": from_status, "to": to_status}},
+                    )
+                    for pk in ids
+                )
+        counts[to_status] = len(ids)
+    return counts
@@ -13,24 +13,31 @@ from store.permissions import (
     IsSystemAdminOrCustomerCreate,
 )
 from .throttles import BookingRateThrottle
-from .notifications import send_booking_notifications
+from .notifications import queue_booking_notifications
 
 
 class BookingViewSet(viewsets.ModelViewSet):
-    queryset = Booking.objects.all().order_by("-date_created")
+    queryset = (
+        Booking.objects.select_related("details")
+        .prefetch_related(
+            "details__issues", "details__other_issues", "customerresponse_set"
+        )
+        .order_by("-date_created")
+    )
     serializer_class = BookingSerializer
     permission_classes = [IsSystemAdminOrBookingCreate]
     throttle_classes = [BookingRateThrottle]
+    throttle_scope = "booking"
 
     def perform_create(self, serializer):
         booking = serializer.save()
-        send_booking_notifications(booking)
+        queue_booking_notifications(booking)
 
     def perform_update(self, serializer):
         old_status = serializer.instance.status
         booking = serializer.save()
         if booking.status != old_status:
-            send_booking_notifications(booking)
+            queue_booking_notifications(booking)
 
 
 class IssueViewSet(viewsets.ModelViewSet):
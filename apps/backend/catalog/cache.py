@@ -0,0 +1,17 @@
+"""Cache namespace for the catalog taxonomy endpoints.
+
+Departments, categories, sub-categories, units, qualities and brands change a
+few times a month but are read on every storefront page. Their list/detail
+responses share one namespace because serializers nest related taxonomy
+(a category shows its department, and so on), so any change invalidates all
+of them. The post_save/post_delete receivers in :mod:`activity.signals` call
+:func:`invalidate_taxonomy_cache`.
+"""
+
+from utils.cache import bump_namespace
+
+TAXONOMY_CACHE_NAMESPACE = "catalog-taxonomy"
+
+
+def invalidate_taxonomy_cache() -> None:
+    bump_namespace(TAXONOMY_CACHE_NAMESPACE)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0004_category_hsn_code"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="barcode",
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from rest_framework import permissions, viewsets
+from search.backends import search_queryset
 from store.permissions import IsSystemAdminOrReadOnly
+from utils.cache import CachedResponseMixin
 
+from .cache import TAXONOMY_CACHE_NAMESPACE
 from .models import Department, Category, SubCategory, Product, Variant, Unit, Quality
 from .serializers import (
     DepartmentSerializer,
@@ -13,15 +16,17 @@ from .serializers import (
 )
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_namespace = TAXONOMY_CACHE_NAMESPACE
     queryset = Department.objects.all().order_by("name")
     serializer_class = DepartmentSerializer
     lookup_field = "slug"
     permission_classes = [IsSystemAdminOrReadOnly]
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
-    queryset = Category.objects.all().order_by("name")
+class CategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_namespace = TAXONOMY_CACHE_NAMESPACE
+    queryset = Category.objects.select_related("department").order_by("name")
     serializer_class = CategorySerializer
     lookup_field = "slug"
     permission_classes = [IsSystemAdminOrReadOnly]
@@ -34,8 +39,9 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return qs
 
 
-class SubCategoryViewSet(viewsets.ModelViewSet):
-    queryset = SubCategory.objects.all().order_by("name")
+class SubCategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_namespace = TAXONOMY_CACHE_NAMESPACE
+    queryset = SubCategory.objects.select_related("category").order_by("name")
     serializer_class = SubCategorySerializer
     lookup_field = "slug"
     permission_classes = [IsSystemAdminOrReadOnly]
@@ -50,7 +56,9 @@ class SubCategoryViewSet(viewsets.ModelViewSet):
 
 
 class ProductViewSet(viewsets.ModelViewSet):
-    queryset = Product.objects.all().order_by("name")
+    queryset = Product.objects.select_related(
+        "brand", "subcategory__category__department", "unit"
+    ).order_by("name")
     serializer_class = ProductSerializer
     lookup_field = "slug"
     permission_classes = [IsSystemAdminOrReadOnly]
@@ -94,7 +102,7 @@ class ProductViewSet(viewsets.ModelViewSet):
 
 
 class VariantViewSet(viewsets.ModelViewSet):
-    queryset = Variant.objects.all().order_by("variant_name")
+    queryset = Variant.objects.select_related("product__unit").order_by("variant_name")
     serializer_class = VariantSerializer
     lookup_field = "slug"
     permission_classes = [IsSystemAdminOrReadOnly]
@@ -104,17 +112,22 @@ class VariantViewSet(viewsets.ModelViewSet):
         product = self.request.query_params.get("product")
         if product:
             qs = qs.filter(product__slug=product)
+        search = self.request.query_params.get("search")
+        if search:
+            qs = search_queryset(qs, "variant", search)
         return qs
 
 
-class UnitViewSet(viewsets.ModelViewSet):
+class UnitViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_namespace = TAXONOMY_CACHE_NAMESPACE
     queryset = Unit.objects.all().order_by("name")
     serializer_class = UnitSerializer
     lookup_field = "slug"
     permission_classes = [permissions.IsAuthenticated, IsSystemAdminOrReadOnly]
 
 
-class QualityViewSet(viewsets.ModelViewSet):
+class QualityViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    cache_namespace = TAXONOMY_CACHE_NAMESPACE
     queryset = Quality.objects.all().order_by("name")
     serializer_class = QualitySerializer
     lookup_field = "slug"
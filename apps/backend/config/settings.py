@@ -18,12 +18,23 @@ except ImportError:
 SECRET_KEY = os.environ.get("SECRET_KEY", "fallback-in-dev")  # Safe default in local
 DEBUG = os.environ.get("DEBUG", "False") == "True"  # Controlled via env
 RECAPTCHA_SECRET_KEY = os.environ.get("RECAPTCHA_SECRET_KEY", "")
+# Dotted path of the captcha backend; use utils.captcha.StubCaptchaVerifier
+# for local load runs that must not call Google.
+RECAPTCHA_VERIFIER = os.environ.get(
+    "RECAPTCHA_VERIFIER", "utils.captcha.RecaptchaVerifier"
+)
+RECAPTCHA_CACHE_TTL = int(os.environ.get("RECAPTCHA_CACHE_TTL", "120"))
 BOOKING_NOTIFICATION_CHANNELS = os.environ.get(
     "BOOKING_NOTIFICATION_CHANNELS", "email,sms"
 ).split(",")
 SMS_GATEWAY_URL = os.environ.get("SMS_GATEWAY_URL", "")
 SMS_GATEWAY_TOKEN = os.environ.get("SMS_GATEWAY_TOKEN", "")
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "noreply@example.com")
+# Invoice numbering (see invoicing.sequences). Block sizes above 1 allow gaps.
+INVOICE_SERIES_PER_STORE_FY = (
+    os.environ.get("INVOICE_SERIES_PER_STORE_FY", "False") == "True"
+)
+INVOICE_NUMBER_BLOCK_SIZE = int(os.environ.get("INVOICE_NUMBER_BLOCK_SIZE", "1"))
 _DEFAULT_ALLOWED_HOSTS = [
     "api.finetune.store",
     "localhost",
@@ -141,12 +152,12 @@ AUTH_USER_MODEL = "accounts.CustomUser"
 # ✅ Django REST + JWT
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PAGINATION_CLASS": "utils.pagination.SpringStylePagination",
     "PAGE_SIZE": 10,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.ScopedRateThrottle",
+        "accounts.throttles.SlidingWindowScopedRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "contact": "5/hour",
@@ -164,6 +175,7 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
     "AUTH_TOKEN_CLASSES": ("rest_framework_simplejwt.tokens.AccessToken",),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.revocation.CachedTokenRefreshSerializer",
 }
 
 # ✅ Installed Apps
@@ -190,15 +202,18 @@ INSTALLED_APPS = [
     "sales",
     "activity",
     "inventory",
+    "search",
     ##'django_extensions',
 ]
 
 # ✅ Middleware
 MIDDLEWARE = [
+    "utils.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "csp.middleware.CSPMiddleware",
     "utils.middleware.SecurityHeadersMiddleware",
+    "activity.middleware.AuditBufferMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -237,6 +252,62 @@ except Exception:
     DATABASE_URL = DEFAULT_SQLITE_URL
     DATABASES = {"default": dj_database_url.parse(DATABASE_URL)}
 
+# ✅ Cache: shared across worker processes (throttles, captcha, catalog).
+# REDIS_URL selects Redis; otherwise a file cache shared by processes on
+# the same host is used.
+REDIS_URL = os.environ.get("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get(
+                "CACHE_DIR", os.path.join(BASE_DIR, ".cache", "django")
+            ),
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+# Where throttle counters live: "cache" (atomic with Redis) or "database"
+# (swept by ``sweep_throttle_counters``). The file cache is not atomic.
+THROTTLE_STORE = os.environ.get("THROTTLE_STORE", "cache" if REDIS_URL else "database")
+# Request metrics (/metrics): requests slower than this many ms are logged
+# with their slowest SQL statements; 0 disables the log.
+METRICS_SLOW_REQUEST_MS = int(os.environ.get("METRICS_SLOW_REQUEST_MS", "1000"))
+METRICS_SLOW_SQL_COUNT = int(os.environ.get("METRICS_SLOW_SQL_COUNT", "3"))
+# Seconds between copies of each worker's totals to the shared cache.
+METRICS_PUBLISH_INTERVAL = int(os.environ.get("METRICS_PUBLISH_INTERVAL", "15"))
+# Seconds an authenticated user stays cached (invalidated on change).
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", "60"))
+# Seconds a refresh token's blacklist status stays cached (new revocations
+# overwrite it immediately).
+TOKEN_REVOCATION_CACHE_TIMEOUT = int(
+    os.environ.get("TOKEN_REVOCATION_CACHE_TIMEOUT", "3600")
+)
+# Processes hashing passwords in the import_users command (0 = one per CPU).
+USER_IMPORT_HASH_WORKERS = int(os.environ.get("USER_IMPORT_HASH_WORKERS", "0"))
+# Seconds catalog taxonomy responses stay cached (invalidated on change).
+CATALOG_CACHE_TIMEOUT = int(os.environ.get("CATALOG_CACHE_TIMEOUT", "3600"))
+# Upper bound on ranked ids search_ids() returns; paginated search views are
+# not capped.
+SEARCH_MAX_RESULTS = int(os.environ.get("SEARCH_MAX_RESULTS", "200"))
+# Spool audit events to files (loaded by drain_audit_log) instead of the DB.
+AUDIT_LOG_SPOOL = os.environ.get("AUDIT_LOG_SPOOL", "False") == "True"
+AUDIT_LOG_SPOOL_DIR = os.environ.get(
+    "AUDIT_LOG_SPOOL_DIR", os.path.join(BASE_DIR, ".spool", "audit")
+)
+# EventLog months older than this are moved to gzip JSONL archives by
+# archive_event_logs; point the directory at persistent storage.
+EVENTLOG_RETENTION_DAYS = int(os.environ.get("EVENTLOG_RETENTION_DAYS", "365"))
+EVENTLOG_ARCHIVE_DIR = os.environ.get(
+    "EVENTLOG_ARCHIVE_DIR", os.path.join(BASE_DIR, ".archive", "eventlog")
+)
+
 # ✅ Password Validators
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -4,6 +4,7 @@ URL configuration for config project.
 from django.contrib import admin
 from django.urls import path
 from django.urls import include
+from utils.views import MetricsView
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -27,4 +28,5 @@ urlpatterns = [
     path("api/", include("inventory.urls")),
     path("api/token/refresh", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/token/verify", TokenVerifyView.as_view(), name="token_verify"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]  # ← THIS CLOSING BRACKET WAS MISSING
@@ -0,0 +1,170 @@
+"""Contention-safe maintenance of :class:`~inventory.models.StockLedger`.
+
+Stock entries are turned into signed quantity deltas per ``(store, variant)``
+and applied with one ``INSERT ... ON CONFLICT (store_id, product_variant_id)
+DO UPDATE SET quantity = quantity + excluded.quantity`` statement. The
+increment happens inside the database while it holds the row lock, so
+concurrent entries for the same store and variant can no longer overwrite
+each other, and a missing ledger row is created by the same statement.
+PostgreSQL and SQLite share the syntax; other backends fall back to an
+``F()`` update followed by an insert.
+
+Keys are applied in sorted order so concurrent batches lock ledger rows in the
+same order and cannot deadlock each other.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import Case, F, Sum, When
+from django.utils import timezone
+
+from .models import StockEntry, StockLedger
+
+INBOUND_TYPES = (StockEntry.PURCHASE, StockEntry.RETURN_IN, StockEntry.TRANSFER_IN)
+
+LedgerKey = Tuple[int, int]
+
+_UPSERT_SQL = """
+    INSERT INTO {table} ({store}, {variant}, {quantity}, {updated})
+    VALUES {values}
+    ON CONFLICT ({store}, {variant}) DO UPDATE SET
+        {quantity} = {table}.{quantity} + EXCLUDED.{quantity},
+        {updated} = EXCLUDED.{updated}
+"""
+
+
+def signed_quantity(entry_type: str, quantity: int) -> int:
+    """Return ``quantity`` as a ledger delta: positive for stock coming in."""
+
+    return quantity if entry_type in INBOUND_TYPES else -quantity
+
+
+def signed_quantity_sum():
+    """``Sum`` of entry quantities as ledger deltas, for use in aggregates."""
+
+    return Sum(
+        Case(
+            When(entry_type__in=INBOUND_TYPES, then=F("quantity")),
+            default=-F("quantity"),
+        )
+    )
+
+
+def aggregate_deltas(entries: Iterable[StockEntry]) -> Dict[LedgerKey, int]:
+    """Sum the ledger deltas of ``entries`` per ``(store_id, variant_id)``."""
+
+    deltas = defaultdict(int)
+    for entry in entries:
+        key = (entry.store_id, entry.product_variant_id)
+        deltas[key] += signed_quantity(entry.entry_type, entry.quantity)
+    return dict(deltas)
+
+
+def apply_deltas(deltas: Dict[LedgerKey, int], batch_size: int = 500) -> None:
+    """Add each delta to its ledger row, creating missing rows.
+
+    Keys with a zero delta still get a ledger row, matching what a single
+    entry of quantity zero always did.
+    """
+
+    if not deltas:
+        return
+    using = router.db_for_write(StockLedger)
+    connection = connections[using]
+    rows = sorted(deltas.items())
+    now = timezone.now()
+    if connection.vendor not in ("postgresql", "sqlite"):
+        _apply_one_by_one(rows, now, using)
+        return
+
+    qn = connection.ops.quote_name
+    meta = StockLedger._meta
+    columns = {
+        "table": qn(meta.db_table),
+        "store": qn(meta.get_field("store").column),
+        "variant": qn(meta.get_field("product_variant").column),
+        "quantity": qn(meta.get_field("quantity").column),
+        "updated": qn(meta.get_field("last_updated").column),
+    }
+    stamp = connection.ops.adapt_datetimefield_value(now)
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            sql = _UPSERT_SQL.format(
+                values=", ".join(["(%s, %s, %s, %s)"] * len(batch)), **columns
+            )
+            params = []
+            for (store_id, variant_id), delta in batch:
+                params.extend([store_id, variant_id, delta, stamp])
+            cursor.execute(sql, params)
+
+
+def _apply_one_by_one(rows, now, using) -> None:
+    for (store_id, variant_id), delta in rows:
+        ledger = StockLedger.objects.using(using).filter(
+            store_id=store_id, product_variant_id=variant_id
+        )
+        if ledger.update(quantity=F("quantity") + delta, last_updated=now):
+            continue
+        try:
+            with transaction.atomic(using=using):
+                StockLedger.objects.using(using).create(
+                    store_id=store_id, product_variant_id=variant_id, quantity=delta
+                )
+        except IntegrityError:
+            # Created concurrently; the row exists now.
+            ledger.update(quantity=F("quantity") + delta, last_updated=now)
+
+
+def apply_entries(entries: Iterable[StockEntry]) -> None:
+    """Apply ``entries`` to the ledger with one upsert per store and variant."""
+
+    apply_deltas(aggregate_deltas(entries))
+
+
+def expected_quantities(store_id: int) -> Dict[int, int]:
+    """Ledger quantity per variant at ``store_id`` recomputed from entries."""
+
+    return dict(
+        StockEntry.objects.filter(store_id=store_id)
+        .values("product_variant_id")
+        .annotate(quantity=signed_quantity_sum())
+        .order_by()
+        .values_list("product_variant_id", "quantity")
+    )
+
+
+def reconcile_store(store_id: int, fix: bool = False) -> Dict[int, Tuple[int, int]]:
+    """Compare ``store_id``'s ledger rows with its entries.
+
+    With ``fix`` the store's ledger rows are locked, the drift is recomputed
+    under the lock and applied as deltas, so entries committed concurrently
+    are neither lost nor counted twice.
+
+    Returns:
+        Dict[int, Tuple[int, int]]: ``variant_id -> (ledger, expected)`` for
+        every variant that drifted.
+    """
+
+    using = router.db_for_write(StockLedger)
+    with transaction.atomic(using=using):
+        ledgers = StockLedger.objects.using(using).filter(store_id=store_id)
+        if fix:
+            ledgers = ledgers.select_for_update()
+        actual = dict(ledgers.values_list("product_variant_id", "quantity"))
+        expected = expected_quantities(store_id)
+        drift = {
+            variant_id: (actual.get(variant_id, 0), expected.get(variant_id, 0))
+            for variant_id in set(actual) | set(expected)
+            if actual.get(variant_id, 0) != expected.get(variant_id, 0)
+        }
+        if fix and drift:
+            apply_deltas(
+                {
+                    (store_id, variant_id): wanted - current
+                    for variant_id, (current, wanted) in drift.items()
+                }
+            )
+    return drift
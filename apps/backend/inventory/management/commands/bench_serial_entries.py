@@ -0,0 +1,105 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from bookings.models import Booking
+from catalog.models import Category, Department, Product, SubCategory, Variant
+from inventory.models import InventoryConfig, SerialNumber
+from inventory.serializers import StockEntrySerializer
+from marketing.models import Brand
+from store.models import Store
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """Measure serial-tracked stock entries at increasing serial counts.
+
+    For every size a purchase registering N serials and a sale of the same N
+    serials go through :class:`StockEntrySerializer`, and the queries and
+    wall time of each are reported. Everything runs in a transaction that is
+    rolled back, so the command is safe to run against a real database::
+
+        python manage.py bench_serial_entries --sizes=10,100,1000
+    """
+
+    help = "Benchmark serial-tracked purchase and sale entries (queries and ms)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="10,100,1000",
+            help="Comma separated serial counts per entry (default 10,100,1000)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--sizes takes integers")
+
+        self.stdout.write(f"backend={connection.vendor}")
+        try:
+            with transaction.atomic():
+                store, variant, booking = self._fixtures()
+                for size in sizes:
+                    self._run(size, store, variant, booking)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _fixtures():
+        tag = f"bench-{time.time_ns()}"
+        department = Department.objects.create(name=tag)
+        category = Category.objects.create(name=tag, department=department)
+        subcategory = SubCategory.objects.create(name=tag, category=category)
+        InventoryConfig.objects.create(category=category, track_serials=True)
+        product = Product.objects.create(
+            name=tag,
+            brand=Brand.objects.create(name=tag),
+            subcategory=subcategory,
+            price=1,
+        )
+        variant = Variant.objects.create(product=product, variant_name=tag, price=1)
+        store = Store.objects.create(store_name=tag, code=tag[-10:])
+        now = timezone.now()
+        booking = Booking.objects.create(name=tag, date=now.date(), time=now.time())
+        return store, variant, booking
+
+    def _run(self, size, store, variant, booking):
+        serials = [f"BENCH-{size}-{time.time_ns()}-{i}" for i in range(size)]
+        base = {
+            "store": store.id,
+            "product_variant": variant.id,
+            "quantity": size,
+            "unit_price": "1",
+            "serial_numbers": serials,
+        }
+        for entry_type, extra in (
+            ("purchase", {}),
+            ("sale", {"booking": booking.id}),
+        ):
+            serializer = StockEntrySerializer(
+                data={**base, **extra, "entry_type": entry_type}
+            )
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                if not serializer.is_valid():
+                    raise CommandError(f"{entry_type} rejected: {serializer.errors}")
+                serializer.save()
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"serials={size:<5} entry={entry_type:<8} "
+                f"queries={len(queries):<5} ms={elapsed * 1000:,.1f}"
+            )
+        sold = SerialNumber.objects.filter(
+            serial_no__in=serials, status=SerialNumber.STATUS_SOLD
+        ).count()
+        if sold != size:
+            raise CommandError(f"expected {size} sold serials, found {sold}")
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from inventory.ledger import reconcile_store
+from store.models import Store
+
+
+class Command(BaseCommand):
+    """Recompute stock ledgers from stock entries and report drift.
+
+    Stores are reconciled in parallel, one database connection per worker.
+    Without ``--fix`` nothing is written. With it, each store's ledger rows
+    are locked while the drift is recomputed and corrected::
+
+        python manage.py reconcile_stock_ledgers --workers=8 [--fix]
+    """
+
+    help = "Compare StockLedger quantities with StockEntry totals per store"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Stores reconciled concurrently (default 4)",
+        )
+        parser.add_argument(
+            "--store",
+            type=int,
+            action="append",
+            dest="stores",
+            help="Only reconcile this store id (repeatable)",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Correct drifted ledger rows instead of only reporting them",
+        )
+
+    def handle(self, *args, **options):
+        store_ids = options["stores"] or list(
+            Store.objects.order_by("id").values_list("id", flat=True)
+        )
+        fix = options["fix"]
+
+        def reconcile(store_id):
+            try:
+                return store_id, reconcile_store(store_id, fix=fix)
+            finally:
+                if options["workers"] > 1:
+                    connections.close_all()
+
+        if options["workers"] > 1:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+                results = list(pool.map(reconcile, store_ids))
+        else:
+            results = [reconcile(store_id) for store_id in store_ids]
+
+        drifted = 0
+        for store_id, drift in results:
+            for variant_id, (ledger, expected) in sorted(drift.items()):
+                drifted += 1
+                self.stdout.write(
+                    f"store={store_id} variant={variant_id} ledger={ledger} "
+                    f"entries={expected} drift={ledger - expected:+d}"
+                )
+        action = "fixed" if fix else "found"
+        self.stdout.write(
+            f"reconcile_stock_ledgers: stores={len(store_ids)} {action}={drifted}"
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from inventory.valuation import run_valuation
+
+
+class Command(BaseCommand):
+    """Fold new stock entries into the weighted-average and FIFO valuation.
+
+    Each run only processes entries recorded since the previous one, so it
+    can run every few minutes or once before month-end reporting::
+
+        python manage.py run_valuation
+    """
+
+    help = "Update inventory valuation state and monthly valuation rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows fetched and written per round trip (default 1000)",
+        )
+
+    def handle(self, *args, **options):
+        result = run_valuation(batch_size=options["batch_size"])
+        self.stdout.write(
+            f"run_valuation: entries={result['entries']} keys={result['keys']}"
+        )
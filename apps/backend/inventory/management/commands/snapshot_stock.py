@@ -0,0 +1,36 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from inventory.snapshots import last_snapshot_date, take_snapshots
+
+
+class Command(BaseCommand):
+    """Compact finished days of stock entries into daily snapshots.
+
+    Run it once a day after midnight (it catches up on any missed days)::
+
+        python manage.py snapshot_stock
+    """
+
+    help = "Write daily stock snapshots up to yesterday (or --until)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--until",
+            default=None,
+            help="Last day to snapshot, YYYY-MM-DD (default: yesterday)",
+        )
+
+    def handle(self, *args, **options):
+        until = None
+        if options["until"]:
+            try:
+                until = date.fromisoformat(options["until"])
+            except ValueError:
+                raise CommandError("--until takes a YYYY-MM-DD date")
+            if until >= timezone.localdate():
+                raise CommandError("--until must be a finished day, before today")
+        written = take_snapshots(until)
+        self.stdout.write(f"snapshot_stock: rows={written} last={last_snapshot_date()}")
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0004_category_hsn_code"),
+        ("inventory", "0002_stocksnapshot"),
+        ("store", "0007_store_refactor"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyValuation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("quantity", models.IntegerField()),
+                ("value_wavg", models.DecimalField(decimal_places=4, max_digits=16)),
+                ("value_fifo", models.DecimalField(decimal_places=4, max_digits=16)),
+                ("sold_quantity", models.IntegerField(default=0)),
+                (
+                    "cogs_wavg",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=16),
+                ),
+                (
+                    "cogs_fifo",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=16),
+                ),
+                (
+                    "product_variant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_valuations",
+                        to="catalog.variant",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_valuations",
+                        to="store.store",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["month"], name="monthly_valuation_month_idx")
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("store", "product_variant", "month"),
+                        name="monthly_valuation_store_variant_month",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ValuationState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quantity", models.IntegerField(default=0)),
+                (
+                    "wavg_value",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=16),
+                ),
+                (
+                    "fifo_value",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=16),
+                ),
+                ("fifo_layers", models.JSONField(default=list)),
+                (
+                    "last_cost",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=16),
+                ),
+                ("last_entry_id", models.BigIntegerField(default=0)),
+                ("month", models.DateField(blank=True, null=True)),
+                ("month_sold", models.IntegerField(default=0)),
+                (
+                    "month_cogs_wavg",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=16),
+                ),
+                (
+                    "month_cogs_fifo",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=16),
+                ),
+                (
+                    "product_variant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="valuation_states",
+                        to="catalog.variant",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="valuation_states",
+                        to="store.store",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("store", "product_variant"),
+                        name="valuation_state_store_variant",
+                    )
+                ],
+            },
+        ),
+    ]
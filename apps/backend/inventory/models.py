@@ -84,3 +84,92 @@ class PriceLog(models.Model):
 
     def __str__(self):
         return f"{self.product_variant} {self.old_price}->{self.new_price}"
+
+
+class StockSnapshot(models.Model):
+    """Stock of a variant at a store at the end of ``date`` (local time).
+
+    Written by ``snapshot_stock`` only for days on which the quantity
+    changed, so the row with the latest ``date`` on or before a day holds the
+    quantity for that day.
+    """
+
+    store = models.ForeignKey('store.Store', on_delete=models.CASCADE, related_name='stock_snapshots')
+    product_variant = models.ForeignKey('catalog.Variant', on_delete=models.CASCADE, related_name='stock_snapshots')
+    date = models.DateField()
+    quantity = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['store', 'product_variant', 'date'],
+                name='stock_snapshot_store_variant_date',
+            )
+        ]
+        indexes = [models.Index(fields=['date'], name='stock_snapshot_date_idx')]
+
+    def __str__(self):
+        return f"{self.store} - {self.product_variant} @ {self.date}: {self.quantity}"
+
+
+class ValuationState(models.Model):
+    """Running cost state of a variant at a store, kept by ``run_valuation``.
+
+    ``fifo_layers`` holds the open purchase layers oldest first as
+    ``[quantity, "unit_cost"]`` pairs. The ``month_*`` fields accumulate the
+    month of the last processed entry and are copied to
+    :class:`MonthlyValuation`.
+    """
+
+    store = models.ForeignKey('store.Store', on_delete=models.CASCADE, related_name='valuation_states')
+    product_variant = models.ForeignKey('catalog.Variant', on_delete=models.CASCADE, related_name='valuation_states')
+    quantity = models.IntegerField(default=0)
+    wavg_value = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    fifo_value = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    fifo_layers = models.JSONField(default=list)
+    last_cost = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    last_entry_id = models.BigIntegerField(default=0)
+    month = models.DateField(null=True, blank=True)
+    month_sold = models.IntegerField(default=0)
+    month_cogs_wavg = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    month_cogs_fifo = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['store', 'product_variant'], name='valuation_state_store_variant'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.store} - {self.product_variant}: {self.quantity}"
+
+
+class MonthlyValuation(models.Model):
+    """Closing stock value and cost of goods sold of one key for one month.
+
+    Only months with entries get a row; the latest row on or before a month
+    holds the closing position for that month.
+    """
+
+    store = models.ForeignKey('store.Store', on_delete=models.CASCADE, related_name='monthly_valuations')
+    product_variant = models.ForeignKey('catalog.Variant', on_delete=models.CASCADE, related_name='monthly_valuations')
+    month = models.DateField()
+    quantity = models.IntegerField()
+    value_wavg = models.DecimalField(max_digits=16, decimal_places=4)
+    value_fifo = models.DecimalField(max_digits=16, decimal_places=4)
+    sold_quantity = models.IntegerField(default=0)
+    cogs_wavg = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+    cogs_fifo = models.DecimalField(max_digits=16, decimal_places=4, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['store', 'product_variant', 'month'],
+                name='monthly_valuation_store_variant_month',
+            )
+        ]
+        indexes = [models.Index(fields=['month'], name='monthly_valuation_month_idx')]
+
+    def __str__(self):
+        return f"{self.store} - {self.product_variant} {self.month:%Y-%m}"
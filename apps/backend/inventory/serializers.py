@@ -1,5 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 
+from . import serials as serial_ops
+from .ledger import apply_entries
 from .models import (
     InventoryConfig,
     PriceLog,
@@ -21,6 +24,37 @@ class StockLedgerSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
+class StockEntryListSerializer(serializers.ListSerializer):
+    """Validates and stores a batch of stock entries in one transaction.
+
+    Entries are inserted with a single ``bulk_create`` and the ledger is
+    updated with one aggregated upsert per store and variant, rather than the
+    per-entry ``post_save`` ledger update.
+    """
+
+    def validate(self, attrs):
+        seen = set()
+        for item in attrs:
+            for serial in item.get("serial_numbers") or []:
+                if serial in seen:
+                    raise serializers.ValidationError(
+                        {"serial_numbers": f"Serial {serial} appears more than once."}
+                    )
+                seen.add(serial)
+        return attrs
+
+    def create(self, validated_data):
+        serials = [attrs.pop("serial_numbers", []) for attrs in validated_data]
+        with transaction.atomic():
+            entries = StockEntry.objects.bulk_create(
+                [StockEntry(**attrs) for attrs in validated_data]
+            )
+            for entry, entry_serials in zip(entries, serials):
+                apply_serials(entry, entry_serials)
+            apply_entries(entries)
+        return entries
+
+
 class StockEntrySerializer(serializers.ModelSerializer):
     serial_numbers = serializers.ListField(
         child=serializers.CharField(), write_only=True, required=False
@@ -29,6 +63,7 @@ class StockEntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = StockEntry
         fields = '__all__'
+        list_serializer_class = StockEntryListSerializer
 
     def validate(self, attrs):
         entry_type = attrs.get("entry_type")
@@ -37,65 +72,66 @@ class StockEntrySerializer(serializers.ModelSerializer):
         store = attrs.get("store")
         quantity = attrs.get("quantity", 0)
         serials = attrs.get("serial_numbers") or []
-        category = getattr(getattr(variant.product, "subcategory", None), "category", None)
 
         if entry_type == StockEntry.SALE and not booking:
             raise serializers.ValidationError(
                 {"booking": "Booking is required for sale entries."}
             )
 
-        config = getattr(category, "inventory_config", None)
-        if config and config.track_serials and entry_type in [
-            StockEntry.SALE,
-            StockEntry.PURCHASE,
-            StockEntry.RETURN_IN,
-            StockEntry.TRANSFER_IN,
-        ]:
+        if entry_type in serial_ops.TRACKED_TYPES and serial_ops.tracks_serials(variant):
             if len(serials) != quantity:
                 raise serializers.ValidationError(
                     {"serial_numbers": "Serial count must match quantity."}
                 )
+            _reject_serials(
+                "Serials listed more than once.", serial_ops.duplicates(serials)
+            )
             if entry_type == StockEntry.SALE:
-                available = SerialNumber.objects.filter(
-                    serial_no__in=serials,
-                    product_variant=variant,
-                    store=store,
-                    status=SerialNumber.STATUS_AVAILABLE,
-                ).count()
-                if available != quantity:
-                    raise serializers.ValidationError(
-                        {"serial_numbers": "Serials not available."}
-                    )
+                _reject_serials(
+                    "Serials not available.",
+                    serial_ops.unavailable(serials, variant, store),
+                )
+            else:
+                _reject_serials(
+                    "Serials already registered.",
+                    serial_ops.already_registered(serials),
+                )
         return super().validate(attrs)
 
     def create(self, validated_data):
         serials = validated_data.pop("serial_numbers", [])
-        entry = super().create(validated_data)
-        variant = entry.product_variant
-        category = getattr(getattr(variant.product, "subcategory", None), "category", None)
-        config = getattr(category, "inventory_config", None)
-        if config and config.track_serials and serials:
-            if entry.entry_type == StockEntry.SALE:
-                for sn in serials:
-                    obj = SerialNumber.objects.get(
-                        serial_no=sn,
-                        product_variant=variant,
-                        store=entry.store,
-                        status=SerialNumber.STATUS_AVAILABLE,
-                    )
-                    obj.status = SerialNumber.STATUS_SOLD
-                    obj.store = None
-                    obj.save()
-            else:
-                for sn in serials:
-                    SerialNumber.objects.create(
-                        product_variant=variant,
-                        serial_no=sn,
-                        store=entry.store,
-                    )
+        with transaction.atomic():
+            entry = super().create(validated_data)
+            apply_serials(entry, serials)
         return entry
 
 
+def _reject_serials(message, failed):
+    """Fail validation naming every serial in ``failed``, if there are any."""
+    if failed:
+        raise serializers.ValidationError(
+            {"serial_numbers": message, "failed_serials": failed}
+        )
+
+
+def apply_serials(entry, serials):
+    """Sell or register the serial numbers listed on ``entry``.
+
+    Runs inside the transaction that creates ``entry``; a serial sold by a
+    concurrent request since validation rolls the whole entry back.
+    """
+    variant = entry.product_variant
+    if not serials or not serial_ops.tracks_serials(variant):
+        return
+    if entry.entry_type == StockEntry.SALE:
+        _reject_serials(
+            "Serials not available.",
+            serial_ops.mark_sold(serials, variant, entry.store),
+        )
+    else:
+        serial_ops.register(serials, variant, entry.store)
+
+
 class SerialNumberSerializer(serializers.ModelSerializer):
     class Meta:
         model = SerialNumber
@@ -0,0 +1,116 @@
+"""Set-based handling of serial numbers on stock entries.
+
+An entry for a serial-tracked category lists one serial per unit. Whatever
+the count, availability is checked with one ``IN`` query, a sale locks and
+then flips its serials with one ``SELECT ... FOR UPDATE`` and one
+``UPDATE ... WHERE serial_no IN (...)``, and incoming serials are inserted
+with one ``bulk_create``. Lists are split into chunks of
+:data:`CHUNK_SIZE` to stay under database parameter limits.
+
+Every check returns the exact serials that failed so the API can report them.
+"""
+
+from typing import Iterable, List
+
+from .ledger import INBOUND_TYPES
+from .models import SerialNumber, StockEntry
+
+CHUNK_SIZE = 500
+
+TRACKED_TYPES = (StockEntry.SALE,) + INBOUND_TYPES
+
+
+def _chunks(values: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(values), CHUNK_SIZE):
+        yield values[start : start + CHUNK_SIZE]
+
+
+def tracks_serials(variant) -> bool:
+    """Return whether ``variant``'s category requires serial numbers."""
+
+    category = getattr(getattr(variant.product, "subcategory", None), "category", None)
+    config = getattr(category, "inventory_config", None)
+    return bool(config and config.track_serials)
+
+
+def duplicates(serials: List[str]) -> List[str]:
+    """Serials listed more than once, in first-seen order."""
+
+    seen, repeated = set(), []
+    for serial in serials:
+        if serial in seen and serial not in repeated:
+            repeated.append(serial)
+        seen.add(serial)
+    return repeated
+
+
+def unavailable(serials: List[str], variant, store) -> List[str]:
+    """Serials that are not available for sale at ``store``, in input order."""
+
+    available = set()
+    for chunk in _chunks(serials):
+        available.update(
+            SerialNumber.objects.filter(
+                serial_no__in=chunk,
+                product_variant=variant,
+                store=store,
+                status=SerialNumber.STATUS_AVAILABLE,
+            ).values_list("serial_no", flat=True)
+        )
+    return [serial for serial in serials if serial not in available]
+
+
+def already_registered(serials: List[str]) -> List[str]:
+    """Serials that already exist and so cannot be received again."""
+
+    existing = set()
+    for chunk in _chunks(serials):
+        existing.update(
+            SerialNumber.objects.filter(serial_no__in=chunk).values_list(
+                "serial_no", flat=True
+            )
+        )
+    return [serial for serial in serials if serial in existing]
+
+
+def mark_sold(serials: List[str], variant, store) -> List[str]:
+    """Flip ``serials`` from available at ``store`` to sold.
+
+    The available rows are locked first, so serials sold concurrently since
+    validation are detected exactly. Nothing is updated unless every serial
+    can be sold. Must run inside a transaction.
+
+    Returns:
+        List[str]: Serials that could not be sold; empty on success.
+    """
+
+    rows = SerialNumber.objects.filter(
+        product_variant=variant, store=store, status=SerialNumber.STATUS_AVAILABLE
+    )
+    locked = set()
+    for chunk in _chunks(serials):
+        locked.update(
+            rows.select_for_update()
+            .filter(serial_no__in=chunk)
+            .values_list("serial_no", flat=True)
+        )
+    failed = [serial for serial in serials if serial not in locked]
+    if failed:
+        return failed
+    for chunk in _chunks(serials):
+        rows.filter(serial_no__in=chunk).update(
+            status=SerialNumber.STATUS_SOLD, store=None
+        )
+    return []
+
+
+def register(serials: List[str], variant, store) -> List[SerialNumber]:
+    """Insert ``serials`` as available stock at ``store``."""
+
+    return SerialNumber.objects.bulk_create(
+        [
+            SerialNumber(product_variant=variant, serial_no=serial, store=store)
+            for serial in serials
+        ],
+        batch_size=CHUNK_SIZE,
+    )
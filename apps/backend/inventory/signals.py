@@ -3,25 +3,15 @@ from django.dispatch import receiver
 
 from catalog.models import Variant
 
-from .models import StockEntry, StockLedger, PriceLog
+from .ledger import apply_entries
+from .models import StockEntry, PriceLog
 
 
 @receiver(post_save, sender=StockEntry)
 def update_ledger(sender, instance, created, **kwargs):
     if not created:
         return
-    ledger, _ = StockLedger.objects.get_or_create(
-        store=instance.store, product_variant=instance.product_variant
-    )
-    if instance.entry_type in [
-        StockEntry.PURCHASE,
-        StockEntry.RETURN_IN,
-        StockEntry.TRANSFER_IN,
-    ]:
-        ledger.quantity += instance.quantity
-    else:
-        ledger.quantity -= instance.quantity
-    ledger.save()
+    apply_entries([instance])
 
 
 @receiver(pre_save, sender=Variant)
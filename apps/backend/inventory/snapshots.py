@@ -0,0 +1,157 @@
+"""Daily stock snapshots and point-in-time ("as of") stock queries.
+
+:func:`take_snapshots` compacts the stock entries of every finished day into
+:class:`~inventory.models.StockSnapshot` rows. A row is written only for a
+``(store, variant)`` whose quantity changed that day, so the latest row on or
+before a day holds that day's closing stock.
+
+:func:`stock_as_of` answers "what was stock at store X on March 31". It
+starts from the latest snapshot at or before that moment and replays only
+the entries recorded since, instead of every entry ever made.
+
+Days are local days (``TIME_ZONE``), matching how the business reads dates.
+Entry dates are set on insert and never change, so the snapshot of a day
+that has ended stays valid for good.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Optional, Tuple
+
+from django.db import connections
+from django.db.models import Max
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .ledger import signed_quantity_sum
+from .models import StockEntry, StockSnapshot
+
+Key = Tuple[int, int]
+
+
+def day_end(day: date) -> datetime:
+    """Aware datetime of the local midnight that ends ``day``."""
+
+    return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+
+def _filtered(queryset, store=None, variant=None):
+    if store is not None:
+        queryset = queryset.filter(store=store)
+    if variant is not None:
+        queryset = queryset.filter(product_variant=variant)
+    return queryset
+
+
+def latest_per_key(rows, date_field: str, *fields: str) -> Dict[Key, tuple]:
+    """Latest row per ``(store_id, variant_id)`` by ``date_field``.
+
+    Uses ``DISTINCT ON`` on PostgreSQL; elsewhere rows are streamed in key
+    order and only the first of each key is kept.
+
+    Returns:
+        Dict[Key, tuple]: ``fields`` of the latest row of each key.
+    """
+
+    rows = rows.order_by("store_id", "product_variant_id", f"-{date_field}")
+    if connections[rows.db].vendor == "postgresql":
+        rows = rows.distinct("store_id", "product_variant_id")
+    latest = {}
+    for store_id, variant_id, *values in rows.values_list(
+        "store_id", "product_variant_id", *fields
+    ).iterator(chunk_size=5000):
+        latest.setdefault((store_id, variant_id), tuple(values))
+    return latest
+
+
+def latest_snapshots(day: date, store=None, variant=None) -> Dict[Key, int]:
+    """Closing quantity at the end of ``day`` per key that has a snapshot."""
+
+    rows = _filtered(StockSnapshot.objects.filter(date__lte=day), store, variant)
+    return {
+        key: quantity
+        for key, (quantity,) in latest_per_key(rows, "date", "quantity").items()
+    }
+
+
+def last_snapshot_date(before: Optional[date] = None) -> Optional[date]:
+    rows = StockSnapshot.objects.all()
+    if before is not None:
+        rows = rows.filter(date__lte=before)
+    return rows.aggregate(last=Max("date"))["last"]
+
+
+def take_snapshots(until: Optional[date] = None, batch_size: int = 1000) -> int:
+    """Snapshot every finished day after the last snapshot up to ``until``.
+
+    ``until`` defaults to yesterday. Days are processed in order from one
+    grouped query, carrying closing quantities forward in memory, so catching
+    up after missed runs costs the same as a single run.
+
+    Returns:
+        int: Number of snapshot rows written.
+
+    Raises:
+        ValueError: If ``until`` is today or later. Later runs resume after
+            the last snapshot, so entries still to come on an unfinished day
+            would never be compacted.
+    """
+
+    today = timezone.localdate()
+    until = until or today - timedelta(days=1)
+    if until >= today:
+        raise ValueError(f"Only finished days can be snapshotted, not {until}")
+    last = last_snapshot_date()
+    if last is not None and last >= until:
+        return 0
+    entries = StockEntry.objects.filter(date__lt=day_end(until))
+    if last is not None:
+        entries = entries.filter(date__gte=day_end(last))
+    changes = (
+        entries.annotate(day=TruncDate("date"))
+        .values("day", "store_id", "product_variant_id")
+        .annotate(delta=signed_quantity_sum())
+        .order_by("day")
+    )
+    closing = latest_snapshots(last) if last is not None else {}
+    snapshots = []
+    for row in changes.iterator(chunk_size=batch_size):
+        key = (row["store_id"], row["product_variant_id"])
+        closing[key] = closing.get(key, 0) + row["delta"]
+        snapshots.append(
+            StockSnapshot(
+                store_id=key[0],
+                product_variant_id=key[1],
+                date=row["day"],
+                quantity=closing[key],
+            )
+        )
+    StockSnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["store", "product_variant", "date"],
+        update_fields=["quantity"],
+    )
+    return len(snapshots)
+
+
+def stock_as_of(moment: datetime, store=None, variant=None) -> Dict[Key, int]:
+    """Quantity per ``(store_id, variant_id)`` right after ``moment``.
+
+    Entries recorded at exactly ``moment`` are included.
+    """
+
+    base_day = last_snapshot_date(timezone.localdate(moment) - timedelta(days=1))
+    quantities = {}
+    entries = _filtered(StockEntry.objects.filter(date__lte=moment), store, variant)
+    if base_day is not None:
+        quantities = latest_snapshots(base_day, store, variant)
+        entries = entries.filter(date__gte=day_end(base_day))
+    for row in (
+        entries.values("store_id", "product_variant_id")
+        .annotate(delta=signed_quantity_sum())
+        .order_by()
+    ):
+        key = (row["store_id"], row["product_variant_id"])
+        quantities[key] = quantities.get(key, 0) + row["delta"]
+    return quantities
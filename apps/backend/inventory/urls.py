@@ -5,6 +5,7 @@ from .views import (
     SerialNumberViewSet,
     StockEntryViewSet,
     StockLedgerViewSet,
+    ValuationViewSet,
 )
 
 router = DefaultRouter()
@@ -13,5 +14,6 @@ router.register(r'stock-entries', StockEntryViewSet, basename='stock-entry')
 router.register(r'serials', SerialNumberViewSet, basename='serial')
 router.register(r'price-logs', PriceLogViewSet, basename='price-log')
 router.register(r'inventory-config', InventoryConfigViewSet, basename='inventory-config')
+router.register(r'valuation', ValuationViewSet, basename='valuation')
 
 urlpatterns = router.urls
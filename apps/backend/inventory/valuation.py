@@ -0,0 +1,312 @@
+"""Streaming inventory valuation: weighted average cost and FIFO.
+
+:func:`run_valuation` walks the stock entries recorded since its previous run
+in ``(store, variant, date)`` order and folds them into the persisted
+:class:`~inventory.models.ValuationState` of each key:
+
+- Receipts (purchase, return in, transfer in) add stock at the entry's
+  ``unit_price``. They raise the weighted-average value and append a FIFO
+  layer.
+- Issues (sale, return out, transfer out) remove stock. They are costed at
+  the current average and by consuming the oldest FIFO layers, and the cost
+  is booked as COGS of the entry's month.
+- Issuing more than is on hand costs the shortfall at the last known unit
+  cost. The next receipt settles that deficit first.
+
+Every month a key had entries in gets a
+:class:`~inventory.models.MonthlyValuation` row. :func:`monthly_report` then
+reads those rows instead of replaying history.
+
+Entries and states are streamed side by side in key order, as a merge join,
+so memory holds one key's state plus one batch of pending writes, however
+many entries a run covers. A run is a single transaction, and the next one
+continues after the highest entry id it processed. A run stops at the highest
+id dated more than :data:`SETTLE_DELAY` ago, so that transactions still in
+flight when the run starts cannot be skipped; lower ids are processed whatever
+their date.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+
+from .ledger import INBOUND_TYPES
+from .models import MonthlyValuation, StockEntry, ValuationState
+from .snapshots import latest_per_key
+
+ZERO = Decimal("0")
+PLACES = Decimal("0.0001")
+SETTLE_DELAY = timedelta(minutes=5)
+
+STATE_FIELDS = [
+    "quantity",
+    "wavg_value",
+    "fifo_value",
+    "fifo_layers",
+    "last_cost",
+    "last_entry_id",
+    "month",
+    "month_sold",
+    "month_cogs_wavg",
+    "month_cogs_fifo",
+]
+MONTHLY_FIELDS = [
+    "quantity",
+    "value_wavg",
+    "value_fifo",
+    "sold_quantity",
+    "cogs_wavg",
+    "cogs_fifo",
+]
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(PLACES)
+
+
+def month_of(moment) -> date:
+    return timezone.localdate(moment).replace(day=1)
+
+
+def _receive(state: ValuationState, quantity: int, cost: Decimal) -> None:
+    deficit = max(-state.quantity, 0)
+    settled = min(deficit, quantity)
+    if settled:
+        # The deficit was already costed when it was issued; settle it at
+        # that cost so both values return to zero with the quantity.
+        remaining = state.quantity + settled
+        state.wavg_value = _money(state.wavg_value * remaining / state.quantity)
+        state.fifo_value = _money(state.fifo_value * remaining / state.quantity)
+    added = quantity - settled
+    if added:
+        state.wavg_value += _money(added * cost)
+        state.fifo_value += _money(added * cost)
+        state.fifo_layers.append([added, str(cost)])
+    state.quantity += quantity
+    state.last_cost = cost
+
+
+def _issue(state: ValuationState, quantity: int) -> None:
+    on_hand = max(state.quantity, 0)
+    from_stock = min(quantity, on_hand)
+    shortfall = quantity - from_stock
+
+    if from_stock == on_hand:
+        cogs_wavg = state.wavg_value if from_stock else ZERO
+    else:
+        cogs_wavg = _money(state.wavg_value * from_stock / on_hand)
+
+    cogs_fifo = ZERO
+    needed = from_stock
+    while needed:
+        layer_quantity, layer_cost = state.fifo_layers[0]
+        taken = min(needed, layer_quantity)
+        cogs_fifo += _money(taken * Decimal(layer_cost))
+        if taken == layer_quantity:
+            state.fifo_layers.pop(0)
+        else:
+            state.fifo_layers[0] = [layer_quantity - taken, layer_cost]
+        needed -= taken
+
+    shortfall_cost = _money(shortfall * state.last_cost)
+    cogs_wavg += shortfall_cost
+    cogs_fifo += shortfall_cost
+    state.quantity -= quantity
+    state.wavg_value -= cogs_wavg
+    state.fifo_value -= cogs_fifo
+    state.month_sold += quantity
+    state.month_cogs_wavg += cogs_wavg
+    state.month_cogs_fifo += cogs_fifo
+
+
+def apply_entry(state: ValuationState, entry_type: str, quantity: int, cost) -> None:
+    """Fold one entry into ``state`` (its month must already be current)."""
+
+    if entry_type in INBOUND_TYPES:
+        _receive(state, quantity, Decimal(cost))
+    else:
+        _issue(state, quantity)
+
+
+def _new_state(store_id: int, variant_id: int) -> ValuationState:
+    return ValuationState(
+        store_id=store_id,
+        product_variant_id=variant_id,
+        wavg_value=ZERO,
+        fifo_value=ZERO,
+        last_cost=ZERO,
+        month_cogs_wavg=ZERO,
+        month_cogs_fifo=ZERO,
+    )
+
+
+def _monthly(state: ValuationState) -> MonthlyValuation:
+    return MonthlyValuation(
+        store_id=state.store_id,
+        product_variant_id=state.product_variant_id,
+        month=state.month,
+        quantity=state.quantity,
+        value_wavg=state.wavg_value,
+        value_fifo=state.fifo_value,
+        sold_quantity=state.month_sold,
+        cogs_wavg=state.month_cogs_wavg,
+        cogs_fifo=state.month_cogs_fifo,
+    )
+
+
+class _Writer:
+    """Buffers state and monthly rows and upserts them in batches."""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.states: List[ValuationState] = []
+        self.monthly: List[MonthlyValuation] = []
+
+    def add(self, state: ValuationState) -> None:
+        self.states.append(state)
+        self.monthly.append(_monthly(state))
+        if len(self.states) >= self.batch_size:
+            self.flush()
+
+    def close_month(self, state: ValuationState) -> None:
+        self.monthly.append(_monthly(state))
+
+    def flush(self) -> None:
+        ValuationState.objects.bulk_create(
+            self.states,
+            update_conflicts=True,
+            unique_fields=["store", "product_variant"],
+            update_fields=STATE_FIELDS,
+        )
+        MonthlyValuation.objects.bulk_create(
+            self.monthly,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=["store", "product_variant", "month"],
+            update_fields=MONTHLY_FIELDS,
+        )
+        self.states, self.monthly = [], []
+
+
+def _pending_entries(after_id: int, until):
+    # The run's bound is an id, not a date: an entry with a lower id dated at
+    # or after ``until`` is processed with the rest, since the next run starts
+    # above the highest id processed here and would skip it for good.
+    high = StockEntry.objects.filter(id__gt=after_id, date__lt=until).aggregate(
+        high=Max("id")
+    )["high"]
+    if high is None:
+        return StockEntry.objects.none()
+    return StockEntry.objects.filter(id__gt=after_id, id__lte=high)
+
+
+def run_valuation(until=None, batch_size: int = 1000) -> Dict[str, int]:
+    """Fold every entry recorded since the previous run into the valuation.
+
+    Args:
+        until: Entries up to the highest id dated before this are processed;
+            defaults to :data:`SETTLE_DELAY` ago.
+        batch_size: Rows fetched and written per round trip.
+
+    Returns:
+        Dict[str, int]: ``entries`` processed and ``keys`` touched.
+    """
+
+    until = until or timezone.now() - SETTLE_DELAY
+    processed = keys = 0
+    with transaction.atomic():
+        after_id = (
+            ValuationState.objects.aggregate(last=Max("last_entry_id"))["last"] or 0
+        )
+        pending = _pending_entries(after_id, until)
+        entries = (
+            pending.order_by("store_id", "product_variant_id", "date", "id")
+            .values_list(
+                "id",
+                "store_id",
+                "product_variant_id",
+                "entry_type",
+                "quantity",
+                "unit_price",
+                "date",
+            )
+            .iterator(chunk_size=batch_size)
+        )
+        states = (
+            ValuationState.objects.filter(
+                Exists(
+                    pending.filter(
+                        store_id=OuterRef("store_id"),
+                        product_variant_id=OuterRef("product_variant_id"),
+                    )
+                )
+            )
+            .order_by("store_id", "product_variant_id")
+            .iterator(chunk_size=batch_size)
+        )
+        stored = next(states, None)
+        writer = _Writer(batch_size)
+        state = None
+        for entry_id, store_id, variant_id, entry_type, quantity, cost, when in entries:
+            key = (store_id, variant_id)
+            if state is None or (state.store_id, state.product_variant_id) != key:
+                if state is not None:
+                    writer.add(state)
+                while (
+                    stored is not None
+                    and (stored.store_id, stored.product_variant_id) < key
+                ):
+                    stored = next(states, None)
+                if (
+                    stored is not None
+                    and (stored.store_id, stored.product_variant_id) == key
+                ):
+                    state = stored
+                else:
+                    state = _new_state(store_id, variant_id)
+                keys += 1
+            month = month_of(when)
+            if state.month != month:
+                if state.month is not None:
+                    writer.close_month(state)
+                state.month = month
+                state.month_sold = 0
+                state.month_cogs_wavg = state.month_cogs_fifo = ZERO
+            apply_entry(state, entry_type, quantity, cost)
+            # Entries come in date order; the watermark is the highest id.
+            state.last_entry_id = max(state.last_entry_id, entry_id)
+            processed += 1
+        if state is not None:
+            writer.add(state)
+        writer.flush()
+    return {"entries": processed, "keys": keys}
+
+
+def monthly_report(month: date, store=None) -> dict:
+    """Closing stock value and COGS of every key for ``month``.
+
+    Keys without entries in ``month`` carry their latest earlier position
+    forward with zero COGS.
+    """
+
+    month = month.replace(day=1)
+    rows = MonthlyValuation.objects.filter(month__lte=month)
+    if store is not None:
+        rows = rows.filter(store=store)
+    fields = ["month"] + MONTHLY_FIELDS
+    report = []
+    totals = dict.fromkeys(MONTHLY_FIELDS, 0)
+    for (store_id, variant_id), values in sorted(
+        latest_per_key(rows, "month", *fields).items()
+    ):
+        row = dict(zip(fields, values))
+        if row.pop("month") != month:
+            row.update(sold_quantity=0, cogs_wavg=ZERO, cogs_fifo=ZERO)
+        for field in MONTHLY_FIELDS:
+            totals[field] += row[field]
+        report.append({"store": store_id, "product_variant": variant_id, **row})
+    return {"month": month, "rows": report, "totals": totals}
@@ -1,6 +1,9 @@
 from django.db.models import Sum
-from rest_framework import permissions, viewsets
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from store.permissions import IsSystemAdminOrReadOnly
@@ -19,6 +22,8 @@ from .serializers import (
     StockEntrySerializer,
     StockLedgerSerializer,
 )
+from .snapshots import day_end, stock_as_of
+from .valuation import monthly_report
 
 
 class InventoryConfigViewSet(viewsets.ModelViewSet):
@@ -34,16 +39,78 @@ class StockLedgerViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['get'])
     def rollup(self, request):
+        if 'at' in request.query_params:
+            totals = {}
+            for (_, variant_id), quantity in stock_as_of(_parse_at(request)).items():
+                totals[variant_id] = totals.get(variant_id, 0) + quantity
+            return Response(
+                [
+                    {'product_variant': variant_id, 'quantity': quantity}
+                    for variant_id, quantity in sorted(totals.items())
+                ]
+            )
         data = (
             StockLedger.objects.values('product_variant').annotate(quantity=Sum('quantity'))
         )
         return Response(list(data))
 
+    @action(detail=False, methods=['get'], url_path='as-of')
+    def as_of(self, request):
+        """Stock per store and variant at ``?at=`` (a date means end of day).
+
+        Optional ``store`` and ``product_variant`` narrow the result. Starts
+        from the nearest daily snapshot and replays only later entries.
+        """
+        moment = _parse_at(request)
+        params = request.query_params
+        quantities = stock_as_of(
+            moment, store=params.get('store'), variant=params.get('product_variant')
+        )
+        return Response(
+            [
+                {
+                    'store': store_id,
+                    'product_variant': variant_id,
+                    'quantity': quantity,
+                    'as_of': moment,
+                }
+                for (store_id, variant_id), quantity in sorted(quantities.items())
+            ]
+        )
+
+
+def _parse_at(request):
+    """Read ``?at=`` as an aware datetime; a bare date means its end of day."""
+    value = request.query_params.get('at', '')
+    day = parse_date(value)
+    if day is not None:
+        return day_end(day)
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValidationError({'at': 'Expected a date or datetime.'})
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
 
 class StockEntryViewSet(viewsets.ModelViewSet):
     queryset = StockEntry.objects.all()
     serializer_class = StockEntrySerializer
     permission_classes = [permissions.IsAuthenticated, IsSystemAdminOrReadOnly]
+    bulk_max_entries = 1000
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create a list of entries (goods receipt, stock take) atomically."""
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.bulk_max_entries,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
 class SerialNumberViewSet(viewsets.ModelViewSet):
@@ -56,3 +123,16 @@ class PriceLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = PriceLog.objects.select_related('product_variant')
     serializer_class = PriceLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+
+class ValuationViewSet(viewsets.ViewSet):
+    """Month-end stock valuation and COGS from the ``run_valuation`` state."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request):
+        value = request.query_params.get('month', '')
+        month = parse_date(f"{value}-01")
+        if month is None:
+            raise ValidationError({'month': 'Expected YYYY-MM.'})
+        return Response(monthly_report(month, store=request.query_params.get('store')))
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from invoicing.models import InvoiceSequence
+from invoicing.sequences import next_invoice_number, reset_blocks
+
+
+class Command(BaseCommand):
+    """Measure invoice number allocation throughput under concurrent writers.
+
+    Each writer thread allocates numbers from a throwaway series, one
+    transaction per "invoice", for every combination of writer count and
+    block size. Run it against the production database engine; SQLite
+    serializes all writers and is only useful as a smoke test::
+
+        python manage.py bench_invoice_numbers --writers=1,4,16 --block-sizes=1,50
+    """
+
+    help = "Benchmark invoice number allocation (invoices/sec) for N concurrent writers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--writers",
+            default="1,4,8",
+            help="Comma separated writer thread counts (default 1,4,8)",
+        )
+        parser.add_argument(
+            "--block-sizes",
+            dest="block_sizes",
+            default="1,50",
+            help="Comma separated block sizes; 1 is the gapless mode (default 1,50)",
+        )
+        parser.add_argument(
+            "--invoices",
+            type=int,
+            default=200,
+            help="Invoices allocated per writer (default 200)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            writer_counts = [int(w) for w in options["writers"].split(",")]
+            block_sizes = [int(b) for b in options["block_sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--writers and --block-sizes take integers")
+        per_writer = options["invoices"]
+
+        self.stdout.write(f"backend={connection.vendor} invoices/writer={per_writer}")
+        for block_size in block_sizes:
+            for writers in writer_counts:
+                series = f"BENCH-{block_size}-{writers}-{int(time.time())}"
+                rate, numbers = self._run(series, writers, per_writer, block_size)
+                InvoiceSequence.objects.filter(series=series).delete()
+                if len(set(numbers)) != len(numbers):
+                    raise CommandError(f"duplicate numbers allocated in {series}")
+                self.stdout.write(
+                    f"block_size={block_size:<4} writers={writers:<3} "
+                    f"invoices={len(numbers):<6} invoices/sec={rate:,.0f}"
+                )
+        reset_blocks()
+
+    @staticmethod
+    def _run(series, writers, per_writer, block_size):
+        numbers = []
+        errors = []
+        barrier = threading.Barrier(writers)
+
+        def writer():
+            allocated = []
+            try:
+                barrier.wait()
+                for _ in range(per_writer):
+                    with transaction.atomic():
+                        allocated.append(next_invoice_number(series, block_size))
+            except Exception as exc:  # surfaced after the threads join
+                errors.append(exc)
+            finally:
+                numbers.extend(allocated)
+                connection.close()
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if errors:
+            raise CommandError(f"writer failed: {errors[0]}")
+        return len(numbers) / elapsed, numbers
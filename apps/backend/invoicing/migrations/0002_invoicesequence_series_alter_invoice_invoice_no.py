@@ -0,0 +1,44 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:29
+
+from django.db import migrations, models
+
+
+def seed_sale_series(apps, schema_editor):
+    """Continue FT-SALE numbering from the highest existing sale invoice."""
+
+    SaleInvoice = apps.get_model("sales", "SaleInvoice")
+    InvoiceSequence = apps.get_model("invoicing", "InvoiceSequence")
+    current = 0
+    for invoice_no in SaleInvoice.objects.filter(
+        invoice_no__startswith="FT-SALE-"
+    ).values_list("invoice_no", flat=True):
+        try:
+            current = max(current, int(invoice_no.rsplit("-", 1)[-1]))
+        except ValueError:
+            continue
+    if current:
+        InvoiceSequence.objects.update_or_create(
+            series="FT-SALE", defaults={"current": current}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoicing", "0001_initial"),
+        ("sales", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoicesequence",
+            name="series",
+            field=models.CharField(default="FT-INV", max_length=50, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="invoice",
+            name="invoice_no",
+            field=models.CharField(blank=True, max_length=32, unique=True),
+        ),
+        migrations.RunPython(seed_sale_series, migrations.RunPython.noop),
+    ]
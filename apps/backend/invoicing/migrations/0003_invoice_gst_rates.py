@@ -0,0 +1,47 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:19
+
+from decimal import Decimal
+
+from django.db import migrations, models
+
+RATE_FIELDS = ("cgst", "sgst", "igst")
+
+
+def backfill_rates(apps, schema_editor):
+    """Best-effort rates for existing invoices, recovered from their amounts."""
+
+    Invoice = apps.get_model("invoicing", "Invoice")
+    invoices = list(Invoice.objects.exclude(subtotal=0))
+    for invoice in invoices:
+        for field in RATE_FIELDS:
+            rate = getattr(invoice, field) * 100 / invoice.subtotal
+            setattr(invoice, f"{field}_rate", rate.quantize(Decimal("0.01")))
+    Invoice.objects.bulk_update(
+        invoices, [f"{field}_rate" for field in RATE_FIELDS], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("invoicing", "0002_invoicesequence_series_alter_invoice_invoice_no"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoice",
+            name="cgst_rate",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5),
+        ),
+        migrations.AddField(
+            model_name="invoice",
+            name="igst_rate",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5),
+        ),
+        migrations.AddField(
+            model_name="invoice",
+            name="sgst_rate",
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5),
+        ),
+        migrations.RunPython(backfill_rates, migrations.RunPython.noop),
+    ]
@@ -1,21 +1,28 @@
-from decimal import Decimal
 from django.conf import settings
-from django.db import models, transaction
+from django.db import models
 from django.utils import timezone
 
+from .sequences import allocate_invoice_no
+from .utils import line_amount
+
 
 class InvoiceSequence(models.Model):
-    """Stores last used invoice number for global sequencing."""
+    """Stores the last used number of each invoice series.
+
+    Allocation logic lives in :mod:`invoicing.sequences`.
+    """
 
+    series = models.CharField(max_length=50, unique=True, default="FT-INV")
     current = models.PositiveIntegerField(default=0)
 
+    def __str__(self):
+        return f"{self.series}: {self.current}"
+
     @classmethod
-    def next(cls) -> int:
-        with transaction.atomic():
-            obj, _ = cls.objects.select_for_update().get_or_create(pk=1)
-            obj.current += 1
-            obj.save(update_fields=["current"])
-            return obj.current
+    def next(cls, series: str = "FT-INV") -> int:
+        from .sequences import next_invoice_number
+
+        return next_invoice_number(series)
 
 
 class Invoice(models.Model):
@@ -28,11 +35,15 @@ class Invoice(models.Model):
     booking = models.ForeignKey(
         "bookings.Booking", on_delete=models.CASCADE, related_name="invoices"
     )
-    invoice_no = models.CharField(max_length=20, unique=True, blank=True)
+    invoice_no = models.CharField(max_length=32, unique=True, blank=True)
     subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     cgst = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     sgst = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     igst = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # Percentages the tax amounts above were computed from.
+    cgst_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    sgst_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    igst_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     total = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     status = models.CharField(
         max_length=20, choices=STATUS_CHOICES, default="draft"
@@ -45,8 +56,9 @@ class Invoice(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.invoice_no:
-            next_no = InvoiceSequence.next()
-            self.invoice_no = f"FT-INV-{next_no:04d}"
+            self.invoice_no = allocate_invoice_no(
+                "FT-INV", store_id=self.booking.store_id
+            )
         if self.status == "issued" and not self.issued_at:
             self.issued_at = timezone.now()
         super().save(*args, **kwargs)
@@ -63,9 +75,7 @@ class InvoiceLineItem(models.Model):
     amount = models.DecimalField(max_digits=10, decimal_places=2)
 
     def save(self, *args, **kwargs):
-        self.amount = (Decimal(self.quantity) * Decimal(self.unit_price)).quantize(
-            Decimal("0.01")
-        )
+        self.amount = line_amount(self.quantity, self.unit_price)
         super().save(*args, **kwargs)
 
 
@@ -0,0 +1,178 @@
+"""Invoice number allocation shared by ``invoicing`` and ``sales``.
+
+Numbers are drawn from named series stored in :class:`InvoiceSequence`. A
+series is a prefix such as ``FT-INV`` optionally scoped to a store and an
+Indian financial year (``FT-INV-3-2526``) when
+``INVOICE_SERIES_PER_STORE_FY`` is enabled, so concurrent sales in different
+stores never wait on the same lock.
+
+Two allocation modes are available:
+
+- ``INVOICE_NUMBER_BLOCK_SIZE = 1`` (default) is gapless. The series row is
+  incremented with ``UPDATE ... SET current = current + 1`` inside the
+  caller's transaction, so a rolled back invoice also rolls back its number.
+- A larger block size trades gaplessness for throughput. Each process reserves
+  ``block_size`` numbers at a time and hands them out from memory. PostgreSQL
+  reserves them from a native sequence, which is never rolled back. Each
+  block first raises the sequence to the row counter, and gapless allocation
+  continues past the sequence's last value, so switching modes never reissues
+  a number. On other
+  backends the series row is bumped in its own transaction; inside an open
+  ``atomic`` block that reservation could be rolled back under us, so those
+  calls fall back to gapless single allocation. Numbers left in a block when a
+  process exits are never issued.
+"""
+
+import hashlib
+import threading
+from collections import deque
+from datetime import date
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F, PositiveIntegerField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+_blocks: Dict[Tuple[str, str], Deque[int]] = {}
+_lock = threading.Lock()
+
+
+def financial_year(day: Optional[date] = None) -> str:
+    """Return the April–March financial year of ``day`` as ``"2526"``."""
+
+    day = day or timezone.localdate()
+    start = day.year if day.month >= 4 else day.year - 1
+    return f"{start % 100:02d}{(start + 1) % 100:02d}"
+
+
+def series_key(
+    prefix: str, store_id: Optional[int] = None, day: Optional[date] = None
+) -> str:
+    """Return the series name for ``prefix`` honouring the configured scope."""
+
+    if not getattr(settings, "INVOICE_SERIES_PER_STORE_FY", False):
+        return prefix
+    parts = [prefix]
+    if store_id is not None:
+        parts.append(str(store_id))
+    parts.append(financial_year(day))
+    return "-".join(parts)
+
+
+def format_invoice_no(series: str, number: int) -> str:
+    return f"{series}-{number:04d}"
+
+
+def _reserve_row(series: str, count: int, using: str) -> Iterable[int]:
+    from .models import InvoiceSequence
+
+    sequences = InvoiceSequence.objects.using(using).filter(series=series)
+    current = F("current")
+    if connections[using].vendor == "postgresql":
+        # Block mode may have handed out numbers from the native sequence past
+        # the row counter; skip them so switching back never reissues one.
+        current = Greatest(
+            current,
+            RawSQL(
+                _SEQUENCE_LAST_VALUE,
+                [_sequence_name(series)],
+                output_field=PositiveIntegerField(),
+            ),
+        )
+    with transaction.atomic(using=using):
+        # UPDATE takes the row (or, on SQLite, the database) write lock before
+        # reading, so concurrent writers serialize instead of racing.
+        if not sequences.update(current=current + count):
+            InvoiceSequence.objects.using(using).get_or_create(series=series)
+            sequences.update(current=current + count)
+        current = sequences.values_list("current", flat=True).get()
+    return range(current - count + 1, current + 1)
+
+
+# NULL (ignored by GREATEST) until block mode has used the series' sequence.
+_SEQUENCE_LAST_VALUE = """
+    SELECT last_value FROM pg_sequences
+    WHERE schemaname = current_schema() AND sequencename = %s
+"""
+
+
+def _sequence_name(series: str) -> str:
+    return "invoice_seq_" + hashlib.md5(series.encode()).hexdigest()[:16]
+
+
+def _reserve_sequence(series: str, count: int, using: str) -> Iterable[int]:
+    from .models import InvoiceSequence
+
+    name = _sequence_name(series)
+    connection = connections[using]
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        # The gapless path may have moved the row counter past the sequence
+        # since the last block. Holding the row lock, bring the sequence up to
+        # the counter before drawing; the gapless path in turn skips past the
+        # sequence (see _reserve_row), so neither mode reissues a number.
+        InvoiceSequence.objects.using(using).get_or_create(series=series)
+        current = (
+            InvoiceSequence.objects.using(using)
+            .select_for_update()
+            .values_list("current", flat=True)
+            .get(series=series)
+        )
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {name}")
+        cursor.execute(_SEQUENCE_LAST_VALUE, [name])
+        last_value = cursor.fetchone()[0] or 0
+        if current > last_value:
+            cursor.execute("SELECT setval(%s, %s)", [name, current])
+        cursor.execute(f"SELECT nextval('{name}') FROM generate_series(1, %s)", [count])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def next_invoice_number(
+    series: str, block_size: Optional[int] = None, using: str = DEFAULT_DB_ALIAS
+) -> int:
+    """Allocate the next number in ``series``.
+
+    Args:
+        series: Series name, usually from :func:`series_key`.
+        block_size: Numbers reserved per round trip. Defaults to
+            ``INVOICE_NUMBER_BLOCK_SIZE``; ``1`` keeps the series gapless.
+        using: Database alias.
+
+    Returns:
+        int: The allocated number.
+    """
+
+    if block_size is None:
+        block_size = getattr(settings, "INVOICE_NUMBER_BLOCK_SIZE", 1)
+    if block_size <= 1:
+        return _reserve_row(series, 1, using)[0]
+
+    connection = connections[using]
+    with _lock:
+        block = _blocks.setdefault((using, series), deque())
+        if not block:
+            if connection.vendor == "postgresql":
+                block.extend(_reserve_sequence(series, block_size, using))
+            elif connection.in_atomic_block:
+                return _reserve_row(series, 1, using)[0]
+            else:
+                block.extend(_reserve_row(series, block_size, using))
+        return block.popleft()
+
+
+def allocate_invoice_no(
+    prefix: str, store_id: Optional[int] = None, day: Optional[date] = None
+) -> str:
+    """Allocate and format the next invoice number for ``prefix``."""
+
+    series = series_key(prefix, store_id=store_id, day=day)
+    return format_invoice_no(series, next_invoice_number(series))
+
+
+def reset_blocks() -> None:
+    """Forget numbers reserved in memory by this process."""
+
+    with _lock:
+        _blocks.clear()
@@ -1,9 +1,16 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import Invoice, InvoiceLineItem, PaymentRecord
-from .utils import compute_gst, validate_hsn
+from .utils import compute_gst, price_line_items, sync_line_items, validate_hsn
+
+LINE_ITEM_FIELDS = ["description", "hsn_code", "quantity", "unit_price"]
+GST_FIELDS = ("cgst", "sgst", "igst")
 
 
 class InvoiceLineItemSerializer(serializers.ModelSerializer):
+    # Writable so updates can refer to existing lines.
+    id = serializers.IntegerField(required=False)
+
     class Meta:
         model = InvoiceLineItem
         fields = ["id", "description", "hsn_code", "quantity", "unit_price", "amount"]
@@ -28,22 +35,33 @@ class InvoiceSerializer(serializers.ModelSerializer):
             "cgst",
             "sgst",
             "igst",
+            "cgst_rate",
+            "sgst_rate",
+            "igst_rate",
             "total",
             "status",
             "issued_at",
             "created_by",
             "line_items",
         ]
-        read_only_fields = ["invoice_no", "issued_at", "created_by"]
+        read_only_fields = [
+            "invoice_no",
+            "cgst_rate",
+            "sgst_rate",
+            "igst_rate",
+            "issued_at",
+            "created_by",
+        ]
 
     def create(self, validated_data):
         items_data = validated_data.pop("line_items", [])
+        for item in items_data:
+            item.pop("id", None)
         user = self.context["request"].user
-        subtotal = sum(
-            item["quantity"] * item["unit_price"] for item in items_data
-        )
+        subtotal = price_line_items(items_data)
+        rates = {field: validated_data.get(field, 0) for field in GST_FIELDS}
         cgst, sgst, igst, total = compute_gst(
-            subtotal, validated_data.get("cgst", 0), validated_data.get("sgst", 0), validated_data.get("igst", 0)
+            subtotal, rates["cgst"], rates["sgst"], rates["igst"]
         )
         validated_data.update(
             {
@@ -53,13 +71,53 @@ class InvoiceSerializer(serializers.ModelSerializer):
                 "igst": igst,
                 "total": total,
                 "created_by": user,
+                **{f"{field}_rate": rate for field, rate in rates.items()},
             }
         )
-        invoice = Invoice.objects.create(**validated_data)
-        for item in items_data:
-            InvoiceLineItem.objects.create(invoice=invoice, **item)
+        with transaction.atomic():
+            invoice = Invoice.objects.create(**validated_data)
+            InvoiceLineItem.objects.bulk_create(
+                [InvoiceLineItem(invoice=invoice, **item) for item in items_data]
+            )
         return invoice
 
+    def update(self, instance, validated_data):
+        """Update the invoice, diffing ``line_items`` against stored lines.
+
+        ``cgst``/``sgst``/``igst`` are rates on input, like :meth:`create`.
+        Omitted rates keep the invoice's stored rate.
+        """
+        items_data = validated_data.pop("line_items", None)
+        rates = {
+            field: validated_data.pop(field, getattr(instance, f"{field}_rate"))
+            for field in GST_FIELDS
+        }
+        with transaction.atomic():
+            if items_data is not None:
+                subtotal = price_line_items(items_data)
+                try:
+                    sync_line_items(
+                        instance, InvoiceLineItem, items_data, LINE_ITEM_FIELDS
+                    )
+                except ValueError as exc:
+                    raise serializers.ValidationError({"line_items": [str(exc)]})
+            else:
+                subtotal = instance.subtotal
+            cgst, sgst, igst, total = compute_gst(
+                subtotal, rates["cgst"], rates["sgst"], rates["igst"]
+            )
+            validated_data.update(
+                {
+                    "subtotal": subtotal,
+                    "cgst": cgst,
+                    "sgst": sgst,
+                    "igst": igst,
+                    "total": total,
+                    **{f"{field}_rate": rate for field, rate in rates.items()},
+                }
+            )
+            return super().update(instance, validated_data)
+
 
 class PaymentRecordSerializer(serializers.ModelSerializer):
     class Meta:
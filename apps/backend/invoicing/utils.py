@@ -1,5 +1,7 @@
 from decimal import Decimal
 
+CENT = Decimal("0.01")
+
 
 def compute_gst(subtotal: Decimal, cgst_rate=0, sgst_rate=0, igst_rate=0):
     subtotal = Decimal(subtotal)
@@ -8,13 +10,61 @@ def compute_gst(subtotal: Decimal, cgst_rate=0, sgst_rate=0, igst_rate=0):
     igst = subtotal * Decimal(igst_rate) / Decimal(100)
     total = subtotal + cgst + sgst + igst
     return (
-        cgst.quantize(Decimal("0.01")),
-        sgst.quantize(Decimal("0.01")),
-        igst.quantize(Decimal("0.01")),
-        total.quantize(Decimal("0.01")),
+        cgst.quantize(CENT),
+        sgst.quantize(CENT),
+        igst.quantize(CENT),
+        total.quantize(CENT),
     )
 
 
+def line_amount(quantity, unit_price) -> Decimal:
+    return (Decimal(quantity) * Decimal(unit_price)).quantize(CENT)
+
+
+def price_line_items(items_data) -> Decimal:
+    """Set ``amount`` on each validated line item dict and return the subtotal."""
+    subtotal = Decimal(0)
+    for item in items_data:
+        item["amount"] = line_amount(item.get("quantity", 1), item.get("unit_price", 0))
+        subtotal += item["amount"]
+    return subtotal
+
+
+def sync_line_items(invoice, line_model, items_data, fields):
+    """Make ``invoice.line_items`` match ``items_data`` with bulk writes.
+
+    Items carrying the ``id`` of an existing line update it in place, items
+    without one are inserted and lines missing from ``items_data`` are
+    deleted. Unchanged lines are not written. ``amount`` must already be set
+    on every item (see :func:`price_line_items`).
+
+    Raises:
+        ValueError: If an item references a line of another invoice.
+    """
+    existing = {line.pk: line for line in invoice.line_items.all()}
+    to_create, to_update = [], []
+    for item in items_data:
+        item = dict(item)
+        pk = item.pop("id", None)
+        if pk is None:
+            to_create.append(line_model(invoice=invoice, **item))
+            continue
+        line = existing.pop(pk, None)
+        if line is None:
+            raise ValueError(f"Line item {pk} does not belong to this invoice")
+        if any(getattr(line, field) != value for field, value in item.items()):
+            for field, value in item.items():
+                setattr(line, field, value)
+            to_update.append(line)
+
+    if existing:
+        line_model.objects.filter(pk__in=list(existing)).delete()
+    if to_update:
+        line_model.objects.bulk_update(to_update, fields + ["amount"])
+    if to_create:
+        line_model.objects.bulk_create(to_create)
+
+
 def validate_hsn(code: str) -> bool:
     """Basic placeholder validation for HSN codes."""
     return code.isdigit() and len(code) in (4, 6, 8)
@@ -8,7 +8,7 @@ from .serializers import InvoiceSerializer, PaymentRecordSerializer
 
 
 class InvoiceViewSet(viewsets.ModelViewSet):
-    queryset = Invoice.objects.all().order_by("-created_at")
+    queryset = Invoice.objects.prefetch_related("line_items").order_by("-created_at")
     serializer_class = InvoiceSerializer
     permission_classes = [permissions.IsAuthenticated, IsSystemAdminOrReadOnly]
 
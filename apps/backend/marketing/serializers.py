@@ -1,6 +1,5 @@
 from rest_framework import serializers
-from django.conf import settings
-import requests
+from utils.captcha import verify_captcha
 from .models import Brand, Contact, ScheduleCall
 
 
@@ -18,12 +17,7 @@ class ContactSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "mobile_no", "message", "captcha_token"]
 
     def validate_captcha_token(self, value):
-        response = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data={"secret": settings.RECAPTCHA_SECRET_KEY, "response": value},
-            timeout=5,
-        )
-        if not response.json().get("success"):
+        if not verify_captcha(value):
             raise serializers.ValidationError("Invalid captcha")
         return value
 
@@ -40,12 +34,7 @@ class ScheduleCallSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "date", "time", "message", "captcha_token"]
 
     def validate_captcha_token(self, value):
-        response = requests.post(
-            "https://www.google.com/recaptcha/api/siteverify",
-            data={"secret": settings.RECAPTCHA_SECRET_KEY, "response": value},
-            timeout=5,
-        )
-        if not response.json().get("success"):
+        if not verify_captcha(value):
             raise serializers.ValidationError("Invalid captcha")
         return value
 
@@ -1,18 +1,22 @@
 from rest_framework import generics, permissions, viewsets
-from rest_framework.throttling import ScopedRateThrottle
 
 from .models import Brand, Contact, ScheduleCall
 from .serializers import BrandSerializer, ContactSerializer, ScheduleCallSerializer
+from accounts.throttles import SlidingWindowScopedRateThrottle
 from store.permissions import IsSystemAdminOrReadOnly
+from catalog.cache import TAXONOMY_CACHE_NAMESPACE
+from utils.cache import CachedResponseMixin
 
 
-class BrandViewSet(viewsets.ModelViewSet):
+class BrandViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """CRUD endpoints for Brand.
 
     Non-admins get read-only access via
-    :class:`store.permissions.IsSystemAdminOrReadOnly`.
+    :class:`store.permissions.IsSystemAdminOrReadOnly`. Reads are cached in
+    the catalog taxonomy namespace.
     """
 
+    cache_namespace = TAXONOMY_CACHE_NAMESPACE
     queryset = Brand.objects.all()
     serializer_class = BrandSerializer
     permission_classes = [IsSystemAdminOrReadOnly]
@@ -30,7 +34,7 @@ class BrandViewSet(viewsets.ModelViewSet):
 class ContactCreateView(generics.CreateAPIView):
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowScopedRateThrottle]
     throttle_scope = "contact"
     permission_classes = [permissions.AllowAny]
 
@@ -38,6 +42,6 @@ class ContactCreateView(generics.CreateAPIView):
 class ScheduleCallCreateView(generics.CreateAPIView):
     queryset = ScheduleCall.objects.all()
     serializer_class = ScheduleCallSerializer
-    throttle_classes = [ScopedRateThrottle]
+    throttle_classes = [SlidingWindowScopedRateThrottle]
     throttle_scope = "schedule_call"
     permission_classes = [permissions.AllowAny]
@@ -11,6 +11,9 @@ print("📦 Running makemigrations + migrate...")
 call_command("makemigrations")
 call_command("migrate")
 
+print("🔎 Rebuilding search index...")
+call_command("rebuild_search_index")
+
 print("🧼 Running collectstatic...")
 call_command("collectstatic", interactive=False, verbosity=0)
 
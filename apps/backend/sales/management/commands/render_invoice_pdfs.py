@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sales.pdf import render_pending
+
+
+class Command(BaseCommand):
+    """Pre-render PDFs for issued and paid sale invoices.
+
+    Picks up every invoice whose cached PDF is missing or older than its last
+    change, so invoices moved to ``issued`` are rendered off the request path::
+
+        # Every minute from cron
+        * * * * * /path/to/venv/bin/python manage.py render_invoice_pdfs
+        # Long-running worker
+        python manage.py render_invoice_pdfs --loop --interval=10
+    """
+
+    help = "Render and cache PDFs for issued/paid sale invoices"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            dest="batch_size",
+            type=int,
+            default=50,
+            help="Invoices rendered per batch",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for invoices instead of exiting when done",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=10.0,
+            help="Seconds to sleep between polls when --loop is set",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        rendered = failed_total = 0
+        # Invoices that failed are skipped until the next poll
+        failed = set()
+        while True:
+            count, failed_ids = render_pending(limit=batch_size, skip=failed)
+            rendered += count
+            failed_total += len(failed_ids)
+            failed.update(failed_ids)
+            if count + len(failed_ids) == batch_size:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+            failed.clear()
+        self.stdout.write(
+            f"render_invoice_pdfs: rendered={rendered} failed={failed_total}"
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="saleinvoice",
+            name="invoice_no",
+            field=models.CharField(blank=True, max_length=32, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0002_alter_saleinvoice_invoice_no"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="saleinvoice",
+            name="pdf_version",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sales", "0003_saleinvoice_pdf_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HsnGstRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hsn_code", models.CharField(max_length=8, unique=True)),
+                ("gst_rate", models.DecimalField(decimal_places=2, max_digits=5)),
+                ("description", models.CharField(blank=True, max_length=200)),
+            ],
+            options={
+                "ordering": ["hsn_code"],
+            },
+        ),
+        migrations.AddField(
+            model_name="saleinvoice",
+            name="customer_email",
+            field=models.EmailField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name="saleinvoice",
+            name="customer_gst",
+            field=models.CharField(blank=True, max_length=15),
+        ),
+        migrations.AddField(
+            model_name="saleinvoice",
+            name="payment_method",
+            field=models.CharField(
+                choices=[("CASHSALE", "Cash Sale"), ("UPI", "UPI"), ("CARD", "Card")],
+                default="CASHSALE",
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name="saleinvoice",
+            name="payment_ref_number",
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
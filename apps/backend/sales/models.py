@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from invoicing.sequences import allocate_invoice_no
+from invoicing.utils import line_amount
 
 User = get_user_model()
 
@@ -18,7 +20,7 @@ class SaleInvoice(models.Model):
         ('paid', 'Paid'),
     ]
     
-    invoice_no = models.CharField(max_length=20, unique=True, blank=True)
+    invoice_no = models.CharField(max_length=32, unique=True, blank=True)
     invoice_type = models.CharField(max_length=20, choices=INVOICE_TYPE_CHOICES, default='retail_sale')
     
     # Customer details
@@ -45,6 +47,8 @@ class SaleInvoice(models.Model):
     issued_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # updated_at value the cached PDF was rendered for (see sales.pdf)
+    pdf_version = models.DateTimeField(blank=True, null=True, editable=False)
     
     class Meta:
         ordering = ['-created_at']
@@ -59,15 +63,7 @@ class SaleInvoice(models.Model):
     def save(self, *args, **kwargs):
         # Auto-generate invoice number if not set
         if not self.invoice_no:
-            last_invoice = SaleInvoice.objects.order_by('-id').first()
-            if last_invoice and last_invoice.invoice_no:
-                try:
-                    last_num = int(last_invoice.invoice_no.split('-')[-1])
-                    self.invoice_no = f"FT-SALE-{last_num + 1:04d}"
-                except (ValueError, IndexError):
-                    self.invoice_no = "FT-SALE-0001"
-            else:
-                self.invoice_no = "FT-SALE-0001"
+            self.invoice_no = allocate_invoice_no("FT-SALE")
         
         super().save(*args, **kwargs)
 
@@ -96,7 +92,7 @@ class SaleInvoiceLineItem(models.Model):
     
     def save(self, *args, **kwargs):
         # Auto-calculate amount
-        self.amount = self.quantity * self.unit_price
+        self.amount = line_amount(self.quantity, self.unit_price)
         super().save(*args, **kwargs)
 
 
@@ -0,0 +1,124 @@
+"""Rendering and caching of sale invoice PDFs.
+
+Issued and paid invoices are rendered once and stored under a content address
+derived from the invoice id and ``updated_at``, so any edit to an invoice
+produces a new key and a stale PDF is never served. ``pdf_version`` on the
+invoice records which ``updated_at`` the stored PDF was rendered for, letting
+the ``render_invoice_pdfs`` worker find invoices that still need rendering with
+a single query.
+"""
+
+import hashlib
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import F, Q
+from django.template.loader import render_to_string
+from xhtml2pdf import pisa
+
+from .models import SaleInvoice
+
+CACHEABLE_STATUSES = ('issued', 'paid')
+
+
+class PDFRenderError(Exception):
+    """Raised when xhtml2pdf fails to render an invoice"""
+
+
+def pdf_key(invoice):
+    """Content address of ``invoice``'s PDF for its current ``updated_at``"""
+    digest = hashlib.sha256(
+        f'{invoice.pk}:{invoice.updated_at.isoformat()}'.encode()
+    ).hexdigest()
+    return digest[:32]
+
+
+def pdf_etag(invoice):
+    return f'"{pdf_key(invoice)}"'
+
+
+def pdf_path(invoice):
+    prefix = getattr(settings, 'INVOICE_PDF_CACHE_PREFIX', 'invoice_pdfs')
+    return f'{prefix}/{invoice.pk}/{pdf_key(invoice)}.pdf'
+
+
+def is_cacheable(invoice):
+    return invoice.status in CACHEABLE_STATUSES
+
+
+def render_invoice_pdf(invoice):
+    """Render ``invoice`` to PDF bytes"""
+    html_string = render_to_string('sales/invoice_pdf.html', {
+        'invoice': invoice,
+        'line_items': invoice.line_items.all()
+    })
+    buffer = BytesIO()
+    pisa_status = pisa.CreatePDF(html_string, dest=buffer)
+    if pisa_status.err:
+        raise PDFRenderError(f'PDF generation failed for invoice {invoice.pk}')
+    return buffer.getvalue()
+
+
+def cached_pdf(invoice):
+    """Return the stored PDF bytes for ``invoice`` or ``None``"""
+    path = pdf_path(invoice)
+    if not default_storage.exists(path):
+        return None
+    with default_storage.open(path, 'rb') as fh:
+        return fh.read()
+
+
+def store_pdf(invoice, content):
+    """Store rendered ``content`` and mark ``invoice`` as rendered"""
+    path = pdf_path(invoice)
+    if not default_storage.exists(path):
+        default_storage.save(path, ContentFile(content))
+    # update() keeps updated_at (and therefore the key) unchanged
+    SaleInvoice.objects.filter(pk=invoice.pk, updated_at=invoice.updated_at).update(
+        pdf_version=invoice.updated_at
+    )
+    invoice.pdf_version = invoice.updated_at
+
+
+def get_invoice_pdf(invoice):
+    """Return PDF bytes, rendering and caching issued/paid invoices on a miss"""
+    if is_cacheable(invoice):
+        content = cached_pdf(invoice)
+        if content is not None:
+            return content
+    content = render_invoice_pdf(invoice)
+    if is_cacheable(invoice):
+        store_pdf(invoice, content)
+    return content
+
+
+def pending_render():
+    """Issued/paid invoices whose stored PDF is missing or stale"""
+    return SaleInvoice.objects.filter(status__in=CACHEABLE_STATUSES).filter(
+        Q(pdf_version__isnull=True) | ~Q(pdf_version=F('updated_at'))
+    )
+
+
+def render_pending(limit=50, skip=()):
+    """Render up to ``limit`` pending invoices, ignoring ids in ``skip``
+
+    Returns ``(rendered, failed_ids)``.
+    """
+    rendered = 0
+    failed_ids = []
+    invoices = (
+        pending_render()
+        .exclude(pk__in=skip)
+        .prefetch_related('line_items')
+        .order_by('updated_at')
+    )
+    for invoice in invoices[:limit]:
+        try:
+            store_pdf(invoice, render_invoice_pdf(invoice))
+        except PDFRenderError:
+            failed_ids.append(invoice.pk)
+            continue
+        rendered += 1
+    return rendered, failed_ids
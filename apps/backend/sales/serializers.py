@@ -1,11 +1,18 @@
+from django.db import transaction
 from rest_framework import serializers
 from .models import SaleInvoice, SaleInvoiceLineItem
 from catalog.models import Product
+from invoicing.utils import CENT, price_line_items, sync_line_items
+
+LINE_ITEM_FIELDS = ['description', 'hsn_code', 'quantity', 'unit_price']
 
 
 class SaleInvoiceLineItemSerializer(serializers.ModelSerializer):
     """Serializer for invoice line items"""
     
+    # Writable so updates can refer to existing lines
+    id = serializers.IntegerField(required=False)
+    
     class Meta:
         model = SaleInvoiceLineItem
         fields = ['id', 'description', 'hsn_code', 'quantity', 'unit_price', 'amount']
@@ -28,20 +35,47 @@ class SaleInvoiceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['invoice_no', 'created_by', 'created_at']
     
+    def _apply_totals(self, validated_data, subtotal, instance=None):
+        """Derive subtotal and total from the line amounts and tax amounts"""
+        taxes = [
+            validated_data.get(field, getattr(instance, field, 0))
+            for field in ('cgst', 'sgst', 'igst')
+        ]
+        validated_data['subtotal'] = subtotal
+        validated_data['total'] = (subtotal + sum(taxes)).quantize(CENT)
+    
     def create(self, validated_data):
         line_items_data = validated_data.pop('line_items')
+        for item_data in line_items_data:
+            item_data.pop('id', None)
+        self._apply_totals(validated_data, price_line_items(line_items_data))
         
         # Set created_by from request user
         validated_data['created_by'] = self.context['request'].user
         
-        # Create invoice
-        invoice = SaleInvoice.objects.create(**validated_data)
-        
-        # Create line items
-        for item_data in line_items_data:
-            SaleInvoiceLineItem.objects.create(invoice=invoice, **item_data)
+        with transaction.atomic():
+            # Create invoice and all line items in one INSERT
+            invoice = SaleInvoice.objects.create(**validated_data)
+            SaleInvoiceLineItem.objects.bulk_create(
+                [SaleInvoiceLineItem(invoice=invoice, **item_data) for item_data in line_items_data]
+            )
         
         return invoice
+    
+    def update(self, instance, validated_data):
+        line_items_data = validated_data.pop('line_items', None)
+        
+        with transaction.atomic():
+            if line_items_data is not None:
+                subtotal = price_line_items(line_items_data)
+                try:
+                    sync_line_items(instance, SaleInvoiceLineItem, line_items_data, LINE_ITEM_FIELDS)
+                except ValueError as exc:
+                    raise serializers.ValidationError({'line_items': [str(exc)]})
+            else:
+                subtotal = instance.subtotal
+            self._apply_totals(validated_data, subtotal, instance)
+            return super().update(instance, validated_data)
 
 
 class ProductSearchSerializer(serializers.ModelSerializer):
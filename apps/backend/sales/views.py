@@ -2,29 +2,44 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.http import FileResponse
-from io import BytesIO
-from xhtml2pdf import pisa
-from django.template.loader import render_to_string
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
 from django.utils import timezone
+from django.utils.http import parse_etags
+from datetime import datetime
+import tempfile
+import zipfile
 
 from .models import SaleInvoice
+from .pdf import (
+    CACHEABLE_STATUSES,
+    PDFRenderError,
+    cached_pdf,
+    get_invoice_pdf,
+    is_cacheable,
+    pdf_etag,
+)
 from .serializers import SaleInvoiceSerializer, ProductSearchSerializer
 from catalog.models import Product
+from search.backends import search_queryset
+
+
+# ZIP archives larger than this spill from memory to a temporary file
+PDF_BATCH_SPOOL_SIZE = 10 * 1024 * 1024
 
 
 class SaleInvoiceViewSet(viewsets.ModelViewSet):
     """ViewSet for creating and managing sale invoices"""
     
-    queryset = SaleInvoice.objects.all()
+    queryset = SaleInvoice.objects.prefetch_related('line_items')
     serializer_class = SaleInvoiceSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         # Filter by created_by for non-admin users
+        queryset = super().get_queryset()
         if self.request.user.is_staff or self.request.user.role in ['systemadmin', 'branchhead']:
-            return SaleInvoice.objects.all()
-        return SaleInvoice.objects.filter(created_by=self.request.user)
+            return queryset
+        return queryset.filter(created_by=self.request.user)
     
     def perform_create(self, serializer):
         # Auto-set issued_at when status is 'issued'
@@ -35,39 +50,99 @@ class SaleInvoiceViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'], url_path='pdf')
     def generate_pdf(self, request, pk=None):
-        """Generate and download PDF for invoice"""
+        """Download the invoice PDF
+
+        Issued and paid invoices are served from the PDF cache (rendered by
+        ``render_invoice_pdfs`` or on first download) with an ETag so clients
+        can revalidate with ``If-None-Match``. Drafts are rendered each time.
+        """
         invoice = self.get_object()
+        etag = pdf_etag(invoice) if is_cacheable(invoice) else None
+        if etag:
+            if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+            if etag in if_none_match or '*' in if_none_match:
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
         
-        # Render HTML template
-        html_string = render_to_string('sales/invoice_pdf.html', {
-            'invoice': invoice,
-            'line_items': invoice.line_items.all()
-        })
-        
-        # Create PDF
-        buffer = BytesIO()
-        pisa_status = pisa.CreatePDF(html_string, dest=buffer)
-        
-        if pisa_status.err:
+        try:
+            content = get_invoice_pdf(invoice)
+        except PDFRenderError:
             return Response(
                 {'error': 'PDF generation failed'}, 
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
         
-        buffer.seek(0)
+        response = HttpResponse(content, content_type='application/pdf')
+        response['Content-Disposition'] = (
+            f'attachment; filename="invoice_{invoice.invoice_no}.pdf"'
+        )
+        if etag:
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+        return response
+    
+    @action(detail=False, methods=['get'], url_path='pdf-batch')
+    def pdf_batch(self, request):
+        """Download a ZIP of cached PDFs for issued/paid invoices
+
+        Filter with ``?month=YYYY-MM`` (by ``issued_at``) and/or
+        ``?ids=1,2,3``. Nothing is rendered inline: invoices whose PDF has not
+        been rendered yet are listed in ``MISSING.txt`` inside the archive.
+        """
+        invoices = self.get_queryset().filter(status__in=CACHEABLE_STATUSES)
+        month = request.query_params.get('month')
+        ids = request.query_params.get('ids')
+        if not month and not ids:
+            return Response(
+                {'error': 'month or ids is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            if month:
+                start = datetime.strptime(month, '%Y-%m').date()
+                invoices = invoices.filter(
+                    issued_at__year=start.year, issued_at__month=start.month
+                )
+            if ids:
+                invoices = invoices.filter(pk__in=[int(i) for i in ids.split(',')])
+        except ValueError:
+            return Response(
+                {'error': 'month must be YYYY-MM and ids comma separated integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        archive = tempfile.SpooledTemporaryFile(max_size=PDF_BATCH_SPOOL_SIZE)
+        missing = []
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+            # Line items are not needed; dropping the prefetch lets rows stream
+            for invoice in (
+                invoices.prefetch_related(None).order_by('invoice_no').iterator()
+            ):
+                content = cached_pdf(invoice)
+                if content is None:
+                    missing.append(invoice.invoice_no)
+                    continue
+                zf.writestr(f'invoice_{invoice.invoice_no}.pdf', content)
+            if missing:
+                zf.writestr('MISSING.txt', '\n'.join(missing) + '\n')
+        archive.seek(0)
         
+        filename = f'invoices_{month or "selection"}.zip'
         return FileResponse(
-            buffer,
+            archive,
             as_attachment=True,
-            filename=f'invoice_{invoice.invoice_no}.pdf',
-            content_type='application/pdf'
+            filename=filename,
+            content_type='application/zip'
         )
 
 
 class ProductSearchViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet for searching products for invoice creation"""
     
-    queryset = Product.objects.filter(availability=True)
+    queryset = Product.objects.filter(availability=True).select_related(
+        'subcategory__category'
+    )
     serializer_class = ProductSearchSerializer
     permission_classes = [IsAuthenticated]
     
@@ -76,6 +151,6 @@ class ProductSearchViewSet(viewsets.ReadOnlyModelViewSet):
         search = self.request.query_params.get('search', None)
         
         if search:
-            queryset = queryset.filter(name__icontains=search)
+            queryset = search_queryset(queryset, 'product', search)
         
         return queryset[:10]  # Limit to 10 results
@@ -0,0 +1,180 @@
+"""Ranked lookups against the search documents.
+
+The query runs on whatever the default database offers:
+
+- PostgreSQL matches ``to_tsvector('simple', document)`` against a prefix
+  ``tsquery`` (so typeahead matches partial words) or a trigram-indexed
+  ``ILIKE`` on the raw input (so SKU and barcode fragments still match), and
+  ranks by ``ts_rank`` then trigram similarity. Both expressions are covered by
+  GIN indexes created in ``0001_initial``.
+- SQLite matches the FTS5 table ``search_fts`` kept in sync by triggers and
+  ranks by bm25.
+- Anything else falls back to unranked ``icontains`` on the document.
+"""
+
+import re
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, FloatField, IntegerField, When
+from django.db.models.expressions import RawSQL
+
+from .models import SearchDocument
+
+DEFAULT_MAX_RESULTS = 200
+
+_TERM_RE = re.compile(r"\w+")
+
+_POSTGRES_MATCH = """
+    SELECT object_id FROM search_searchdocument
+    WHERE kind = %s AND (
+        to_tsvector('simple', document) @@ to_tsquery('simple', %s)
+        OR document ILIKE %s
+    )
+"""
+
+_POSTGRES_SQL = (
+    _POSTGRES_MATCH
+    + """
+    ORDER BY
+        ts_rank(to_tsvector('simple', document), to_tsquery('simple', %s)) DESC,
+        similarity(document, %s) DESC,
+        object_id
+    LIMIT %s
+"""
+)
+
+# Correlated with the outer row; the (kind, object_id) unique index makes each
+# lookup a single index probe.
+_POSTGRES_RANK = """
+    SELECT ts_rank(to_tsvector('simple', document), to_tsquery('simple', %s))
+    FROM search_searchdocument WHERE kind = %s AND object_id = {outer}
+"""
+
+_POSTGRES_SIMILARITY = """
+    SELECT similarity(document, %s)
+    FROM search_searchdocument WHERE kind = %s AND object_id = {outer}
+"""
+
+_SQLITE_MATCH = """
+    SELECT d.object_id FROM search_fts
+    JOIN search_searchdocument d ON d.id = search_fts.rowid
+    WHERE search_fts MATCH %s AND d.kind = %s
+"""
+
+_SQLITE_SQL = (
+    _SQLITE_MATCH
+    + """
+    ORDER BY search_fts.rank, d.object_id
+    LIMIT %s
+"""
+)
+
+_SQLITE_RANK = """
+    SELECT search_fts.rank FROM search_fts
+    JOIN search_searchdocument d ON d.id = search_fts.rowid
+    WHERE search_fts MATCH %s AND d.kind = %s AND d.object_id = {outer}
+"""
+
+
+def terms(query: str) -> List[str]:
+    return _TERM_RE.findall(query.lower())
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _tsquery(words: List[str]) -> str:
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _fts_query(words: List[str]) -> str:
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _icontains(kind: str, words: List[str]):
+    documents = SearchDocument.objects.filter(kind=kind)
+    for word in words:
+        documents = documents.filter(document__icontains=word)
+    return documents
+
+
+def search_ids(kind: str, query: str, limit: Optional[int] = None) -> List[int]:
+    """Return ids of ``kind`` objects matching ``query``, best match first.
+
+    At most ``limit`` ids (default ``SEARCH_MAX_RESULTS``) are returned.
+    """
+
+    words = terms(query)
+    if not words:
+        return []
+    if limit is None:
+        limit = getattr(settings, "SEARCH_MAX_RESULTS", DEFAULT_MAX_RESULTS)
+
+    if connection.vendor == "postgresql":
+        tsquery = _tsquery(words)
+        params = [kind, tsquery, _like_pattern(query.strip()), tsquery, query, limit]
+        sql = _POSTGRES_SQL
+    elif connection.vendor == "sqlite":
+        params = [_fts_query(words), kind, limit]
+        sql = _SQLITE_SQL
+    else:
+        return list(
+            _icontains(kind, words)
+            .order_by("object_id")
+            .values_list("object_id", flat=True)[:limit]
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_queryset(queryset, kind: str, query: str, limit: Optional[int] = None):
+    """Restrict ``queryset`` to objects matching ``query``, ordered by relevance.
+
+    Without ``limit`` the match is applied as a subquery, so paginated views
+    count and page through every match. With ``limit`` only the ``limit`` best
+    matches are kept, fetched up front by :func:`search_ids`.
+    """
+
+    if limit is not None:
+        ids = search_ids(kind, query, limit)
+        if not ids:
+            return queryset.none()
+        relevance = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ids).order_by(relevance)
+
+    words = terms(query)
+    if not words:
+        return queryset.none()
+    meta = queryset.model._meta
+    qn = connection.ops.quote_name
+    outer = f"{qn(meta.db_table)}.{qn(meta.pk.column)}"
+
+    if connection.vendor == "postgresql":
+        tsquery = _tsquery(words)
+        match = RawSQL(_POSTGRES_MATCH, [kind, tsquery, _like_pattern(query.strip())])
+        ranks = [
+            RawSQL(_POSTGRES_RANK.format(outer=outer), [tsquery, kind], FloatField()),
+            RawSQL(
+                _POSTGRES_SIMILARITY.format(outer=outer), [query, kind], FloatField()
+            ),
+        ]
+        ordering = [rank.desc() for rank in ranks]
+    elif connection.vendor == "sqlite":
+        fts_query = _fts_query(words)
+        match = RawSQL(_SQLITE_MATCH, [fts_query, kind])
+        rank = RawSQL(_SQLITE_RANK.format(outer=outer), [fts_query, kind], FloatField())
+        # bm25 ranks are negative, best first
+        ordering = [rank.asc()]
+    else:
+        match = _icontains(kind, words).values("object_id")
+        ordering = []
+    return queryset.filter(pk__in=match).order_by(*ordering, "pk")
@@ -0,0 +1,86 @@
+"""What gets indexed for each searchable model.
+
+Each kind maps to the model it indexes, the relations its document reads and a
+function rendering one object as search text. ``DEPENDENTS`` lists, for every
+model whose fields appear in other objects' documents, which documents must be
+rebuilt when it changes (renaming a brand changes every product of the brand).
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Tuple, Type
+
+from django.db import models
+
+from catalog.models import Category, Department, Product, Quality, SubCategory, Variant
+from marketing.models import Brand
+from spares.models import Spare
+
+
+def _join(*parts) -> str:
+    return " ".join(str(part) for part in parts if part)
+
+
+def _name(obj) -> str:
+    return obj.name if obj is not None else ""
+
+
+def _category_path(subcategory) -> str:
+    # Parents can be missing while a cascading delete is still running
+    category = subcategory.category if subcategory else None
+    department = category.department if category else None
+    return _join(_name(department), _name(category), _name(subcategory))
+
+
+def product_document(product: Product) -> str:
+    return _join(
+        product.name,
+        product.brand.name,
+        product.barcode,
+        _category_path(product.subcategory),
+    )
+
+
+def variant_document(variant: Variant) -> str:
+    return _join(variant.variant_name, product_document(variant.product))
+
+
+def spare_document(spare: Spare) -> str:
+    return _join(spare.name, spare.sku, _name(spare.quality))
+
+
+class IndexedModel(NamedTuple):
+    model: Type[models.Model]
+    select_related: Tuple[str, ...]
+    build: Callable[[models.Model], str]
+
+    def queryset(self):
+        return self.model.objects.select_related(*self.select_related)
+
+
+KINDS: Dict[str, IndexedModel] = {
+    "product": IndexedModel(
+        Product, ("brand", "subcategory__category__department"), product_document
+    ),
+    "variant": IndexedModel(
+        Variant,
+        ("product__brand", "product__subcategory__category__department"),
+        variant_document,
+    ),
+    "spare": IndexedModel(Spare, ("quality",), spare_document),
+}
+
+KIND_BY_MODEL = {indexed.model: kind for kind, indexed in KINDS.items()}
+
+DEPENDENTS: Dict[Type[models.Model], List[Tuple[str, str]]] = {
+    Brand: [("product", "brand"), ("variant", "product__brand")],
+    Department: [
+        ("product", "subcategory__category__department"),
+        ("variant", "product__subcategory__category__department"),
+    ],
+    Category: [
+        ("product", "subcategory__category"),
+        ("variant", "product__subcategory__category"),
+    ],
+    SubCategory: [("product", "subcategory"), ("variant", "product__subcategory")],
+    Product: [("variant", "product")],
+    Quality: [("spare", "quality")],
+}
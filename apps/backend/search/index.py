@@ -0,0 +1,92 @@
+"""Writing search documents.
+
+Documents are upserted in batches, so reindexing a brand with thousands of
+products costs one SELECT and one INSERT ... ON CONFLICT per batch.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+
+from .documents import DEPENDENTS, KINDS
+from .models import SearchDocument
+
+BATCH_SIZE = 500
+
+
+def _write(batch: List[SearchDocument]) -> None:
+    SearchDocument.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=["document", "updated_at"],
+    )
+
+
+def index_objects(
+    kind: str, ids: Optional[Iterable[int]] = None, batch_size: int = BATCH_SIZE
+) -> int:
+    """Build and store documents for ``ids`` of ``kind`` (every object if ``None``).
+
+    Ids that no longer exist have their documents removed.
+
+    Returns:
+        int: Number of documents written.
+    """
+
+    queryset = KINDS[kind].queryset().order_by("pk")
+    build = KINDS[kind].build
+    if ids is not None:
+        ids = set(ids)
+        queryset = queryset.filter(pk__in=ids)
+
+    written = 0
+    seen = set()
+    batch = []
+    for obj in queryset.iterator(chunk_size=batch_size):
+        seen.add(obj.pk)
+        batch.append(SearchDocument(kind=kind, object_id=obj.pk, document=build(obj)))
+        if len(batch) >= batch_size:
+            _write(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        _write(batch)
+        written += len(batch)
+    if ids is not None and ids - seen:
+        remove_objects(kind, ids - seen)
+    return written
+
+
+def remove_objects(kind: str, ids: Iterable[int]) -> None:
+    SearchDocument.objects.filter(kind=kind, object_id__in=list(ids)).delete()
+
+
+def dependent_ids(instance) -> Dict[str, List[int]]:
+    """Ids, per kind, of documents that embed fields of ``instance``."""
+
+    found = {}
+    for kind, lookup in DEPENDENTS.get(type(instance), []):
+        ids = list(
+            KINDS[kind]
+            .model.objects.filter(**{lookup: instance})
+            .values_list("pk", flat=True)
+        )
+        if ids:
+            found[kind] = ids
+    return found
+
+
+def rebuild(kinds: Optional[Iterable[str]] = None, batch_size: int = BATCH_SIZE):
+    """Drop and rebuild every document of ``kinds`` (all kinds by default).
+
+    Returns:
+        dict: Documents written per kind.
+    """
+
+    counts = {}
+    for kind in kinds or KINDS:
+        with transaction.atomic():
+            SearchDocument.objects.filter(kind=kind).delete()
+            counts[kind] = index_objects(kind, batch_size=batch_size)
+    return counts
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from search.documents import KINDS
+from search.index import BATCH_SIZE, rebuild
+
+
+class Command(BaseCommand):
+    """Rebuild catalog search documents from scratch.
+
+    Signals keep documents current during normal operation; run this after
+    bulk imports, raw SQL edits or restoring a backup::
+
+        python manage.py rebuild_search_index --kind=product --kind=variant
+    """
+
+    help = "Rebuild the product, variant and spare search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            help=f"Only rebuild this kind ({', '.join(KINDS)}); may be repeated",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help=f"Documents written per query (default {BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        kinds = options["kinds"]
+        unknown = set(kinds or []) - set(KINDS)
+        if unknown:
+            raise CommandError(f"unknown kind(s): {', '.join(sorted(unknown))}")
+        counts = rebuild(kinds, batch_size=options["batch_size"])
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: {count} documents")
@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """Denormalized search text for one catalog object.
+
+    ``document`` concatenates everything a user might type for the object
+    (name, brand, SKU, barcode, category path). The full-text indexes over it
+    are backend specific and created by the migrations, see :mod:`search.backends`.
+    """
+
+    KIND_CHOICES = [
+        ("product", "Product"),
+        ("variant", "Variant"),
+        ("spare", "Spare"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    document = models.TextField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="search_document_kind_object"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.object_id}"
@@ -0,0 +1,47 @@
+"""Keep search documents in step with the catalog.
+
+Receivers run inside the saving transaction, so a rolled back save also rolls
+back its document. Changes to models embedded in other documents (a brand
+name, a category path, a quality) reindex the dependent documents; their ids
+are collected before a delete because ``SET_NULL`` relations are already
+cleared by ``post_delete``.
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from .documents import DEPENDENTS, KIND_BY_MODEL
+from .index import dependent_ids, index_objects, remove_objects
+
+
+def index_on_save(sender, instance, **kwargs):
+    kind = KIND_BY_MODEL.get(sender)
+    if kind:
+        index_objects(kind, [instance.pk])
+    for dep_kind, ids in dependent_ids(instance).items():
+        index_objects(dep_kind, ids)
+
+
+def collect_dependents(sender, instance, **kwargs):
+    instance._search_dependents = dependent_ids(instance)
+
+
+def index_on_delete(sender, instance, **kwargs):
+    kind = KIND_BY_MODEL.get(sender)
+    if kind:
+        remove_objects(kind, [instance.pk])
+    for dep_kind, ids in getattr(instance, "_search_dependents", {}).items():
+        index_objects(dep_kind, ids)
+
+
+for model in set(KIND_BY_MODEL) | set(DEPENDENTS):
+    post_save.connect(
+        index_on_save, sender=model, dispatch_uid=f"search_{model.__name__}_save"
+    )
+    pre_delete.connect(
+        collect_dependents,
+        sender=model,
+        dispatch_uid=f"search_{model.__name__}_pre_delete",
+    )
+    post_delete.connect(
+        index_on_delete, sender=model, dispatch_uid=f"search_{model.__name__}_delete"
+    )
@@ -1,13 +1,13 @@
-from django.db.models import Q
 from rest_framework import permissions, viewsets
 
 from accounts.permissions import IsSystemAdminUser
+from search.backends import search_queryset
 from .models import Spare
 from .serializers import SpareSerializer
 
 
 class SpareViewSet(viewsets.ModelViewSet):
-    queryset = Spare.objects.all()
+    queryset = Spare.objects.select_related("quality")
     serializer_class = SpareSerializer
 
     def get_permissions(self):
@@ -21,14 +21,18 @@ class SpareViewSet(viewsets.ModelViewSet):
         qs = super().get_queryset()
         search = self.request.query_params.get("search")
         if search:
-            qs = qs.filter(Q(name__icontains=search) | Q(sku__icontains=search))
+            qs = search_queryset(qs, "spare", search)
         min_price = self.request.query_params.get("min_price")
         if min_price:
             qs = qs.filter(price__gte=min_price)
         max_price = self.request.query_params.get("max_price")
         if max_price:
             qs = qs.filter(price__lte=max_price)
-        ordering = self.request.query_params.get("ordering", "name")
+        ordering = self.request.query_params.get("ordering")
         allowed = {"name", "-name", "sku", "-sku", "price", "-price", "id", "-id"}
-        qs = qs.order_by(ordering if ordering in allowed else "name")
+        if ordering in allowed:
+            qs = qs.order_by(ordering)
+        elif not search:
+            # Search results keep their relevance order
+            qs = qs.order_by("name")
         return qs
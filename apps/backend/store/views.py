@@ -54,7 +54,7 @@ class StoreViewSet(viewsets.ModelViewSet):
     """
 
     # Hide soft-deleted by default
-    queryset = Store.objects.filter(deleted=False)
+    queryset = Store.objects.filter(deleted=False).select_related("authority")
     serializer_class = StoreSerializer
 
     def get_permissions(self):
@@ -130,7 +130,7 @@ class StoreViewSet(viewsets.ModelViewSet):
                 Q(store_name__icontains=s)
                 | Q(code__icontains=s)
                 | Q(address__icontains=s)
-            ).distinct()
+            )
 
         store_type = self.request.query_params.get("store_type")
         if store_type in ("HQ", "BRANCH"):
@@ -15,6 +15,18 @@ def _set_timezone(settings):
     timezone.deactivate()
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache(settings):
+    from django.core.cache import cache
+
+    # Keep tests off the shared file cache used in development.
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    yield
+
+
 @pytest.fixture
 def localdt():
     tz = ZoneInfo("Asia/Kolkata")
@@ -125,3 +137,33 @@ def fake_selfie():
         )
 
     return _make
+
+
+@pytest.fixture
+def assert_constant_queries(db):
+    """Assert a list endpoint's query count does not grow with its row count.
+
+    ``seed(n)`` must create ``n`` more rows visible to ``url``. The endpoint is
+    requested after seeding a few rows and again after seeding many more; both
+    requests must issue the same number of queries.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def _count(client, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = client.get(url)
+        assert resp.status_code == 200, resp.content
+        return ctx.captured_queries
+
+    def _assert(client, url, seed, small=2, large=12):
+        seed(small)
+        before = _count(client, url)
+        seed(large - small)
+        after = _count(client, url)
+        assert len(after) == len(before), (
+            f"{url}: {len(before)} queries for {small} rows but "
+            f"{len(after)} for {large} rows\n" + "\n".join(q["sql"] for q in after)
+        )
+
+    return _assert
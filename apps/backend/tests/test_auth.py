@@ -52,3 +52,68 @@ def test_login_throttle():
         "/api/auth/login", {"username": "bad", "password": "pw"}, format="json"
     )
     assert resp.status_code == 429
+
+
+@pytest.mark.django_db
+def test_jwt_user_cached_and_invalidated(branch_head):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from accounts.authentication import CachedJWTAuthentication
+
+    token = AccessToken.for_user(branch_head)
+    auth = CachedJWTAuthentication()
+    auth.get_user(token)  # warm the cache
+    with CaptureQueriesContext(connection) as queries:
+        user = auth.get_user(token)
+        assert (user.role, user.store.code) == ("branch_head", branch_head.store.code)
+    assert len(queries) == 0
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert client.get("/api/logs/").status_code == 403
+
+    branch_head.role = "system_admin"
+    branch_head.save()
+    assert client.get("/api/logs/").status_code == 200
+
+    branch_head.is_active = False
+    branch_head.save(update_fields=["is_active"])
+    assert client.get("/api/logs/").status_code == 401
+
+
+@pytest.mark.django_db
+def test_refresh_rotation_revokes_and_purges(
+    advisor1, django_capture_on_commit_callbacks
+):
+    from datetime import timedelta
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken,
+        OutstandingToken,
+    )
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from rest_framework_simplejwt.utils import aware_utcnow
+
+    from accounts.revocation import purge_expired
+
+    client = APIClient()
+    old = str(RefreshToken.for_user(advisor1))
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = client.post("/api/token/refresh", {"refresh": old}, format="json")
+    assert resp.status_code == 200
+    new = resp.json()["refresh"]
+
+    # The rotated token is rejected straight from the revocation cache.
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.post("/api/token/refresh", {"refresh": old}, format="json")
+    assert resp.status_code == 401
+    assert len(queries) == 0
+    assert OutstandingToken.objects.filter(user=advisor1).count() == 2
+
+    assert purge_expired() == 0
+    assert purge_expired(now=aware_utcnow() + timedelta(days=30)) == 2
+    assert not BlacklistedToken.objects.exists()
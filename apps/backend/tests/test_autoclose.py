@@ -1,11 +1,13 @@
 from datetime import date, datetime, timedelta, time
+from unittest import mock
 
 from django.test import TestCase
 from django.utils import timezone
 
 from accounts.models import CustomUser
 from attendance.models import Attendance, AdvisorSchedule, Shift
-from attendance.tasks import autoclose_for_date
+from attendance import tasks
+from attendance.tasks import autoclose_for_date, mark_absent_for_range
 from store.models import Store
 
 
@@ -102,3 +104,24 @@ class AutoCloseTests(TestCase):
         self.assertEqual(Attendance.objects.filter(user=user, date=target).count(), 1)
         self.assertEqual(second["finalized"], 0)
         self.assertEqual(second["absents_created"], 0)
+
+    def test_absent_count_excludes_rows_inserted_concurrently(self):
+        late = self._make_user("u5", self.day_shift)
+        self._make_user("u6", self.day_shift)
+        target = date(2024, 1, 2)
+        days = tasks._days
+
+        def race(start, end):
+            # ``late`` checks in after the existing rows were read.
+            if not Attendance.objects.filter(user=late).exists():
+                Attendance.objects.create(
+                    user=late, store=self.store, date=target, shift=self.day_shift
+                )
+            return days(start, end)
+
+        with mock.patch.object(tasks, "_days", side_effect=race):
+            created = mark_absent_for_range(target, target)
+
+        self.assertEqual(created, 1)
+        self.assertEqual(Attendance.objects.filter(date=target).count(), 2)
+        self.assertEqual(Attendance.objects.get(user=late).status, "OPEN")
@@ -42,3 +42,68 @@ def test_open_attendance_finalized_and_idempotent(
     att.refresh_from_db()
     assert att.check_out == first_checkout
     assert Attendance.objects.filter(user=advisor1, date=date(2025, 8, 13)).count() == 1
+
+
+@pytest.mark.django_db
+def test_dates_range_backfills_in_one_pass(
+    advisor1, advisor2, day_shift, store_s1, localdt
+):
+    for user in (advisor1, advisor2):
+        AdvisorSchedule.objects.create(
+            user=user,
+            rule_type="fixed",
+            anchor_monday=date(2025, 8, 11),
+            default_shift=day_shift,
+        )
+    att = Attendance.objects.create(
+        user=advisor1,
+        store=store_s1,
+        date=date(2025, 8, 12),
+        shift=day_shift,
+        check_in=localdt(2025, 8, 12, 9, 0),
+        status="OPEN",
+    )
+    call_command("attendance_autoclose", dates="2025-08-11:2025-08-17")
+    att.refresh_from_db()
+    assert att.status == "PRESENT"
+    assert Attendance.objects.filter(user=advisor1, status="ABSENT").count() == 6
+    assert Attendance.objects.filter(user=advisor2, status="ABSENT").count() == 7
+
+    call_command("attendance_autoclose", dates="2025-08-11:2025-08-17")
+    assert Attendance.objects.count() == 14
+
+
+@pytest.mark.django_db
+def test_autoclose_query_count_independent_of_advisors(
+    django_assert_max_num_queries, store_s1, day_shift, localdt
+):
+    from django.contrib.auth import get_user_model
+    from attendance.tasks import autoclose_for_range
+
+    User = get_user_model()
+    for i in range(20):
+        user = User.objects.create_user(
+            username=f"bulk{i}",
+            password="pw",
+            email=f"bulk{i}@example.com",
+            role="advisor",
+            store=store_s1,
+        )
+        AdvisorSchedule.objects.create(
+            user=user,
+            rule_type="fixed",
+            anchor_monday=date(2025, 8, 11),
+            default_shift=day_shift,
+        )
+        if i % 2:
+            Attendance.objects.create(
+                user=user,
+                store=store_s1,
+                date=date(2025, 8, 12),
+                shift=day_shift,
+                check_in=localdt(2025, 8, 12, 9, 0),
+            )
+
+    with django_assert_max_num_queries(20):
+        result = autoclose_for_range(date(2025, 8, 11), date(2025, 8, 13))
+    assert result == {"finalized": 10, "absents_created": 50}
@@ -1,11 +1,22 @@
+from datetime import timedelta
+
 import requests
 import pytest
+from io import StringIO
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
 from django.conf import settings
 from django.test.utils import override_settings
+from django.utils import timezone
 from rest_framework.test import APIClient
 from accounts.models import CustomUser
-from bookings.models import Booking
-from bookings.notifications import NotificationService
+from bookings.models import Booking, NotificationOutbox
+from utils.captcha import verify_captcha
+from bookings.notifications import (
+    NotificationService,
+    dispatch_pending_notifications,
+    queue_booking_notifications,
+)
 
 
 class DummyResponse:
@@ -33,7 +44,7 @@ def _captcha_fail(*args, **kwargs):
 )
 def test_booking_creation_public(monkeypatch):
     client = APIClient()
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     data = {
         "name": "John",
         "email": "j@example.com",
@@ -51,7 +62,7 @@ def test_booking_creation_public(monkeypatch):
 @pytest.mark.django_db
 def test_booking_invalid_captcha(monkeypatch):
     client = APIClient()
-    monkeypatch.setattr(requests, "post", _captcha_fail)
+    monkeypatch.setattr(requests.Session, "post", _captcha_fail)
     data = {
         "name": "John",
         "email": "j@example.com",
@@ -92,7 +103,7 @@ def test_booking_list_admin_only(monkeypatch):
     }
 )
 def test_booking_staff_bypasses_throttle(monkeypatch):
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     client = APIClient()
     staff = CustomUser.objects.create_user(
         username="admin", email="a@example.com", password="x", role="system_admin"
@@ -113,7 +124,7 @@ def test_booking_staff_bypasses_throttle(monkeypatch):
 
 @pytest.mark.django_db
 def test_invalid_status_transition(monkeypatch):
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     client = APIClient()
     data = {
         "name": "John",
@@ -136,7 +147,7 @@ def test_invalid_status_transition(monkeypatch):
 
 @pytest.mark.django_db
 def test_status_change_requires_admin(monkeypatch):
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     client = APIClient()
     data = {
         "name": "John",
@@ -156,7 +167,7 @@ def test_status_change_requires_admin(monkeypatch):
 
 @pytest.mark.django_db
 def test_cancel_and_reject_require_reason(monkeypatch):
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     client = APIClient()
     data = {
         "name": "John",
@@ -202,18 +213,14 @@ def test_cancel_and_reject_require_reason(monkeypatch):
         "DEFAULT_THROTTLE_RATES": {"booking": "5/hour"},
     },
 )
-def test_booking_notifications(monkeypatch):
-    sent = {}
+def test_booking_notifications(monkeypatch, mailoutbox):
+    posted = []
 
-    def _send_email(to, subject, template, context):
-        sent["email"] = (to, subject, template, context)
+    def _post_sms(to, message):
+        posted.append((to, message))
 
-    def _send_sms(to, template, context):
-        sent.setdefault("sms", []).append((to, template, context))
-
-    monkeypatch.setattr(requests, "post", _captcha_ok)
-    monkeypatch.setattr(NotificationService, "send_email", staticmethod(_send_email))
-    monkeypatch.setattr(NotificationService, "send_sms", staticmethod(_send_sms))
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
+    monkeypatch.setattr(NotificationService, "post_sms", staticmethod(_post_sms))
     client = APIClient()
     user = CustomUser.objects.create_user(
         username="cust",
@@ -240,11 +247,205 @@ def test_booking_notifications(monkeypatch):
         username="admin", email="a@b.com", password="x", role="system_admin"
     )
     client.force_authenticate(user=admin)
-    sent.clear()
+    NotificationOutbox.objects.all().delete()
     resp = client.patch(
         f"/api/bookings/{booking_id}",
         {"status": "cancelled", "reason": "changed plans"},
     )
     assert resp.status_code == 200
-    assert "email" in sent and "sms" in sent
-    assert sent["email"][3]["booking"].reason == "changed plans"
+    # The request only enqueues; nothing is delivered yet.
+    assert not mailoutbox and not posted
+    queued = {n.channel: n for n in NotificationOutbox.objects.all()}
+    assert set(queued) == {"email", "sms"}
+    assert "changed plans" in queued["email"].body
+
+    assert dispatch_pending_notifications() == {"sent": 2, "failed": 0, "retry": 0}
+    assert sorted(m.to[0] for m in mailoutbox) == ["a@b.com", "c@example.com"]
+    assert posted == [("1234567890", queued["sms"].body)]
+    assert set(NotificationOutbox.objects.values_list("status", flat=True)) == {"sent"}
+
+
+@pytest.mark.django_db
+@override_settings(
+    BOOKING_NOTIFICATION_CHANNELS=["sms"],
+    SMS_GATEWAY_URL="http://sms",
+)
+def test_notification_outbox_retries_failed_sms(monkeypatch):
+    booking = Booking.objects.create(
+        name="Jane", date="2024-01-01", time="10:00", issue="battery"
+    )
+    for username, phone in (("a1", "111"), ("a2", "222")):
+        CustomUser.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="x",
+            role="advisor",
+            phone=phone,
+        )
+
+    posted = []
+
+    def _flaky(to, message):
+        # Rows are claimed before anything is sent.
+        assert NotificationOutbox.objects.get().status == "sending"
+        posted.append(to)
+        if to == "222":
+            raise requests.ConnectionError("gateway down")
+
+    monkeypatch.setattr(NotificationService, "post_sms", staticmethod(_flaky))
+    (row,) = queue_booking_notifications(booking)
+    assert dispatch_pending_notifications() == {"sent": 0, "failed": 0, "retry": 1}
+    row.refresh_from_db()
+    assert row.status == "pending"
+    assert row.recipients == ["222"]
+    assert row.attempts == 1
+    assert row.next_attempt_at > timezone.now() + timedelta(seconds=50)
+
+    # The failed row backs off instead of being retried straight away.
+    posted.clear()
+    call_command("send_booking_notifications", "--batch-size=1", stdout=StringIO())
+    assert posted == []
+
+    NotificationOutbox.objects.update(next_attempt_at=timezone.now())
+    call_command("send_booking_notifications", "--batch-size=1", stdout=StringIO())
+    row.refresh_from_db()
+    assert posted == ["222"] and row.attempts == 2
+    assert row.next_attempt_at > timezone.now() + timedelta(seconds=110)
+
+    monkeypatch.setattr(
+        NotificationService, "post_sms", staticmethod(lambda to, message: None)
+    )
+    NotificationOutbox.objects.update(next_attempt_at=timezone.now())
+    call_command("send_booking_notifications", stdout=StringIO())
+    row.refresh_from_db()
+    assert row.status == "sent"
+
+
+@pytest.mark.django_db
+@override_settings(BOOKING_NOTIFICATION_CHANNELS=["email"])
+def test_notification_outbox_retries_only_failed_emails(monkeypatch, mailoutbox):
+    booking = Booking.objects.create(
+        name="Jane", date="2024-01-01", time="10:00", issue="battery"
+    )
+    for username in ("a1", "a2"):
+        CustomUser.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="x",
+            role="advisor",
+        )
+    send_messages = EmailBackend.send_messages
+
+    def _flaky(self, messages):
+        if messages[0].to == ["a2@example.com"]:
+            raise ConnectionResetError("smtp down")
+        return send_messages(self, messages)
+
+    monkeypatch.setattr(EmailBackend, "send_messages", _flaky)
+    (row,) = queue_booking_notifications(booking)
+    assert dispatch_pending_notifications() == {"sent": 0, "failed": 0, "retry": 1}
+    row.refresh_from_db()
+    assert row.recipients == ["a2@example.com"]
+    assert [m.to for m in mailoutbox] == [["a1@example.com"]]
+
+    monkeypatch.setattr(EmailBackend, "send_messages", send_messages)
+    NotificationOutbox.objects.update(next_attempt_at=timezone.now())
+    assert dispatch_pending_notifications() == {"sent": 1, "failed": 0, "retry": 0}
+    # a1 is not emailed a second time.
+    assert [m.to for m in mailoutbox] == [["a1@example.com"], ["a2@example.com"]]
+
+
+@pytest.mark.django_db
+def test_captcha_verification_cached_and_pooled(monkeypatch):
+    calls = []
+
+    def _post(session, *args, **kwargs):
+        calls.append(session)
+        return DummyResponse(True)
+
+    monkeypatch.setattr(requests.Session, "post", _post)
+    assert verify_captcha("tok")
+    assert verify_captcha("tok")
+    assert verify_captcha("other")
+    # The retried token is served from the cache and both calls share a session.
+    assert len(calls) == 2
+    assert calls[0] is calls[1]
+
+
+@pytest.mark.django_db
+@override_settings(RECAPTCHA_VERIFIER="utils.captcha.StubCaptchaVerifier")
+def test_booking_with_stub_captcha_verifier(monkeypatch):
+    def _no_network(*args, **kwargs):
+        raise AssertionError("stub verifier must not call the network")
+
+    monkeypatch.setattr(requests.Session, "post", _no_network)
+    client = APIClient()
+    resp = client.post(
+        "/api/bookings",
+        {
+            "name": "Stub",
+            "issue": "screen",
+            "date": "2024-01-01",
+            "time": "10:00",
+            "captcha_token": "anything",
+        },
+    )
+    assert resp.status_code == 201
+
+
+def _past_booking(status, days_ago):
+    from datetime import date, time, timedelta
+
+    return Booking.objects.create(
+        name="Past",
+        date=date.today() - timedelta(days=days_ago),
+        time=time(9, 0),
+        status=status,
+    )
+
+
+@pytest.mark.django_db
+def test_booking_list_derives_status_without_writing(admin_user):
+    from activity.models import EventLog
+
+    approved = _past_booking("approved", 1)
+    started = _past_booking("in_progress", 1)
+    logs = EventLog.objects.count()
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+
+    rows = {row["id"]: row for row in client.get("/api/bookings").json()["content"]}
+    assert rows[approved.id]["status"] == "in_progress"
+    assert rows[started.id]["status"] == "completed"
+    approved.refresh_from_db()
+    assert approved.status == "approved"
+    assert EventLog.objects.count() == logs
+
+    # Transitions are validated against the status the client saw
+    resp = client.patch(f"/api/bookings/{approved.id}", {"status": "completed"})
+    assert resp.status_code == 200
+    approved.refresh_from_db()
+    assert approved.status == "completed"
+
+
+@pytest.mark.django_db
+def test_advance_booking_statuses_command():
+    from activity.models import EventLog
+
+    approved = _past_booking("approved", 2)
+    started = _past_booking("in_progress", 2)
+    pending = _past_booking("pending", 2)
+    logs = EventLog.objects.count()
+    out = StringIO()
+
+    call_command("advance_booking_statuses", stdout=out)
+    assert "completed=1 in_progress=1" in out.getvalue()
+    assert Booking.objects.get(pk=approved.pk).status == "in_progress"
+    assert Booking.objects.get(pk=started.pk).status == "completed"
+    assert Booking.objects.get(pk=pending.pk).status == "pending"
+    entry = EventLog.objects.filter(entity_id=str(started.pk)).latest("id")
+    assert entry.metadata == {"status": {"from": "in_progress", "to": "completed"}}
+    assert EventLog.objects.count() == logs + 2
+
+    call_command("advance_booking_statuses", stdout=out)
+    assert Booking.objects.get(pk=approved.pk).status == "completed"
@@ -0,0 +1,56 @@
+import pytest
+from rest_framework.test import APIClient
+from activity.models import EventLog
+from catalog.models import Department, Category
+from marketing.models import Brand
+
+
+@pytest.mark.django_db
+def test_taxonomy_list_served_from_cache(django_assert_num_queries):
+    Department.objects.create(name="Electronics")
+    client = APIClient()
+    resp = client.get("/api/departments")
+    assert resp.status_code == 200
+    with django_assert_num_queries(0):
+        cached = client.get("/api/departments")
+    assert cached.json() == resp.json()
+    # Query strings are cached separately.
+    assert client.get("/api/departments?size=1").json()["size"] == 1
+
+
+@pytest.mark.django_db
+def test_taxonomy_cache_invalidated_by_signals():
+    dept = Department.objects.create(name="Electronics")
+    client = APIClient()
+    assert client.get("/api/departments").json()["totalElements"] == 1
+    assert client.get("/api/categories").json()["totalElements"] == 0
+
+    Category.objects.create(name="Phones", department=dept)
+    assert client.get("/api/categories").json()["totalElements"] == 1
+
+    dept.name = "Gadgets"
+    dept.save()
+    resp = client.get(f"/api/departments/{dept.slug}")
+    assert resp.json()["name"] == "Gadgets"
+
+    dept.delete()
+    assert client.get("/api/departments").json()["totalElements"] == 0
+
+
+@pytest.mark.django_db
+def test_brand_cache_invalidated_on_write():
+    client = APIClient()
+    assert client.get("/api/brands/").status_code == 200
+    Brand.objects.create(name="Acme")
+    names = [b["name"] for b in client.get("/api/brands/").json()["content"]]
+    assert names == ["Acme"]
+
+
+@pytest.mark.django_db
+def test_every_taxonomy_model_is_logged(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        dept = Department.objects.create(name="Electronics")
+        Category.objects.create(name="Phones", department=dept)
+    assert set(
+        EventLog.objects.filter(action="created").values_list("entity_type", flat=True)
+    ) >= {"department", "category"}
@@ -1,3 +1,6 @@
+import base64
+import json
+
 import pytest
 from datetime import date, time as dtime
 from bookings.models import Booking
@@ -13,21 +16,25 @@ def test_logs_require_auth():
 
 
 @pytest.mark.django_db
-def test_eventlog_booking_crud(admin_user):
-    booking = Booking.objects.create(
-        name="Test", email="a@example.com", date=date.today(), time=dtime(9, 0)
-    )
+def test_eventlog_booking_crud(admin_user, django_capture_on_commit_callbacks):
+    # Audit rows are written when the surrounding transaction commits
+    with django_capture_on_commit_callbacks(execute=True):
+        booking = Booking.objects.create(
+            name="Test", email="a@example.com", date=date.today(), time=dtime(9, 0)
+        )
     assert EventLog.objects.filter(
         entity_type="booking", entity_id=str(booking.id), action="created"
     ).exists()
 
     booking.status = "cancelled"
     booking.reason = "user cancel"
-    booking.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        booking.save()
     assert EventLog.objects.filter(action="updated", reason="user cancel").exists()
 
     bid = booking.id
-    booking.delete()
+    with django_capture_on_commit_callbacks(execute=True):
+        booking.delete()
     assert EventLog.objects.filter(entity_id=str(bid), action="deleted").exists()
 
 
@@ -59,3 +66,205 @@ def test_eventlog_export(admin_user, advisor1):
     api.force_authenticate(user=advisor1)
     resp = api.get("/api/logs/export/?format=json")
     assert resp.status_code == 403
+
+
+@pytest.mark.django_db
+def test_eventlog_csv_export_streams_rows(admin_user, django_assert_max_num_queries):
+    EventLog.objects.bulk_create(
+        [
+            EventLog(
+                actor=admin_user, entity_type="booking", entity_id=i, action="create"
+            )
+            for i in range(50)
+        ]
+    )
+    api = APIClient()
+    api.force_authenticate(user=admin_user)
+    resp = api.get("/api/logs/export/?format=csv")
+    assert resp.streaming
+    with django_assert_max_num_queries(2):
+        lines = b"".join(resp.streaming_content).splitlines()
+    assert lines[0] == b"id,actor,entity_type,action,reason,timestamp"
+    assert len(lines) == EventLog.objects.count() + 1
+    assert any(admin_user.username.encode() in line for line in lines[1:])
+
+
+@pytest.mark.django_db
+def test_eventlog_cursor_pagination(admin_user):
+    EventLog.objects.bulk_create(
+        [
+            EventLog(entity_type="booking", entity_id=i, action="create")
+            for i in range(7)
+        ]
+    )
+    # Ties on timestamp must be broken by id
+    EventLog.objects.update(timestamp=EventLog.objects.first().timestamp)
+    expected = list(
+        EventLog.objects.order_by("-timestamp", "-id").values_list("id", flat=True)
+    )
+    api = APIClient()
+    api.force_authenticate(user=admin_user)
+
+    seen, pages, cursor = [], [], ""
+    while cursor is not None:
+        data = api.get("/api/logs/", {"cursor": cursor, "size": 3}).json()
+        assert data["totalElements"] is None
+        pages.append(data)
+        seen += [row["id"] for row in data["content"]]
+        cursor = data["next"]
+    assert seen == expected
+    assert [p["last"] for p in pages] == [False, False, True]
+    assert pages[0]["first"] and not pages[1]["first"]
+
+    back = api.get("/api/logs/", {"cursor": pages[2]["previous"], "size": 3}).json()
+    assert [row["id"] for row in back["content"]] == expected[3:6]
+
+    counted = api.get("/api/logs/", {"cursor": "", "size": 3, "count": "exact"}).json()
+    assert counted["totalElements"] == 7 and counted["totalPages"] == 3
+
+    assert api.get("/api/logs/", {"cursor": "garbage"}).status_code == 404
+    # Without a cursor the offset pages are unchanged
+    assert api.get("/api/logs/", {"page": 1, "size": 3}).json()["number"] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "position", [["garbage", 1], ["2024-01-01T00:00:00", "x"], [[1], {}], [None, 1]]
+)
+def test_eventlog_cursor_with_wrong_typed_values(admin_user, position):
+    api = APIClient()
+    api.force_authenticate(user=admin_user)
+    cursor = base64.urlsafe_b64encode(json.dumps({"p": position}).encode()).decode()
+    assert api.get("/api/logs/", {"cursor": cursor}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_audit_events_batched_at_commit_and_dropped_on_rollback(
+    django_capture_on_commit_callbacks, django_assert_num_queries
+):
+    from django.db import transaction
+    from activity.audit import buffered
+
+    def make(name):
+        return Booking.objects.create(
+            name=name, email="a@example.com", date=date.today(), time=dtime(9, 0)
+        )
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        first = make("First")
+        try:
+            with transaction.atomic():
+                make("Rolled back")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        second = make("Second")
+    assert not EventLog.objects.exists()
+    # Both surviving events are written by a single INSERT
+    with django_assert_num_queries(1):
+        for callback in callbacks:
+            callback()
+    logged = list(EventLog.objects.order_by("id").values_list("entity_id", flat=True))
+    assert logged == [str(first.id), str(second.id)]
+
+    # Inside buffered() the rows wait for the scope, not the commit hook
+    with django_capture_on_commit_callbacks(execute=True):
+        with buffered():
+            make("Buffered")
+            assert EventLog.objects.count() == 2
+    assert EventLog.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_audit_commit_hook_shape_matches_django(django_capture_on_commit_callbacks):
+    # activity.audit appends its flush hook to connection.run_on_commit
+    # directly; this breaks loudly if Django changes that internal list.
+    from django.db import connection, transaction
+
+    def hook():
+        pass
+
+    with transaction.atomic():
+        transaction.on_commit(hook)
+        (entry,) = connection.run_on_commit[-1:]
+        assert len(entry) == 3
+        sids, callback, robust = entry
+        assert isinstance(sids, set) and callback is hook and robust is False
+
+    # The flush hook outlives a rolled back savepoint holding the last event.
+    with django_capture_on_commit_callbacks(execute=True):
+        first = Booking.objects.create(name="Kept", date=date.today(), time=dtime(9, 0))
+        try:
+            with transaction.atomic():
+                Booking.objects.create(name="Gone", date=date.today(), time=dtime(9, 0))
+                raise RuntimeError
+        except RuntimeError:
+            pass
+    logged = list(EventLog.objects.values_list("entity_id", flat=True))
+    assert logged == [str(first.id)]
+
+
+@pytest.mark.django_db
+def test_audit_spool_and_drain(settings, tmp_path, django_capture_on_commit_callbacks):
+    from django.core.management import call_command
+    from activity.audit import buffered
+
+    settings.AUDIT_LOG_SPOOL_DIR = str(tmp_path)
+    with django_capture_on_commit_callbacks(execute=True):
+        with buffered(spool=True):
+            booking = Booking.objects.create(
+                name="Spooled",
+                email="a@example.com",
+                date=date.today(),
+                time=dtime(9, 0),
+            )
+    assert not EventLog.objects.exists()
+    assert len(list(tmp_path.glob("*.jsonl"))) == 1
+
+    call_command("drain_audit_log")
+    entry = EventLog.objects.get()
+    assert (entry.entity_id, entry.action) == (str(booking.id), "created")
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.django_db
+def test_archive_moves_old_months_and_export_streams_them(
+    admin_user, settings, tmp_path
+):
+    from datetime import datetime, timezone as dt_timezone
+    from django.core.management import call_command
+
+    settings.EVENTLOG_ARCHIVE_DIR = str(tmp_path)
+    old = datetime(2020, 3, 15, tzinfo=dt_timezone.utc)
+    EventLog.objects.bulk_create(
+        [
+            EventLog(
+                actor=admin_user,
+                entity_type="booking",
+                entity_id=i,
+                action="create",
+                timestamp=old,
+            )
+            for i in range(3)
+        ]
+        + [EventLog(entity_type="spare", entity_id=1, action="create")]
+    )
+
+    call_command("archive_event_logs", "--days=30")
+    assert list(EventLog.objects.values_list("entity_type", flat=True)) == ["spare"]
+    assert len(list(tmp_path.glob("2020-03/*.jsonl.gz"))) == 1
+
+    api = APIClient()
+    api.force_authenticate(user=admin_user)
+    resp = api.get("/api/logs/export/?format=csv&archived=true")
+    lines = b"".join(resp.streaming_content).splitlines()[1:]
+    assert [line.split(b",")[2] for line in lines] == [b"spare"] + [b"booking"] * 3
+    assert admin_user.username.encode() in lines[-1]
+
+    resp = api.get(
+        "/api/logs/export/?format=csv&archived=true&entity_type=booking"
+        "&start=2020-03-15&end=2020-03-16"
+    )
+    assert len(b"".join(resp.streaming_content).splitlines()) == 4
+    resp = api.get("/api/logs/export/?format=csv&archived=true&start=2021-01-01")
+    assert len(b"".join(resp.streaming_content).splitlines()) == 2
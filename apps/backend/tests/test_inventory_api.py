@@ -121,3 +121,239 @@ def test_serial_enforcement_and_booking_link(store_s1):
     assert entry.booking_id == booking.id
     serial = SerialNumber.objects.get(serial_no="SN1")
     assert serial.status == SerialNumber.STATUS_SOLD
+
+
+@pytest.mark.django_db
+def test_bulk_stock_entries_aggregate_ledger(store_s1):
+    user = CustomUser.objects.create_user(
+        username="u3", email="u3@example.com", password="x", role="system_admin"
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    brand = Brand.objects.create(name="B1")
+    product = Product.objects.create(name="P1", brand=brand, price=1, stock=0)
+    v1 = Variant.objects.create(product=product, variant_name="V1", price=1, stock=0)
+    v2 = Variant.objects.create(product=product, variant_name="V2", price=1, stock=0)
+    StockLedger.objects.create(store=store_s1, product_variant=v1, quantity=2)
+
+    def entry(variant, entry_type, quantity):
+        return {
+            "entry_type": entry_type,
+            "store": store_s1.id,
+            "product_variant": variant.id,
+            "quantity": quantity,
+            "unit_price": "10",
+        }
+
+    payload = [entry(v1, "purchase", 5)] * 50 + [
+        entry(v1, "return_out", 3),
+        entry(v2, "transfer_in", 4),
+    ]
+    resp = client.post("/api/stock-entries/bulk/", payload, format="json")
+    assert resp.status_code == 201
+    assert len(resp.data) == 52
+    assert StockEntry.objects.count() == 52
+    quantities = dict(
+        StockLedger.objects.values_list("product_variant_id", "quantity")
+    )
+    assert quantities == {v1.id: 2 + 250 - 3, v2.id: 4}
+
+    # A single invalid entry rejects the whole batch.
+    resp = client.post(
+        "/api/stock-entries/bulk/",
+        [entry(v1, "purchase", 1), {**entry(v1, "sale", 1)}],
+        format="json",
+    )
+    assert resp.status_code == 400
+    assert StockEntry.objects.count() == 52
+
+
+@pytest.mark.django_db
+def test_serial_entries_are_set_based_and_report_failures(
+    store_s1, django_assert_max_num_queries
+):
+    user = CustomUser.objects.create_user(
+        username="u4", email="u4@example.com", password="x", role="system_admin"
+    )
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    brand = Brand.objects.create(name="B1")
+    dept = Department.objects.create(name="D1")
+    cat = Category.objects.create(name="C1", department=dept)
+    sub = SubCategory.objects.create(name="SC1", category=cat)
+    InventoryConfig.objects.create(category=cat, track_serials=True)
+    product = Product.objects.create(name="P1", brand=brand, price=1, stock=0, subcategory=sub)
+    variant = Variant.objects.create(product=product, variant_name="V1", price=1, stock=0)
+    booking = Booking.objects.create(
+        name="Cust", date=timezone.now().date(), time=timezone.now().time()
+    )
+
+    def post(entry_type, serials, **extra):
+        return client.post(
+            "/api/stock-entries/",
+            {
+                "entry_type": entry_type,
+                "store": store_s1.id,
+                "product_variant": variant.id,
+                "quantity": len(serials),
+                "unit_price": "10",
+                "serial_numbers": serials,
+                **extra,
+            },
+            format="json",
+        )
+
+    received = [f"SN{i}" for i in range(200)]
+    with django_assert_max_num_queries(20):
+        assert post("purchase", received).status_code == 201
+    assert SerialNumber.objects.filter(store=store_s1).count() == 200
+
+    resp = post("purchase", ["SN5", "NEW1", "SN7"])
+    assert resp.status_code == 400
+    assert resp.data["failed_serials"] == ["SN5", "SN7"]
+
+    with django_assert_max_num_queries(20):
+        resp = post("sale", received[:150], booking=booking.id)
+    assert resp.status_code == 201
+    assert SerialNumber.objects.filter(status=SerialNumber.STATUS_SOLD).count() == 150
+
+    resp = post("sale", ["SN0", "SN199", "MISSING"], booking=booking.id)
+    assert resp.status_code == 400
+    assert resp.data["failed_serials"] == ["SN0", "MISSING"]
+    assert StockLedger.objects.get(store=store_s1, product_variant=variant).quantity == 50
+
+
+@pytest.mark.django_db
+def test_snapshots_as_of_and_reconcile(store_s1, admin_user):
+    from datetime import date, datetime, timedelta
+    from io import StringIO
+
+    from django.core.management import CommandError, call_command
+    from inventory.models import StockSnapshot
+    from inventory.snapshots import take_snapshots
+
+    brand = Brand.objects.create(name="B1")
+    product = Product.objects.create(name="P1", brand=brand, price=1, stock=0)
+    variant = Variant.objects.create(product=product, variant_name="V1", price=1, stock=0)
+
+    def entry(entry_type, quantity, day):
+        created = StockEntry.objects.create(
+            entry_type=entry_type,
+            store=store_s1,
+            product_variant=variant,
+            quantity=quantity,
+            unit_price=1,
+        )
+        moment = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        StockEntry.objects.filter(pk=created.pk).update(date=moment + timedelta(hours=12))
+
+    entry("purchase", 10, date(2025, 3, 30))
+    entry("return_out", 3, date(2025, 3, 31))
+    entry("purchase", 5, date(2025, 4, 1))
+
+    with pytest.raises(CommandError):
+        call_command("snapshot_stock", f"--until={timezone.localdate()}")
+    with pytest.raises(ValueError):
+        take_snapshots(timezone.localdate() + timedelta(days=1))
+    call_command("snapshot_stock", "--until=2025-03-31", stdout=StringIO())
+    assert list(StockSnapshot.objects.order_by("date").values_list("quantity", flat=True)) == [10, 7]
+
+    api = APIClient()
+    api.force_authenticate(user=admin_user)
+    for at, quantity in [("2025-03-29", None), ("2025-03-30", 10), ("2025-03-31", 7), ("2025-04-02", 12)]:
+        resp = api.get(f"/api/stock-ledgers/as-of/?at={at}&store={store_s1.id}")
+        assert resp.status_code == 200
+        assert [row["quantity"] for row in resp.data] == ([quantity] if quantity else [])
+    assert api.get("/api/stock-ledgers/as-of/?at=soon").status_code == 400
+
+    StockLedger.objects.filter(store=store_s1).update(quantity=100)
+    out = StringIO()
+    call_command("reconcile_stock_ledgers", "--workers=1", stdout=out)
+    assert f"variant={variant.id} ledger=100 entries=12 drift=+88" in out.getvalue()
+    call_command("reconcile_stock_ledgers", "--workers=1", "--fix", stdout=StringIO())
+    assert StockLedger.objects.get(store=store_s1, product_variant=variant).quantity == 12
+
+
+@pytest.mark.django_db
+def test_valuation_wavg_fifo_and_monthly_report(store_s1, admin_user):
+    from datetime import datetime
+    from decimal import Decimal
+    from io import StringIO
+
+    from django.core.management import call_command
+
+    brand = Brand.objects.create(name="B1")
+    product = Product.objects.create(name="P1", brand=brand, price=1, stock=0)
+    variant = Variant.objects.create(product=product, variant_name="V1", price=1, stock=0)
+
+    def entry(entry_type, quantity, price, day):
+        created = StockEntry.objects.create(
+            entry_type=entry_type,
+            store=store_s1,
+            product_variant=variant,
+            quantity=quantity,
+            unit_price=price,
+        )
+        moment = timezone.make_aware(datetime(2025, *day, 12))
+        StockEntry.objects.filter(pk=created.pk).update(date=moment)
+
+    entry("purchase", 10, 5, (1, 10))
+    entry("purchase", 10, 7, (1, 20))
+    entry("sale", 15, 20, (2, 5))
+    call_command("run_valuation", stdout=StringIO())
+
+    # Only entries after the previous run are replayed.
+    entry("sale", 10, 20, (3, 1))
+    entry("purchase", 8, 9, (3, 2))
+    out = StringIO()
+    call_command("run_valuation", stdout=out)
+    assert "entries=2 keys=1" in out.getvalue()
+
+    api = APIClient()
+    api.force_authenticate(user=admin_user)
+
+    def report(month):
+        resp = api.get(f"/api/valuation/?month={month}&store={store_s1.id}")
+        assert resp.status_code == 200
+        (row,) = resp.data["rows"]
+        return [
+            row[field]
+            for field in ("quantity", "value_wavg", "value_fifo", "cogs_wavg", "cogs_fifo")
+        ]
+
+    D = Decimal
+    assert report("2025-01") == [20, D(120), D(120), 0, 0]
+    assert report("2025-02") == [5, D(30), D(35), D(90), D(85)]
+    # 5 on hand + 5 short at the last cost (7); the March receipt settles it.
+    assert report("2025-03") == [3, D(27), D(27), D(65), D(70)]
+    assert report("2025-04") == [3, D(27), D(27), 0, 0]
+    assert api.get("/api/valuation/?month=march").status_code == 400
+
+
+@pytest.mark.django_db
+def test_valuation_keeps_lower_ids_dated_after_until(store_s1):
+    from datetime import datetime
+
+    from inventory.models import ValuationState
+    from inventory.valuation import run_valuation
+
+    brand = Brand.objects.create(name="B1")
+    product = Product.objects.create(name="P1", brand=brand, price=1, stock=0)
+    variant = Variant.objects.create(product=product, variant_name="V1", price=1, stock=0)
+    for day in (20, 10):  # the lower id carries the later date
+        created = StockEntry.objects.create(
+            entry_type="purchase",
+            store=store_s1,
+            product_variant=variant,
+            quantity=5,
+            unit_price=2,
+        )
+        moment = timezone.make_aware(datetime(2025, 1, day, 12))
+        StockEntry.objects.filter(pk=created.pk).update(date=moment)
+
+    until = timezone.make_aware(datetime(2025, 1, 15))
+    assert run_valuation(until=until) == {"entries": 2, "keys": 1}
+    assert run_valuation()["entries"] == 0
+    assert ValuationState.objects.get(product_variant=variant).quantity == 10
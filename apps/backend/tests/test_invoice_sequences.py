@@ -0,0 +1,92 @@
+import pytest
+from datetime import date, time
+from django.db import transaction
+from django.test.utils import override_settings
+from bookings.models import Booking
+from invoicing.models import Invoice, InvoiceSequence
+from invoicing.sequences import (
+    allocate_invoice_no,
+    financial_year,
+    next_invoice_number,
+    reset_blocks,
+    series_key,
+)
+
+
+def test_financial_year_starts_in_april():
+    assert financial_year(date(2025, 3, 31)) == "2425"
+    assert financial_year(date(2025, 4, 1)) == "2526"
+    assert financial_year(date(2099, 12, 1)) == "9900"
+
+
+def test_series_key_scope():
+    assert series_key("FT-INV", store_id=3, day=date(2025, 8, 1)) == "FT-INV"
+    with override_settings(INVOICE_SERIES_PER_STORE_FY=True):
+        assert series_key("FT-INV", store_id=3, day=date(2025, 8, 1)) == "FT-INV-3-2526"
+        assert series_key("FT-SALE", day=date(2026, 1, 5)) == "FT-SALE-2526"
+
+
+@pytest.mark.django_db
+def test_gapless_numbers_roll_back_with_invoice():
+    assert next_invoice_number("T") == 1
+    with pytest.raises(RuntimeError):
+        with transaction.atomic():
+            assert next_invoice_number("T") == 2
+            raise RuntimeError("invoice failed")
+    assert next_invoice_number("T") == 2
+    assert InvoiceSequence.objects.get(series="T").current == 2
+
+
+@pytest.mark.django_db
+def test_series_are_independent():
+    with override_settings(INVOICE_SERIES_PER_STORE_FY=True):
+        day = date(2025, 8, 1)
+        assert (
+            allocate_invoice_no("FT-INV", store_id=1, day=day) == "FT-INV-1-2526-0001"
+        )
+        assert (
+            allocate_invoice_no("FT-INV", store_id=2, day=day) == "FT-INV-2-2526-0001"
+        )
+        assert (
+            allocate_invoice_no("FT-INV", store_id=1, day=day) == "FT-INV-1-2526-0002"
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_block_allocation_reserves_once_per_block():
+    reset_blocks()
+    try:
+        numbers = [next_invoice_number("B", block_size=10) for _ in range(12)]
+        assert numbers == list(range(1, 13))
+        # Two reservations of 10 numbers each; the rest of the block is cached.
+        assert InvoiceSequence.objects.get(series="B").current == 20
+    finally:
+        reset_blocks()
+
+
+@pytest.mark.django_db
+def test_invoice_save_uses_allocator(django_assert_max_num_queries):
+    booking = Booking.objects.create(name="A", date=date.today(), time=time(10, 0))
+    first = Invoice.objects.create(booking=booking)
+    assert first.invoice_no == "FT-INV-0001"
+    with django_assert_max_num_queries(5):
+        second = Invoice.objects.create(booking=booking)
+    assert second.invoice_no == "FT-INV-0002"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_switching_between_block_and_gapless_never_reuses_numbers():
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        pytest.skip("block mode draws from a PostgreSQL sequence")
+    reset_blocks()
+    try:
+        assert [next_invoice_number("M", block_size=5) for _ in range(2)] == [1, 2]
+        # Gapless continues past the whole reserved block...
+        assert [next_invoice_number("M", block_size=1) for _ in range(2)] == [6, 7]
+        reset_blocks()
+        # ...and the next block continues past the gapless numbers.
+        assert next_invoice_number("M", block_size=5) == 8
+    finally:
+        reset_blocks()
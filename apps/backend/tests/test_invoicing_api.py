@@ -1,7 +1,9 @@
 import pytest
 from datetime import date, time
 from rest_framework.test import APIClient
+from decimal import Decimal
 from bookings.models import Booking
+from invoicing.models import Invoice, InvoiceLineItem
 
 
 @pytest.mark.django_db
@@ -43,3 +45,111 @@ def test_invoice_creation_and_payment(admin_user):
     }
     pay_resp = client.post("/api/payments/", pay_payload, format="json")
     assert pay_resp.status_code == 201
+
+
+def _line(n, **extra):
+    return {
+        "description": f"Part {n}",
+        "hsn_code": "8517",
+        "quantity": 2,
+        "unit_price": "10.50",
+        **extra,
+    }
+
+
+@pytest.mark.django_db
+def test_invoice_lines_bulk_created_in_constant_queries(
+    admin_user, django_assert_max_num_queries
+):
+    booking = Booking.objects.create(name="Bulk", date=date.today(), time=time(10, 0))
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    payload = {
+        "booking": booking.id,
+        "cgst": 9,
+        "sgst": 9,
+        "igst": 0,
+        "line_items": [_line(n) for n in range(40)],
+    }
+    with django_assert_max_num_queries(15):
+        resp = client.post("/api/invoices/", payload, format="json")
+    assert resp.status_code == 201
+    assert len(resp.data["line_items"]) == 40
+    assert resp.data["subtotal"] == "840.00"
+    assert resp.data["cgst"] == "75.60"
+    assert resp.data["total"] == "991.20"
+
+
+@pytest.mark.django_db
+def test_invoice_update_diffs_line_items(admin_user):
+    booking = Booking.objects.create(name="Diff", date=date.today(), time=time(10, 0))
+    client = APIClient()
+    client.force_authenticate(user=admin_user)
+    resp = client.post(
+        "/api/invoices/",
+        {
+            "booking": booking.id,
+            "cgst": 9,
+            "sgst": 9,
+            "igst": 0,
+            "line_items": [_line(1), _line(2), _line(3)],
+        },
+        format="json",
+    )
+    invoice_id = resp.data["id"]
+    first, second, _ = [item["id"] for item in resp.data["line_items"]]
+
+    resp = client.patch(
+        f"/api/invoices/{invoice_id}/",
+        {
+            "line_items": [
+                {**_line(1), "id": first},
+                {**_line(2), "id": second, "quantity": 4},
+                _line(4),
+            ]
+        },
+        format="json",
+    )
+    assert resp.status_code == 200
+    invoice = Invoice.objects.get(pk=invoice_id)
+    lines = {line.description: line for line in invoice.line_items.all()}
+    assert set(lines) == {"Part 1", "Part 2", "Part 4"}
+    assert lines["Part 1"].pk == first
+    assert lines["Part 2"].pk == second and lines["Part 2"].amount == Decimal("42.00")
+    assert invoice.subtotal == Decimal("84.00")
+    # Rates are kept from the original invoice when not resent.
+    assert invoice.cgst == Decimal("7.56")
+    assert invoice.total == Decimal("99.12")
+
+    # A tiny subtotal rounds the tax to 0.09 (8.57% of 1.05) but re-pricing
+    # the lines still applies the stored 9%.
+    small = client.post(
+        "/api/invoices/",
+        {
+            "booking": booking.id,
+            "cgst": 9,
+            "line_items": [{**_line(5), "quantity": 1, "unit_price": "1.05"}],
+        },
+        format="json",
+    )
+    assert small.data["cgst"] == "0.09" and small.data["cgst_rate"] == "9.00"
+    resp = client.patch(
+        f"/api/invoices/{small.data['id']}/",
+        {"line_items": [{**_line(5), "quantity": 1, "unit_price": "1000.00"}]},
+        format="json",
+    )
+    assert resp.data["cgst"] == "90.00"
+
+    other = client.post(
+        "/api/invoices/",
+        {"booking": booking.id, "line_items": [_line(9)]},
+        format="json",
+    )
+    foreign = other.data["line_items"][0]["id"]
+    resp = client.patch(
+        f"/api/invoices/{invoice_id}/",
+        {"line_items": [{**_line(1), "id": foreign}]},
+        format="json",
+    )
+    assert resp.status_code == 400
+    assert InvoiceLineItem.objects.filter(invoice_id=invoice_id).count() == 3
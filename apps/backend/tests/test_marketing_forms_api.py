@@ -31,7 +31,7 @@ def _captcha_fail(*args, **kwargs):
 )
 def test_contact_form_submission(monkeypatch):
     client = APIClient()
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     data = {
         "name": "John",
         "mobile_no": "1234567890",
@@ -46,7 +46,7 @@ def test_contact_form_submission(monkeypatch):
 @pytest.mark.django_db
 def test_contact_form_invalid_captcha(monkeypatch):
     client = APIClient()
-    monkeypatch.setattr(requests, "post", _captcha_fail)
+    monkeypatch.setattr(requests.Session, "post", _captcha_fail)
     data = {
         "name": "John",
         "mobile_no": "",
@@ -66,7 +66,7 @@ def test_contact_form_invalid_captcha(monkeypatch):
 )
 def test_schedule_call_submission(monkeypatch):
     client = APIClient()
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     data = {
         "name": "John",
         "date": "2024-01-01",
@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry():
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_merges_workers(admin_user, advisor1, settings):
+    settings.METRICS_SLOW_REQUEST_MS = 0
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    for _ in range(2):
+        assert client.get("/api/logs/").status_code == 200
+
+    # Workers on two hosts that happen to share a pid.
+    for worker, count in (("web-1:1", 1), ("web-2:1", 2)):
+        other = {("GET", "api/logs/", "200"): metrics._new_series()}
+        other[("GET", "api/logs/", "200")].update(count=count, queries=3)
+        cache.set(metrics._worker_key(worker), other)
+    cache.set(metrics.WORKERS_KEY, {"web-1:1", "web-2:1"})
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("text/plain; version=0.0.4")
+    body = resp.content.decode()
+    labels = 'method="GET",route="api/logs/",status="200"'
+    assert f"http_request_duration_seconds_count{{{labels}}} 5" in body
+    assert f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 5' in body
+    assert f"http_response_size_bytes_count{{{labels}}} 2" in body
+    queries = next(
+        line
+        for line in body.splitlines()
+        if line.startswith(f"http_request_db_queries_total{{{labels}}}")
+    )
+    assert int(queries.rsplit(" ", 1)[1]) > 6
+
+    client.force_authenticate(advisor1)
+    assert client.get("/metrics").status_code == 403
+
+
+@pytest.mark.django_db
+def test_slow_request_logged_with_slowest_sql(admin_user, settings, caplog):
+    from activity.models import EventLog
+
+    EventLog.objects.create(entity_type="booking", entity_id="1", action="created")
+    settings.METRICS_SLOW_REQUEST_MS = 0.001
+    settings.METRICS_SLOW_SQL_COUNT = 1
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    with caplog.at_level(logging.WARNING, logger="utils.middleware"):
+        client.get("/api/logs/?entity_type=booking")
+
+    (record,) = [r for r in caplog.records if r.name == "utils.middleware"]
+    message = record.getMessage()
+    assert message.startswith("Slow request GET /api/logs/?entity_type=booking")
+    assert "queries=2" in message
+    assert message.count("ms SELECT") == 1
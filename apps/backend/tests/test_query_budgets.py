@@ -0,0 +1,258 @@
+"""List endpoints must not issue a query per row (no N+1 serialization)."""
+
+import itertools
+from datetime import date, time as dtime, timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from activity.models import EventLog
+from attendance.models import Attendance, AttendanceRequest, Shift
+from bookings.models import Booking, BookingDetails, CustomerResponse, Issue, OtherIssue
+from catalog.models import (
+    Category,
+    Department,
+    Product,
+    Quality,
+    SubCategory,
+    Unit,
+    Variant,
+)
+from inventory.models import SerialNumber, StockEntry, StockLedger
+from invoicing.models import Invoice, InvoiceLineItem, PaymentRecord
+from marketing.models import Brand
+from sales.models import SaleInvoice, SaleInvoiceLineItem
+from spares.models import Spare
+from store.models import Store, StoreGeofence
+
+_seq = itertools.count(1)
+
+
+def _user(role="advisor", **extra):
+    n = next(_seq)
+    return get_user_model().objects.create_user(
+        username=f"user{n}",
+        email=f"user{n}@example.com",
+        password="pw",
+        role=role,
+        first_name="F",
+        last_name=f"L{n}",
+        **extra,
+    )
+
+
+def _store(**extra):
+    n = next(_seq)
+    return Store.objects.create(store_name=f"Store {n}", code=f"Q{n}", **extra)
+
+
+def _booking():
+    booking = Booking.objects.create(
+        name="Customer",
+        email="c@example.com",
+        date=date.today(),
+        time=dtime(9, 0),
+        store=_store(),
+    )
+    details = BookingDetails.objects.create(booking_for=booking, brand="B")
+    details.issues.add(Issue.objects.create(issue_name=f"Issue {next(_seq)}"))
+    details.other_issues.add(
+        OtherIssue.objects.create(other_issue="Other", other_issue_value=10)
+    )
+    CustomerResponse.objects.create(booking=booking, question="Q?", response="A")
+    return booking
+
+
+def _invoice():
+    invoice = Invoice.objects.create(booking=_booking(), created_by=_user())
+    InvoiceLineItem.objects.create(
+        invoice=invoice,
+        description="Screen",
+        unit_price=Decimal("10"),
+        amount=Decimal("10"),
+    )
+    return invoice
+
+
+def seed_bookings(n):
+    for _ in range(n):
+        _booking()
+
+
+def seed_invoices(n):
+    for _ in range(n):
+        _invoice()
+
+
+def seed_payments(n):
+    for _ in range(n):
+        PaymentRecord.objects.create(
+            invoice=_invoice(), mode="cash", amount=Decimal("10")
+        )
+
+
+def seed_logs(n):
+    for _ in range(n):
+        EventLog.objects.create(
+            actor=_user(), entity_type="booking", entity_id="1", action="created"
+        )
+
+
+def seed_stores(n):
+    for _ in range(n):
+        _store(authority=_user(role="branch_head"))
+
+
+def seed_spares(n):
+    for _ in range(n):
+        i = next(_seq)
+        quality = Quality.objects.create(name=f"Quality {i}")
+        Spare.objects.create(name="Part", sku=f"SKU{i}", price=10, quality=quality)
+
+
+def seed_users(n):
+    for _ in range(n):
+        _user(store=_store())
+
+
+def seed_categories(n):
+    for _ in range(n):
+        dept = Department.objects.create(name=f"Department {next(_seq)}")
+        Category.objects.create(name=f"Category {next(_seq)}", department=dept)
+
+
+def seed_subcategories(n):
+    for _ in range(n):
+        dept = Department.objects.create(name=f"Department {next(_seq)}")
+        category = Category.objects.create(
+            name=f"Category {next(_seq)}", department=dept
+        )
+        SubCategory.objects.create(name=f"Sub {next(_seq)}", category=category)
+
+
+def seed_brands(n):
+    for _ in range(n):
+        Brand.objects.create(name=f"Brand {next(_seq)}")
+
+
+def _product():
+    i = next(_seq)
+    dept = Department.objects.create(name=f"Department {i}")
+    category = Category.objects.create(name=f"Category {i}", department=dept)
+    return Product.objects.create(
+        name=f"Product {i}",
+        brand=Brand.objects.create(name=f"Brand {i}"),
+        subcategory=SubCategory.objects.create(name=f"Sub {i}", category=category),
+        unit=Unit.objects.create(name=f"Unit {i}"),
+        price=10,
+    )
+
+
+def _variant():
+    return Variant.objects.create(
+        product=_product(), variant_name=f"Variant {next(_seq)}", price=10
+    )
+
+
+def seed_products(n):
+    for _ in range(n):
+        _product()
+
+
+def seed_variants(n):
+    for _ in range(n):
+        _variant()
+
+
+def seed_stock_entries(n):
+    for _ in range(n):
+        StockEntry.objects.create(
+            entry_type=StockEntry.PURCHASE,
+            store=_store(),
+            product_variant=_variant(),
+            quantity=1,
+            unit_price=10,
+            entered_by=_user(),
+        )
+
+
+def seed_stock_ledgers(n):
+    for _ in range(n):
+        StockLedger.objects.create(store=_store(), product_variant=_variant())
+
+
+def seed_serials(n):
+    for _ in range(n):
+        SerialNumber.objects.create(
+            product_variant=_variant(), serial_no=f"SN{next(_seq)}", store=_store()
+        )
+
+
+def seed_sale_invoices(n):
+    for _ in range(n):
+        invoice = SaleInvoice.objects.create(
+            customer_name="Customer", customer_phone="9000000000"
+        )
+        SaleInvoiceLineItem.objects.create(
+            invoice=invoice, description="Part", quantity=1, unit_price=10
+        )
+
+
+def seed_geofences(n):
+    for _ in range(n):
+        StoreGeofence.objects.create(store=_store(), latitude=0, longitude=0)
+
+
+def seed_approvals(n):
+    shift = Shift.objects.create(
+        name=f"Shift {next(_seq)}", start_time=dtime(9, 0), end_time=dtime(18, 0)
+    )
+    for i in range(n):
+        advisor = _user(store=_store())
+        attendance = Attendance.objects.create(
+            user=advisor,
+            store=advisor.store,
+            date=date(2025, 8, 1) + timedelta(days=i),
+            shift=shift,
+            status="PENDING_APPROVAL",
+        )
+        AttendanceRequest.objects.create(
+            attendance=attendance, type="OT", requested_by=advisor, decided_by=_user()
+        )
+
+
+LIST_ENDPOINTS = [
+    ("/api/bookings?size=50", seed_bookings),
+    ("/api/invoices/?size=50", seed_invoices),
+    ("/api/payments/?size=50", seed_payments),
+    ("/api/logs/?size=50", seed_logs),
+    ("/api/stores?size=50", seed_stores),
+    ("/api/spares?size=50", seed_spares),
+    ("/api/users?size=50", seed_users),
+    ("/api/categories?size=50", seed_categories),
+    ("/api/subcategories?size=50", seed_subcategories),
+    ("/api/brands/?size=50", seed_brands),
+    ("/api/products?size=50", seed_products),
+    ("/api/variants?size=50", seed_variants),
+    ("/api/stock-entries/?size=50", seed_stock_entries),
+    ("/api/stock-ledgers/?size=50", seed_stock_ledgers),
+    ("/api/serials/?size=50", seed_serials),
+    ("/api/sales/products/", seed_products),
+    ("/api/sales/invoices/?size=50", seed_sale_invoices),
+    ("/api/attendance/admin/geofences", seed_geofences),
+    ("/api/attendance/approvals?size=50", seed_approvals),
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url,seed", LIST_ENDPOINTS, ids=[url.split("?")[0] for url, _ in LIST_ENDPOINTS]
+)
+def test_list_query_count_independent_of_rows(
+    assert_constant_queries, admin_user, url, seed
+):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    assert_constant_queries(client, url, seed)
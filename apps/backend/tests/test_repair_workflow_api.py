@@ -48,7 +48,7 @@ def test_issue_crud_requires_admin():
     }
 )
 def test_booking_with_nested_details_and_responses(monkeypatch):
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     client = APIClient()
     issue = Issue.objects.create(issue_name="Screen")
     question = Question.objects.create(question_set_name="A", question="Is it working?")
@@ -82,7 +82,7 @@ def test_booking_with_nested_details_and_responses(monkeypatch):
     }
 )
 def test_customer_response_immutable(monkeypatch):
-    monkeypatch.setattr(requests, "post", _captcha_ok)
+    monkeypatch.setattr(requests.Session, "post", _captcha_ok)
     client = APIClient()
     data = {
         "name": "Jane",
@@ -43,7 +43,7 @@ def test_system_admin_store_report(admin_user, store_s1, seed_reports):
     csv_resp = client.get(url + "&format=csv")
     assert csv_resp.status_code == 200
     assert csv_resp["Content-Type"] == "text/csv"
-    assert b"User ID" in csv_resp.content.splitlines()[0]
+    assert b"User ID" in b"".join(csv_resp.streaming_content).splitlines()[0]
 
 
 @pytest.mark.django_db
@@ -59,7 +59,7 @@ def test_advisor_me_report(advisor1, seed_reports):
     csv_resp = client.get("/api/attendance/reports/me?month=2025-08&format=csv")
     assert csv_resp.status_code == 200
     assert csv_resp["Content-Type"] == "text/csv"
-    assert b"Date" in csv_resp.content.splitlines()[0]
+    assert b"Date" in b"".join(csv_resp.streaming_content).splitlines()[0]
 
 
 @pytest.mark.django_db
@@ -72,3 +72,85 @@ def test_branch_head_scoping(branch_head, store_s2, seed_reports):
     assert ok.status_code == 200
     forbidden = client.get(f"/api/attendance/reports/store/{store_s2.id}?month=2025-08")
     assert forbidden.status_code == 403
+
+
+@pytest.mark.django_db
+def test_rollup_maintained_incrementally(advisor1, store_s1, day_shift, seed_reports):
+    from attendance.models import AttendanceMonthlyRollup, AttendanceRequest
+
+    rollup = AttendanceMonthlyRollup.objects.get(
+        store=store_s1, user=advisor1, month=date(2025, 8, 1)
+    )
+    assert (rollup.total_shifts, rollup.present_days, rollup.half_days) == (2, 1, 1)
+    assert rollup.worked_minutes == 780
+
+    att = Attendance.objects.get(user=advisor1, date=date(2025, 8, 11))
+    req = AttendanceRequest.objects.create(
+        attendance=att,
+        type="OT",
+        requested_by=advisor1,
+        meta={"requested_minutes": 30},
+    )
+    req.approve(actor=advisor1)
+    rollup.refresh_from_db()
+    assert rollup.approved_ot_minutes == 90
+
+    Attendance.objects.filter(user=advisor1).first().delete()
+    Attendance.objects.filter(user=advisor1).first().delete()
+    assert not AttendanceMonthlyRollup.objects.filter(user=advisor1).exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_command(advisor1, store_s1, seed_reports):
+    from django.core.management import call_command
+    from attendance.models import AttendanceMonthlyRollup
+
+    AttendanceMonthlyRollup.objects.all().delete()
+    call_command("rebuild_attendance_rollups", months="2025-07:2025-09")
+    rollup = AttendanceMonthlyRollup.objects.get(user=advisor1)
+    assert rollup.month == date(2025, 8, 1)
+    assert rollup.approved_ot_minutes == 60
+
+
+@pytest.mark.django_db
+def test_store_report_reads_one_row_per_advisor(
+    django_assert_max_num_queries, admin_user, store_s1, seed_reports
+):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    url = f"/api/attendance/reports/store/{store_s1.id}?month=2025-08"
+    with django_assert_max_num_queries(2):
+        resp = client.get(url)
+    assert resp.json()["advisors"][0]["total_shifts"] == 2
+
+
+@pytest.mark.django_db
+def test_rollup_follows_record_moved_to_other_store_and_month(
+    advisor1, store_s1, store_s2, seed_reports
+):
+    from attendance.models import AttendanceMonthlyRollup
+
+    moved = Attendance.objects.get(user=advisor1, date=date(2025, 8, 11))
+    moved.store = store_s2
+    moved.date = date(2025, 9, 1)
+    moved.save()
+
+    rollups = {
+        (r.store_id, r.month): r.total_shifts
+        for r in AttendanceMonthlyRollup.objects.filter(user=advisor1)
+    }
+    assert rollups == {
+        (store_s1.id, date(2025, 8, 1)): 1,
+        (store_s2.id, date(2025, 9, 1)): 1,
+    }
+
+    moved.store = store_s1
+    moved.save(update_fields=["store"])
+    rollups = {
+        (r.store_id, r.month): r.total_shifts
+        for r in AttendanceMonthlyRollup.objects.filter(user=advisor1)
+    }
+    assert rollups == {
+        (store_s1.id, date(2025, 8, 1)): 1,
+        (store_s1.id, date(2025, 9, 1)): 1,
+    }
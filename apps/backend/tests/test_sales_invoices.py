@@ -0,0 +1,103 @@
+import zipfile
+from datetime import datetime
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from sales.models import SaleInvoice, SaleInvoiceLineItem
+from sales.pdf import pdf_etag, pdf_path, pending_render
+
+
+@pytest.fixture
+def pdf_storage(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def admin_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+def _invoice(user, status="issued", issued_at=None, **extra):
+    invoice = SaleInvoice.objects.create(
+        customer_name="Asha",
+        customer_phone="9000000000",
+        status=status,
+        issued_at=issued_at or timezone.now(),
+        created_by=user,
+        **extra,
+    )
+    SaleInvoiceLineItem.objects.create(
+        invoice=invoice, description="Screen guard", quantity=1, unit_price=199
+    )
+    return invoice
+
+
+@pytest.mark.django_db
+def test_invoice_pdf_is_cached_and_revalidated_by_etag(
+    admin_client, admin_user, pdf_storage
+):
+    invoice = _invoice(admin_user)
+    url = f"/api/sales/invoices/{invoice.pk}/pdf/"
+
+    resp = admin_client.get(url)
+    assert resp.status_code == 200
+    assert resp.content.startswith(b"%PDF")
+    etag = resp["ETag"]
+    assert etag == pdf_etag(invoice)
+    assert default_storage.exists(pdf_path(invoice))
+    invoice.refresh_from_db()
+    assert invoice.pdf_version == invoice.updated_at
+    assert not pending_render().filter(pk=invoice.pk).exists()
+
+    resp = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["ETag"] == etag
+
+    # Any edit moves the invoice to a new key, so the old ETag is stale.
+    invoice.customer_name = "Asha K"
+    invoice.save()
+    assert pending_render().filter(pk=invoice.pk).exists()
+    resp = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp["ETag"] == pdf_etag(invoice) != etag
+
+    draft = _invoice(admin_user, status="draft")
+    resp = admin_client.get(f"/api/sales/invoices/{draft.pk}/pdf/")
+    assert resp.status_code == 200 and not resp.has_header("ETag")
+    assert not default_storage.exists(pdf_path(draft))
+
+
+@pytest.mark.django_db
+def test_pdf_batch_zips_rendered_invoices_and_lists_missing(
+    admin_client, admin_user, pdf_storage
+):
+    march = timezone.make_aware(datetime(2025, 3, 10))
+    rendered = _invoice(admin_user, issued_at=march)
+    _invoice(admin_user, status="draft", issued_at=march)
+    _invoice(admin_user, issued_at=timezone.make_aware(datetime(2025, 4, 2)))
+    out = StringIO()
+    call_command("render_invoice_pdfs", stdout=out)
+    assert "rendered=2 failed=0" in out.getvalue()
+    pending = _invoice(admin_user, status="paid", issued_at=march)
+
+    resp = admin_client.get("/api/sales/invoices/pdf-batch/", {"month": "2025-03"})
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/zip"
+    archive = zipfile.ZipFile(BytesIO(b"".join(resp.streaming_content)))
+    assert sorted(archive.namelist()) == [
+        "MISSING.txt",
+        f"invoice_{rendered.invoice_no}.pdf",
+    ]
+    assert archive.read(f"invoice_{rendered.invoice_no}.pdf").startswith(b"%PDF")
+    assert archive.read("MISSING.txt").decode() == f"{pending.invoice_no}\n"
+
+    resp = admin_client.get("/api/sales/invoices/pdf-batch/")
+    assert resp.status_code == 400
@@ -5,6 +5,7 @@ from attendance.models import (
     WeekOff,
     ScheduleException,
     resolve_planned_shift,
+    resolve_planned_shifts,
 )
 
 
@@ -79,3 +80,63 @@ def test_weekoff_and_schedule_exception(advisor1, day_shift, night_shift):
         created_by=advisor1,
     )
     assert resolve_planned_shift(advisor1, override_date) == night_shift
+
+
+@pytest.mark.django_db
+def test_bulk_resolver_matches_single_resolver(
+    advisor1, advisor2, day_shift, night_shift
+):
+    anchor = date(2025, 8, 11)
+    AdvisorSchedule.objects.create(
+        user=advisor1,
+        rule_type="alternate_weekly",
+        anchor_monday=anchor,
+        week_even_shift=day_shift,
+        week_odd_shift=night_shift,
+    )
+    AdvisorSchedule.objects.create(
+        user=advisor2,
+        rule_type="fixed",
+        anchor_monday=anchor,
+        default_shift=day_shift,
+    )
+    WeekOff.objects.create(user=advisor1, weekday=6)
+    ScheduleException.objects.create(
+        user=advisor2,
+        date=anchor + timedelta(days=3),
+        mark_off=True,
+        created_by=advisor2,
+    )
+    ScheduleException.objects.create(
+        user=advisor2,
+        date=anchor + timedelta(days=4),
+        override_shift=night_shift,
+        created_by=advisor2,
+    )
+
+    end = anchor + timedelta(days=13)
+    plan = resolve_planned_shifts([advisor1, advisor2], anchor, end)
+
+    assert len(plan) == 2 * 14
+    day = anchor
+    while day <= end:
+        for user in (advisor1, advisor2):
+            assert plan[(user.id, day)] == resolve_planned_shift(user, day)
+        day += timedelta(days=1)
+
+
+@pytest.mark.django_db
+def test_bulk_resolver_query_count_is_constant(
+    django_assert_num_queries, advisor1, advisor2, day_shift
+):
+    anchor = date(2025, 8, 11)
+    for user in (advisor1, advisor2):
+        AdvisorSchedule.objects.create(
+            user=user, rule_type="fixed", anchor_monday=anchor, default_shift=day_shift
+        )
+
+    with django_assert_num_queries(3):
+        plan = resolve_planned_shifts(
+            [advisor1.id, advisor2.id], anchor, anchor + timedelta(days=30)
+        )
+    assert plan[(advisor2.id, anchor)] == day_shift
@@ -0,0 +1,90 @@
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from catalog.models import Brand, Product, Quality
+from search.backends import search_ids
+from search.models import SearchDocument
+from spares.models import Spare
+
+
+def _skus(resp):
+    return [row["sku"] for row in resp.json()["content"]]
+
+
+@pytest.mark.django_db
+def test_spare_search_matches_prefixes_across_fields():
+    oem = Quality.objects.create(name="OEM")
+    Spare.objects.create(name="Brake pad", sku="BP1", price=10, quality=oem)
+    Spare.objects.create(name="Brake cable", sku="BC1", price=10)
+    Spare.objects.create(name="Seat", sku="ST1", price=20, quality=oem)
+    client = APIClient()
+
+    assert sorted(_skus(client.get("/api/spares?search=bra"))) == ["BC1", "BP1"]
+    assert _skus(client.get("/api/spares?search=brake oem")) == ["BP1"]
+    assert _skus(client.get("/api/spares?search=bc1")) == ["BC1"]
+    assert _skus(client.get("/api/spares?search=bra&ordering=-sku")) == ["BP1", "BC1"]
+
+
+@pytest.mark.django_db
+def test_related_rename_and_delete_reindex_documents():
+    quality = Quality.objects.create(name="OEM")
+    spare = Spare.objects.create(name="Mirror", sku="MR1", price=5, quality=quality)
+    assert search_ids("spare", "oem") == [spare.pk]
+
+    quality.name = "Aftermarket"
+    quality.save()
+    assert search_ids("spare", "oem") == []
+    assert search_ids("spare", "aftermarket") == [spare.pk]
+
+    quality.delete()  # SET_NULL on the spare
+    assert search_ids("spare", "aftermarket") == []
+    assert search_ids("spare", "mirror") == [spare.pk]
+
+    spare.delete()
+    assert not SearchDocument.objects.filter(kind="spare").exists()
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index_command(capsys):
+    spare = Spare.objects.create(name="Horn", sku="HN1", price=5)
+    SearchDocument.objects.all().delete()
+    assert search_ids("spare", "horn") == []
+
+    call_command("rebuild_search_index", "--kind=spare")
+    assert "spare: 1 documents" in capsys.readouterr().out
+    assert search_ids("spare", "horn") == [spare.pk]
+
+
+@pytest.mark.django_db
+def test_paginated_search_is_not_capped(settings):
+    settings.SEARCH_MAX_RESULTS = 2
+    for i in range(5):
+        Spare.objects.create(name=f"Clutch plate {i}", sku=f"CP{i}", price=10)
+    Spare.objects.create(name="Clutch", sku="C", price=10)
+    client = APIClient()
+
+    data = client.get("/api/spares?search=clutch&size=2&page=2").json()
+    assert data["totalElements"] == 6
+    assert len(data["content"]) == 2 and data["last"]
+    # The closest match ranks first.
+    assert _skus(client.get("/api/spares?search=clutch&size=2"))[0] == "C"
+
+
+@pytest.mark.django_db
+def test_invoice_product_search_skips_unavailable_matches(admin_user):
+    brand = Brand.objects.create(name="Acme")
+    for i in range(10):
+        Product.objects.create(
+            name=f"Charger {i}", brand=brand, price=10, availability=False
+        )
+    Product.objects.create(
+        name="Fast charger with braided cable", brand=brand, price=10
+    )
+    client = APIClient()
+    client.force_authenticate(admin_user)
+
+    data = client.get("/api/sales/products/?search=charger").json()
+    assert [row["name"] for row in data["content"]] == [
+        "Fast charger with braided cable"
+    ]
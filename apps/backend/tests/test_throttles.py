@@ -0,0 +1,72 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import ThrottleCounter
+from accounts.throttles import SlidingWindowRateThrottle, sweep_expired
+from bookings.throttles import BookingRateThrottle
+from bookings.views import BookingViewSet
+
+
+def _throttle_class(store, clock):
+    class Throttle(SlidingWindowRateThrottle):
+        rate = "4/min"
+        scope = "test"
+        timer = staticmethod(lambda: clock[0])
+
+        def get_cache_key(self, request, view):
+            return f"test:{self.get_ident(request)}"
+
+    Throttle.store = store
+    return Throttle
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("store", ["database", "cache"])
+def test_sliding_window_weights_previous_window(store):
+    clock = [600.0]  # start of a one minute window
+    throttle_class = _throttle_class(store, clock)
+    request = APIRequestFactory().get("/", REMOTE_ADDR="10.1.1.1")
+    other = APIRequestFactory().get("/", REMOTE_ADDR="10.1.1.2")
+
+    assert [throttle_class().allow_request(request, None) for _ in range(5)] == [
+        True,
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert throttle_class().allow_request(other, None)
+
+    # Halfway into the next window the 5 earlier hits weigh 2.5.
+    clock[0] = 690.0
+    throttle = throttle_class()
+    assert throttle.allow_request(request, None)  # 2.5 + 1
+    assert not throttle.allow_request(request, None)  # 2.5 + 2
+    assert throttle.wait() == pytest.approx(18.0)
+
+    # Two windows later nothing is left.
+    clock[0] = 790.0
+    assert throttle_class().allow_request(request, None)
+
+
+@pytest.mark.django_db
+def test_sweep_removes_quiet_clients():
+    clock = [0.0]
+    throttle_class = _throttle_class("database", clock)
+    request = APIRequestFactory().get("/", REMOTE_ADDR="10.1.1.1")
+    throttle_class().allow_request(request, None)
+    assert ThrottleCounter.objects.count() == 1
+
+    assert sweep_expired() == 1
+    assert not ThrottleCounter.objects.exists()
+
+
+@pytest.mark.django_db
+def test_booking_rate_refuses_anonymous_clients():
+    request = APIRequestFactory().post("/api/bookings", REMOTE_ADDR="10.1.1.3")
+    request.user = AnonymousUser()
+    view = BookingViewSet()
+    allowed = [BookingRateThrottle().allow_request(request, view) for _ in range(6)]
+    # "booking" is 5/hour.
+    assert allowed == [True] * 5 + [False]
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from attendance.models import AdvisorPayrollProfile, AdvisorSchedule
+
+
+@pytest.fixture
+def admin_client(admin_user):
+    client = APIClient()
+    client.force_authenticate(admin_user)
+    return client
+
+
+@pytest.mark.django_db
+def test_import_csv_creates_users_profiles_and_schedules(
+    admin_client, store_s1, store_s2, day_shift, night_shift
+):
+    csv_file = SimpleUploadedFile(
+        "advisors.csv",
+        (
+            "username,email,password,role,store,store_code,hourly_rate,"
+            "shift,week_even_shift,week_odd_shift\n"
+            f"adv1,ADV1@example.com,pw1,advisor,{store_s1.id},,150,Day,,\n"
+            "adv2,adv2@example.com,pw2,advisor,,S2,,,Day,Night\n"
+            "head2,head2@example.com,,branch_head,,S2,,,,\n"
+        ).encode(),
+        content_type="text/csv",
+    )
+    resp = admin_client.post("/api/users/import", {"file": csv_file})
+    assert resp.status_code == 201, resp.json()
+    assert [u["username"] for u in resp.json()] == ["adv1", "adv2", "head2"]
+
+    User = get_user_model()
+    adv1, adv2, head2 = (
+        User.objects.get(username=n) for n in ("adv1", "adv2", "head2")
+    )
+    assert adv1.email == "adv1@example.com" and adv1.store == store_s1
+    assert adv1.check_password("pw1") and adv2.store == store_s2
+    assert not head2.has_usable_password()
+    assert AdvisorPayrollProfile.objects.get(user=adv1).hourly_rate == 150
+    assert AdvisorPayrollProfile.objects.filter(user=head2).count() == 0
+    fixed = AdvisorSchedule.objects.get(user=adv1)
+    assert (fixed.rule_type, fixed.default_shift) == ("fixed", day_shift)
+    assert fixed.anchor_monday.weekday() == 0
+    weekly = AdvisorSchedule.objects.get(user=adv2)
+    assert (weekly.week_even_shift, weekly.week_odd_shift) == (day_shift, night_shift)
+
+
+@pytest.mark.django_db
+def test_import_rejects_whole_batch_with_row_errors(admin_client, advisor1, store_s1):
+    rows = [
+        {"username": "new1", "email": "new1@example.com", "store_code": "S1"},
+        {"username": advisor1.username, "email": "x@example.com"},
+        {"username": "new1", "email": "new2@example.com", "store": 999},
+    ]
+    resp = admin_client.post("/api/users/import", rows, format="json")
+    assert resp.status_code == 400
+    errors = resp.json()
+    assert errors[0] == {}
+    assert "already exists" in errors[1]["username"][0]
+    assert "Duplicate of row 1" in errors[2]["username"][0]
+    assert "does not exist" in errors[2]["store"][0]
+    assert not get_user_model().objects.filter(username="new1").exists()
+
+    too_many = [{"username": f"u{i}", "email": f"u{i}@example.com"} for i in range(101)]
+    resp = admin_client.post("/api/users/import", too_many, format="json")
+    assert resp.status_code == 400
+
+
+@pytest.mark.django_db
+def test_import_users_command_hashes_in_worker_processes(tmp_path, settings, store_s1):
+    settings.PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    path = tmp_path / "advisors.jsonl"
+    path.write_text(
+        "\n".join(
+            json.dumps(
+                {
+                    "username": f"bulk{i}",
+                    "email": f"bulk{i}@example.com",
+                    "password": f"secret{i}",
+                    "store_code": "S1",
+                }
+            )
+            for i in range(20)
+        )
+    )
+    call_command("import_users", str(path), "--workers=2")
+
+    users = get_user_model().objects.filter(username__startswith="bulk")
+    assert users.count() == 20
+    user = users.get(username="bulk7")
+    assert check_password("secret7", user.password)
+    assert AdvisorPayrollProfile.objects.filter(user__in=users).count() == 20
@@ -0,0 +1,90 @@
+"""Versioned read-through caching for read-mostly API endpoints.
+
+Cached entries are grouped in *namespaces*. Every key embeds the namespace's
+current version, so invalidating a namespace is a single counter bump: old
+entries simply stop being read and age out of the cache. Versions start from
+a timestamp rather than ``1`` so a version key evicted from the cache can
+never resurrect entries written under an earlier version.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+DEFAULT_TIMEOUT = 3600
+
+
+def _version_key(namespace: str) -> str:
+    return f"ns:{namespace}:version"
+
+
+def namespace_version(namespace: str) -> int:
+    """Return the current version of ``namespace``, creating it if needed."""
+
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_namespace(namespace: str) -> None:
+    """Invalidate every entry cached under ``namespace``.
+
+    The version is bumped immediately, so reads later in the same transaction
+    miss, and again on commit, so a concurrent request that cached pre-commit
+    data in between is discarded as well.
+    """
+
+    def _bump():
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+class CachedResponseMixin:
+    """Serve ``list``/``retrieve`` from the cache for a DRF viewset.
+
+    Set ``cache_namespace`` on the viewset and bump it with
+    :func:`bump_namespace` whenever the underlying data changes. Serialized
+    ``response.data`` is cached (not rendered bytes), so content negotiation
+    still happens per request. Keys include the absolute URL with query
+    string, so filters and pagination are cached independently.
+    """
+
+    cache_namespace: str = ""
+    cache_timeout = None
+
+    def _cache_key(self, request) -> str:
+        version = namespace_version(self.cache_namespace)
+        url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        return f"resp:{self.cache_namespace}:{version}:{self.action}:{url}"
+
+    def _cached(self, request, handler, *args, **kwargs):
+        key = self._cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.cache_timeout or getattr(
+                settings, "CATALOG_CACHE_TIMEOUT", DEFAULT_TIMEOUT
+            )
+            cache.set(key, response.data, timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,252 @@
+"""Per-route request metrics in the Prometheus text format.
+
+:class:`utils.middleware.RequestMetricsMiddleware` times every request,
+counts its SQL queries and their time, and measures the response size. The
+results are aggregated here per ``(method, route, status)``. ``route`` is the
+URL pattern that matched (``api/stock-entries/<pk>/``), not the raw path, so
+the number of series stays bounded.
+
+Each worker process aggregates in memory, so recording a request takes no
+I/O. Every ``METRICS_PUBLISH_INTERVAL`` seconds a worker copies its totals to
+the shared cache. :func:`collect` merges the calling worker's live totals
+with the latest copies of all other workers, so a scrape of ``/metrics`` sees
+the whole deployment whichever worker answers it. Workers are told apart by
+host name and pid, since hosts sharing one cache reuse the same pids. A
+worker that stops publishing drops out once its copy expires, which
+Prometheus treats as a counter reset.
+"""
+
+import os
+import re
+import socket
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+UNMATCHED_ROUTE = "<unmatched>"
+
+DEFAULT_PUBLISH_INTERVAL = 15
+WORKERS_KEY = "metrics:workers"
+
+SeriesKey = Tuple[str, str, str]
+
+_GROUP_RE = re.compile(r"\(\?P<(\w+)>[^)]*\)")
+
+
+def route_of(request) -> str:
+    """The URL pattern ``request`` matched, readable for regex routes too."""
+
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return _GROUP_RE.sub(r"<\1>", match.route).replace("^", "").replace("$", "")
+
+
+def _bucket(buckets, value) -> int:
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            return index
+    return len(buckets)
+
+
+def _new_series() -> dict:
+    return {
+        "count": 0,
+        "seconds": 0.0,
+        "latency": [0] * (len(LATENCY_BUCKETS) + 1),
+        "queries": 0,
+        "query_seconds": 0.0,
+        "sized": 0,
+        "bytes": 0,
+        "size": [0] * (len(SIZE_BUCKETS) + 1),
+    }
+
+
+def merge(into: Dict[SeriesKey, dict], series: Dict[SeriesKey, dict]) -> None:
+    """Add the totals of ``series`` to ``into``."""
+
+    for key, values in series.items():
+        target = into.setdefault(key, _new_series())
+        for field, value in values.items():
+            if isinstance(value, list):
+                target[field] = [a + b for a, b in zip(target[field], value)]
+            else:
+                target[field] += value
+
+
+class Registry:
+    """Thread-safe totals of one worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[SeriesKey, dict] = {}
+        self._published = 0.0
+
+    def observe(
+        self,
+        key: SeriesKey,
+        seconds: float,
+        queries: int,
+        query_seconds: float,
+        size: Optional[int],
+    ) -> None:
+        """Record one request; ``size`` is ``None`` for streamed responses."""
+
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _new_series()
+            series["count"] += 1
+            series["seconds"] += seconds
+            series["latency"][_bucket(LATENCY_BUCKETS, seconds)] += 1
+            series["queries"] += queries
+            series["query_seconds"] += query_seconds
+            if size is not None:
+                series["sized"] += 1
+                series["bytes"] += size
+                series["size"][_bucket(SIZE_BUCKETS, size)] += 1
+
+    def snapshot(self) -> Dict[SeriesKey, dict]:
+        with self._lock:
+            return {
+                key: {
+                    field: list(value) if isinstance(value, list) else value
+                    for field, value in series.items()
+                }
+                for key, series in self._series.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._published = 0.0
+
+    def publish_due(self, interval: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._published < interval:
+                return False
+            self._published = now
+            return True
+
+
+registry = Registry()
+
+
+def _interval() -> float:
+    return getattr(settings, "METRICS_PUBLISH_INTERVAL", DEFAULT_PUBLISH_INTERVAL)
+
+
+def _worker_id() -> str:
+    # Looked up per call: forked workers inherit module state from the parent.
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _worker_key(worker: str) -> str:
+    return f"metrics:worker:{worker}"
+
+
+def publish(force: bool = False) -> None:
+    """Copy this worker's totals to the shared cache if the interval passed."""
+
+    interval = _interval()
+    if not force and not registry.publish_due(interval):
+        return
+    worker = _worker_id()
+    # Copies outlive a few missed publishes before the worker is dropped.
+    timeout = max(60, interval * 4)
+    cache.set(_worker_key(worker), registry.snapshot(), timeout)
+    workers = cache.get(WORKERS_KEY) or set()
+    if worker not in workers:
+        # Racing registrations can drop a worker; it is re-added next publish.
+        cache.set(WORKERS_KEY, workers | {worker}, None)
+
+
+def collect() -> Dict[SeriesKey, dict]:
+    """Totals of this worker merged with the published totals of the others."""
+
+    worker = _worker_id()
+    totals = registry.snapshot()
+    workers = (cache.get(WORKERS_KEY) or set()) - {worker}
+    published = cache.get_many([_worker_key(worker) for worker in workers])
+    for series in published.values():
+        merge(totals, series)
+    alive = {other for other in workers if _worker_key(other) in published}
+    if alive != workers:
+        cache.set(WORKERS_KEY, alive | {worker}, None)
+    return totals
+
+
+def _labels(key: SeriesKey, **extra) -> str:
+    method, route, status = key
+    pairs = {"method": method, "route": route, "status": status, **extra}
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs.items()
+    )
+
+
+def _histogram(name, help_text, buckets, series, counts, total, count):
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} histogram"
+    for key, values in sorted(series.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(buckets, values[counts]):
+            cumulative += bucket_count
+            yield f"{name}_bucket{{{_labels(key, le=bound)}}} {cumulative}"
+        yield f"{name}_bucket{{{_labels(key, le='+Inf')}}} {values[count]}"
+        yield f"{name}_sum{{{_labels(key)}}} {values[total]}"
+        yield f"{name}_count{{{_labels(key)}}} {values[count]}"
+
+
+def _counter(name, help_text, series, field) -> Iterable[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} counter"
+    for key, values in sorted(series.items()):
+        yield f"{name}{{{_labels(key)}}} {values[field]}"
+
+
+def render(series: Dict[SeriesKey, dict]) -> str:
+    """Format ``series`` in the Prometheus text exposition format (0.0.4)."""
+
+    lines = [
+        *_histogram(
+            "http_request_duration_seconds",
+            "Time spent producing the response.",
+            LATENCY_BUCKETS,
+            series,
+            "latency",
+            "seconds",
+            "count",
+        ),
+        *_histogram(
+            "http_response_size_bytes",
+            "Size of non-streaming response bodies.",
+            SIZE_BUCKETS,
+            series,
+            "size",
+            "bytes",
+            "sized",
+        ),
+        *_counter(
+            "http_request_db_queries_total",
+            "SQL statements executed while handling requests.",
+            series,
+            "queries",
+        ),
+        *_counter(
+            "http_request_db_duration_seconds_total",
+            "Time spent executing SQL while handling requests.",
+            series,
+            "query_seconds",
+        ),
+    ]
+    return "\n".join(lines) + "\n"
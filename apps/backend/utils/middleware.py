@@ -1,4 +1,14 @@
+import heapq
+import logging
+import time
+from contextlib import ExitStack
+
 from django.conf import settings
+from django.db import connections
+
+from utils import metrics
+
+logger = logging.getLogger(__name__)
 
 
 class SecurityHeadersMiddleware:
@@ -13,3 +23,79 @@ class SecurityHeadersMiddleware:
         if xss:
             response.setdefault("X-XSS-Protection", xss)
         return response
+
+
+class _QueryRecorder:
+    """``execute_wrapper`` that counts and times queries, keeping the slowest."""
+
+    def __init__(self, keep: int):
+        self.keep = keep
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest = []  # min-heap of (seconds, sql)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if len(self.slowest) < self.keep:
+                heapq.heappush(self.slowest, (elapsed, sql))
+            elif self.slowest and elapsed > self.slowest[0][0]:
+                heapq.heapreplace(self.slowest, (elapsed, sql))
+
+
+class RequestMetricsMiddleware:
+    """Record latency, SQL and response size of each request per route.
+
+    Totals are served by ``/metrics`` (see :mod:`utils.metrics`). Requests
+    slower than ``METRICS_SLOW_REQUEST_MS`` are logged as warnings with
+    their ``METRICS_SLOW_SQL_COUNT`` slowest statements; a threshold of ``0``
+    turns the log off. Streamed responses are timed until the
+    response object is returned, before their body is sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = _QueryRecorder(getattr(settings, "METRICS_SLOW_SQL_COUNT", 3))
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        route = metrics.route_of(request)
+        size = None if response.streaming else len(response.content)
+        metrics.registry.observe(
+            (request.method, route, str(response.status_code)),
+            elapsed,
+            recorder.count,
+            recorder.seconds,
+            size,
+        )
+        metrics.publish()
+
+        threshold = getattr(settings, "METRICS_SLOW_REQUEST_MS", 1000)
+        if threshold and elapsed * 1000 >= threshold:
+            slowest = "".join(
+                f"\n  {seconds * 1000:.1f}ms {sql}"
+                for seconds, sql in sorted(recorder.slowest, reverse=True)
+            )
+            logger.warning(
+                "Slow request %s %s (%s) %.0fms status=%s queries=%d db=%.0fms%s",
+                request.method,
+                request.get_full_path(),
+                route,
+                elapsed * 1000,
+                response.status_code,
+                recorder.count,
+                recorder.seconds * 1000,
+                slowest,
+            )
+        return response
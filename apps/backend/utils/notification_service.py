@@ -1,14 +1,47 @@
+from typing import Iterable, List, Optional
+
 import requests
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
 from django.template.loader import render_to_string
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+SMS_TIMEOUT = 5
+# Only retry when the gateway cannot have sent the SMS yet: connection
+# failures and 429s. A 5xx or read timeout may follow a delivered message,
+# so those are left to the outbox's own backoff to avoid duplicate texts.
+SMS_RETRIES = Retry(
+    total=3,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(429,),
+    allowed_methods=frozenset({"POST"}),
+)
+
+_sms_session: Optional[requests.Session] = None
+
+
+def get_sms_session() -> requests.Session:
+    """Return a process-wide pooled session for the SMS gateway."""
+
+    global _sms_session
+    if _sms_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=SMS_RETRIES)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _sms_session = session
+    return _sms_session
 
 
 class NotificationService:
     @staticmethod
     def send_email(to, subject, template, context):
         html_message = render_to_string(template, context)
-        send_mail(subject, "", settings.DEFAULT_FROM_EMAIL, [to], html_message=html_message)
+        send_mail(
+            subject, "", settings.DEFAULT_FROM_EMAIL, [to], html_message=html_message
+        )
 
     @staticmethod
     def send_sms(to, template, context):
@@ -16,14 +49,59 @@ class NotificationService:
             return
         message = render_to_string(template, context).strip()
         try:
-            requests.post(
-                settings.SMS_GATEWAY_URL,
-                data={
-                    "to": to,
-                    "token": getattr(settings, "SMS_GATEWAY_TOKEN", ""),
-                    "message": message,
-                },
-                timeout=5,
-            )
+            NotificationService.post_sms(to, message)
         except requests.RequestException:
             pass
+
+    @staticmethod
+    def send_mass_email(
+        subject, html_message, recipients: Iterable[str], connection=None
+    ) -> List[str]:
+        """Send one pre-rendered HTML email to each recipient over one connection.
+
+        Returns the recipients whose message was not sent, so callers retry
+        only those.
+        """
+
+        connection = connection or get_connection()
+        failed = []
+        for to in recipients:
+            message = EmailMultiAlternatives(
+                subject, "", settings.DEFAULT_FROM_EMAIL, [to], connection=connection
+            )
+            message.attach_alternative(html_message, "text/html")
+            try:
+                sent = connection.send_messages([message])
+            except Exception:  # SMTP errors vary by backend
+                sent = 0
+            if not sent:
+                failed.append(to)
+        return failed
+
+    @staticmethod
+    def post_sms(to, message):
+        """Post a pre-rendered message to the SMS gateway via the pooled session."""
+
+        response = get_sms_session().post(
+            settings.SMS_GATEWAY_URL,
+            data={
+                "to": to,
+                "token": getattr(settings, "SMS_GATEWAY_TOKEN", ""),
+                "message": message,
+            },
+            timeout=SMS_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def send_mass_sms(message, recipients: Iterable[str]) -> List[str]:
+        """Send ``message`` to every recipient and return those that failed."""
+
+        failed = []
+        for to in recipients:
+            try:
+                NotificationService.post_sms(to, message)
+            except requests.RequestException:
+                failed.append(to)
+        return failed
@@ -1,6 +1,61 @@
+"""Spring Data style pagination shared by every list endpoint.
+
+Pages are requested with ``?page=<0-based>&size=<n>`` and answered with the
+Spring ``Page`` JSON shape (``content``, ``totalElements``, ``last`` ...).
+
+Views that set ``cursor_ordering`` also accept ``?cursor=`` to switch to keyset
+pagination: instead of ``OFFSET`` the next page is fetched with a ``WHERE``
+on the ordering columns of the last row seen, so deep pages cost the same as
+the first. Pass an empty ``cursor`` for the first page and the opaque
+``next``/``previous`` values from the response afterwards. The ordering must
+end in a unique column, e.g. ``("-timestamp", "-id")``.
+
+``?count=exact|approx|none`` controls ``totalElements``. ``approx`` uses the
+PostgreSQL planner's row estimate (exact elsewhere). ``none`` skips counting
+and reports ``null`` totals; it only applies to cursor mode, which defaults to
+it, since page numbers cannot be validated without a count.
+"""
+
+import base64
+import binascii
+import json
+import math
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
-import math
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+COUNT_MODES = ("exact", "approx", "none")
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for ``queryset`` on PostgreSQL.
+
+    Other backends have no cheap estimate and get an exact ``COUNT(*)``.
+    """
+
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return queryset.count()
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        return estimate_count(self.object_list)
 
 
 class SpringStylePagination(PageNumberPagination):
@@ -8,6 +63,8 @@ class SpringStylePagination(PageNumberPagination):
     page_size_query_param = "size"
     page_size = 10
     max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
 
     def get_page_number(self, request, paginator):
         try:
@@ -18,10 +75,128 @@ class SpringStylePagination(PageNumberPagination):
             page_number = 1
         return page_number
 
+    def get_count_mode(self, request, default):
+        mode = request.query_params.get(self.count_query_param, default)
+        return mode if mode in COUNT_MODES else default
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        ordering = getattr(view, "cursor_ordering", None)
+        self.cursor_mode = bool(ordering) and self.cursor_query_param in (
+            request.query_params
+        )
+        if self.cursor_mode:
+            return self.paginate_keyset(queryset, request, ordering)
+        if self.get_count_mode(request, "exact") == "approx":
+            self.django_paginator_class = EstimatedCountPaginator
+        page = super().paginate_queryset(queryset, request, view)
+        self.count = self.page.paginator.count
+        return page
+
+    # -- keyset mode -------------------------------------------------------
+
+    def paginate_keyset(self, queryset, request, ordering):
+        self.ordering = tuple(ordering)
+        self.page_size_value = self.get_page_size(request) or self.page_size
+        position, reverse = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param), queryset.model
+        )
+
+        count_mode = self.get_count_mode(request, "none")
+        if count_mode == "exact":
+            self.count = queryset.count()
+        elif count_mode == "approx":
+            self.count = estimate_count(queryset)
+        else:
+            self.count = None
+
+        order = self.ordering
+        if reverse:
+            order = tuple(_invert(field) for field in order)
+        queryset = queryset.order_by(*order)
+        if position is not None:
+            queryset = queryset.filter(_after(order, position))
+
+        rows = list(queryset[: self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[: self.page_size_value]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.rows = rows
+        return rows
+
+    def _position(self, obj):
+        return [getattr(obj, field.lstrip("-")) for field in self.ordering]
+
+    def encode_cursor(self, position, reverse=False):
+        payload = {"p": [_dump(value) for value in position]}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor, model):
+        """Return the position and direction encoded in ``cursor``.
+
+        Position values are converted with their ordering field's
+        ``to_python()`` so a tampered cursor is a 404, not a database error.
+        """
+
+        if not cursor:
+            return None, False
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            values = payload["p"]
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            position = []
+            for field, value in zip(self.ordering, values):
+                if value is None:
+                    raise ValueError
+                position.append(_field(model, field).to_python(value))
+        except (binascii.Error, ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound("Invalid cursor.")
+        return position, bool(payload.get("r"))
+
+    def get_next_cursor(self):
+        if not self.has_next or not self.rows:
+            return None
+        return self.encode_cursor(self._position(self.rows[-1]))
+
+    def get_previous_cursor(self):
+        if not self.has_previous or not self.rows:
+            return None
+        return self.encode_cursor(self._position(self.rows[0]), reverse=True)
+
+    def _cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if self.cursor_mode:
+            return self._cursor_link(self.get_next_cursor())
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.cursor_mode:
+            return self._cursor_link(self.get_previous_cursor())
+        return super().get_previous_link()
+
+    # -- responses ---------------------------------------------------------
+
     def get_paginated_response(self, data):
+        if self.cursor_mode:
+            return self.get_keyset_response(data)
         page_number = self.page.number - 1  # make it 0-based
         page_size = self.get_page_size(self.request)
-        total_elements = self.page.paginator.count
+        total_elements = self.count
         total_pages = math.ceil(total_elements / page_size) if page_size else 1
         number_of_elements = len(data)
 
@@ -39,3 +214,58 @@ class SpringStylePagination(PageNumberPagination):
                 "empty": number_of_elements == 0,
             }
         )
+
+    def get_keyset_response(self, data):
+        page_size = self.page_size_value
+        total_elements = self.count
+        total_pages = None
+        if total_elements is not None:
+            total_pages = math.ceil(total_elements / page_size)
+        number_of_elements = len(data)
+
+        return Response(
+            {
+                "content": data,
+                "pageable": {"pageNumber": None, "pageSize": page_size},
+                "last": not self.has_next,
+                "totalPages": total_pages,
+                "totalElements": total_elements,
+                "size": page_size,
+                "number": None,
+                "first": not self.has_previous,
+                "numberOfElements": number_of_elements,
+                "empty": number_of_elements == 0,
+                "next": self.get_next_cursor(),
+                "previous": self.get_previous_cursor(),
+            }
+        )
+
+
+def _invert(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def _field(model, field):
+    name = field.lstrip("-")
+    return model._meta.pk if name == "pk" else model._meta.get_field(name)
+
+
+def _dump(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _after(ordering, position):
+    """Rows strictly after ``position`` in ``ordering``.
+
+    For ``(-timestamp, -id)`` and position ``(t, i)`` this is
+    ``timestamp < t OR (timestamp = t AND id < i)``.
+    """
+
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
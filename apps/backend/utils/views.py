@@ -0,0 +1,18 @@
+from django.http import HttpResponse
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from accounts.permissions import IsSystemAdminUser
+from utils import metrics
+
+
+class MetricsView(APIView):
+    """Request metrics of all workers in the Prometheus text format."""
+
+    permission_classes = [IsAuthenticated, IsSystemAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            metrics.render(metrics.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )